@@ -0,0 +1,154 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+# Structured event logging for the backend.
+#
+# - Every record is one JSON line: {"ts", "level", "logger", "event", ...fields}.
+# - Call sites only enqueue the record; formatting and stdout writes happen on
+#   a single listener thread, so a slow terminal or log shipper never blocks a
+#   request or the WebSocket loops.
+# - Noisy events can be sampled, either with `sample=` at the call site or via
+#   LOG_SAMPLE_RATES="EVENT=0.01,OTHER_EVENT=0.1" (the env value wins).
+# - When the queue is full, records are dropped and counted instead of waiting.
+
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").strip().upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE") or 10000)
+
+_ROOT_NAME = "cricknova"
+_setup_lock = threading.Lock()
+_listener: logging.handlers.QueueListener | None = None
+_stats_lock = threading.Lock()
+_stats: dict[str, int] = {"enqueued": 0, "sampled_out": 0, "dropped": 0}
+_queue: queue.Queue = queue.Queue(maxsize=max(1, LOG_QUEUE_SIZE))
+
+
+def _parse_sample_rates(raw: str) -> dict[str, float]:
+    rates: dict[str, float] = {}
+    for item in (raw or "").split(","):
+        event, _, value = item.partition("=")
+        try:
+            rates[event.strip()] = min(1.0, max(0.0, float(value)))
+        except ValueError:
+            continue
+    rates.pop("", None)
+    return rates
+
+
+_sample_overrides = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+
+def _count(counter: str) -> None:
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        if record.exc_info:
+            payload["traceback"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Formatting is deferred to the listener thread.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _count("dropped")
+            return
+        _count("enqueued")
+
+
+def configure_logging() -> None:
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(_JsonFormatter())
+        root = logging.getLogger(_ROOT_NAME)
+        root.setLevel(getattr(logging, LOG_LEVEL, logging.INFO))
+        root.addHandler(_DroppingQueueHandler(_queue))
+        root.propagate = False
+        _listener = logging.handlers.QueueListener(_queue, output)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+
+class EventLogger:
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    def enabled(self, level: int, event: str, sample: float = 1.0) -> bool:
+        """
+        Level and sampling check in one place. Call it directly before building
+        an expensive payload; it already counts the event as sampled out.
+        """
+        if not self._logger.isEnabledFor(level):
+            return False
+        rate = _sample_overrides.get(event, sample)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        _count("sampled_out")
+        return False
+
+    def log(self, level: int, event: str, *, sample: float = 1.0, exc_info: Any = None, **fields: Any) -> None:
+        if not self.enabled(level, event, sample):
+            return
+        self._logger.log(level, event, exc_info=exc_info, extra={"fields": fields})
+
+    def emit(self, level: int, event: str, *, exc_info: Any = None, **fields: Any) -> None:
+        """Log without re-checking level or sampling (after `enabled`)."""
+        self._logger.log(level, event, exc_info=exc_info, extra={"fields": fields})
+
+    def debug(self, event: str, **fields: Any) -> None:
+        self.log(logging.DEBUG, event, **fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        self.log(logging.INFO, event, **fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        self.log(logging.WARNING, event, **fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        self.log(logging.ERROR, event, **fields)
+
+    def exception(self, event: str, **fields: Any) -> None:
+        self.log(logging.ERROR, event, exc_info=True, **fields)
+
+
+def get_logger(name: str) -> EventLogger:
+    configure_logging()
+    return EventLogger(logging.getLogger(f"{_ROOT_NAME}.{name}"))
+
+
+def logging_stats() -> dict[str, Any]:
+    with _stats_lock:
+        counters = dict(_stats)
+    return {
+        "level": LOG_LEVEL,
+        **counters,
+        "queue_depth": _queue.qsize(),
+        "queue_size": _queue.maxsize,
+        "sample_overrides": dict(_sample_overrides),
+    }
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+
+class BanStatusCache:
+    """
+    Per-worker async cache of each user's ban fields.
+
+    - Entries for users with no ban ("negative" entries) live for
+      `negative_ttl_s`. They are the ones that can hide a fresh ban written
+      by another worker, so they are kept short. Entries that do carry ban
+      fields live for `ttl_s`. Callers still compare `banned_until` with the
+      clock, so an expired ban stops applying even while it is cached.
+    - Concurrent misses for the same user share one load.
+    - `invalidate` drops the entry and discards any load already in flight
+      for it, so a write made in this process is seen on the next check.
+    - At most `max_entries` users are kept (least recently used first out).
+
+    Loader failures are not cached.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[dict[str, Any]]],
+        *,
+        is_negative: Callable[[dict[str, Any]], bool],
+        ttl_s: float = 300.0,
+        negative_ttl_s: float = 15.0,
+        max_entries: int = 10_000,
+    ):
+        self.loader = loader
+        self.is_negative = is_negative
+        self.ttl_s = ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._loading: dict[str, asyncio.Future] = {}
+        self._discarded: set[str] = set()
+        self._counters = {
+            "hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "invalidations": 0,
+            "load_errors": 0,
+        }
+
+    async def get(self, user_id: str) -> dict[str, Any]:
+        now = time.monotonic()
+        cached = self._entries.get(user_id)
+        if cached is not None:
+            expires_at, value = cached
+            if expires_at > now:
+                self._entries.move_to_end(user_id)
+                self._counters["negative_hits" if self.is_negative(value) else "hits"] += 1
+                return value
+            del self._entries[user_id]
+
+        pending = self._loading.get(user_id)
+        if pending is not None:
+            self._counters["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        self._counters["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[user_id] = future
+        try:
+            value = await self.loader(user_id)
+        except BaseException as exc:
+            self._counters["load_errors"] += 1
+            future.set_exception(exc)
+            # Mark retrieved so an exception nobody else awaited is not logged.
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if user_id not in self._discarded:
+                self._store(user_id, value)
+            return value
+        finally:
+            self._loading.pop(user_id, None)
+            self._discarded.discard(user_id)
+
+    def _store(self, user_id: str, value: dict[str, Any]) -> None:
+        ttl = self.negative_ttl_s if self.is_negative(value) else self.ttl_s
+        if ttl <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._counters["invalidations"] += 1
+        self._entries.pop(user_id, None)
+        if user_id in self._loading:
+            self._discarded.add(user_id)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["negative_hits"] + self._counters["misses"]
+        cached = self._counters["hits"] + self._counters["negative_hits"]
+        return {
+            "entries": len(self._entries),
+            "ttl_s": self.ttl_s,
+            "negative_ttl_s": self.negative_ttl_s,
+            **self._counters,
+            "hit_ratio": round(cached / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from app_logging import get_logger
+
+log = get_logger("billing_ledger")
+
+
+@dataclass
+class LedgerEntry:
+    user_id: str
+    session_id: str
+    start_ns: int
+    cap_ms: int
+    checkpointed_ms: int = 0
+
+    def elapsed_ms(self, now_ns: int) -> int:
+        return min(self.cap_ms, max(0, (now_ns - self.start_ns) // 1_000_000))
+
+
+@dataclass
+class Checkpoint:
+    user_id: str
+    session_id: str
+    delta_ms: int
+    total_ms: int
+
+
+class BillingLedger:
+    """
+    Per-worker record of elapsed live time for every open session.
+
+    - Every `interval_s` the time accrued since the last checkpoint is handed
+      to `commit` for all sessions at once, split into chunks of at most
+      `max_batch` (Firestore's write-batch limit is 500), so write RPCs per
+      second depend on the interval and not on how many sockets are open.
+    - A failed commit keeps the deltas; they go out with the next flush.
+    - `close` waits for an in-flight flush before dropping the session, so
+      the close-time charge can reconcile against what was already written.
+
+    The flush loop runs only while sessions are open.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[list[Checkpoint]], Awaitable[None]],
+        *,
+        interval_s: float = 30.0,
+        max_batch: int = 400,
+    ):
+        self.commit = commit
+        self.interval_s = interval_s
+        self.max_batch = max(1, max_batch)
+        self._entries: dict[str, LedgerEntry] = {}
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._counters = {
+            "flushes": 0,
+            "batches": 0,
+            "checkpoints": 0,
+            "checkpointed_ms": 0,
+            "failed_batches": 0,
+        }
+
+    def open(self, user_id: str, session_id: str, start_ns: int, cap_ms: int) -> None:
+        self._entries[session_id] = LedgerEntry(user_id, session_id, start_ns, max(0, cap_ms))
+        if self.interval_s > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self, session_id: str) -> int:
+        """Stop tracking a session; returns the milliseconds already checkpointed for it."""
+        async with self._lock:
+            entry = self._entries.pop(session_id, None)
+        return entry.checkpointed_ms if entry else 0
+
+    async def _run(self) -> None:
+        while self._entries:
+            await asyncio.sleep(self.interval_s)
+            try:
+                await self.flush()
+            except Exception as exc:
+                log.exception("BILLING_LEDGER_FLUSH_FAILED", error=str(exc))
+
+    async def flush(self) -> int:
+        """Checkpoint every open session; returns how many sessions were written."""
+        async with self._lock:
+            now_ns = time.monotonic_ns()
+            pending = []
+            for entry in self._entries.values():
+                total_ms = entry.elapsed_ms(now_ns)
+                if total_ms > entry.checkpointed_ms:
+                    pending.append(
+                        (entry, Checkpoint(entry.user_id, entry.session_id, total_ms - entry.checkpointed_ms, total_ms))
+                    )
+            if not pending:
+                return 0
+
+            self._counters["flushes"] += 1
+            written = 0
+            for offset in range(0, len(pending), self.max_batch):
+                chunk = pending[offset:offset + self.max_batch]
+                try:
+                    await self.commit([checkpoint for _, checkpoint in chunk])
+                except Exception as exc:
+                    self._counters["failed_batches"] += 1
+                    log.error("BILLING_LEDGER_BATCH_FAILED", sessions=len(chunk), error=str(exc))
+                    continue
+                self._counters["batches"] += 1
+                for entry, checkpoint in chunk:
+                    entry.checkpointed_ms = checkpoint.total_ms
+                    self._counters["checkpointed_ms"] += checkpoint.delta_ms
+                written += len(chunk)
+            self._counters["checkpoints"] += written
+            return written
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "interval_s": self.interval_s,
+            "open_sessions": len(self._entries),
+            **self._counters,
+        }
@@ -5,6 +5,10 @@ import os
 from google.cloud import firestore
 from gemini_text import generate_text
 
+from app_logging import get_logger
+
+log = get_logger("ai_coach")
+
 router = APIRouter()
 
 db = None
@@ -14,9 +18,9 @@ def get_db():
     if db is None:
         try:
             db = firestore.Client()
-            print("🔥 FIRESTORE CONNECTED OK (ai_coach)")
+            log.info("FIRESTORE_CONNECTED")
         except Exception as e:
-            print("❌ FIRESTORE INIT FAILED (ai_coach):", e)
+            log.error("FIRESTORE_INIT_FAILED", error=str(e))
             raise RuntimeError(f"Firestore init failed: {e}")
     return db
 
@@ -72,7 +76,7 @@ def get_user_plan(user_id: str) -> str:
 
         expiry = data.get("expiry") or data.get("expiryDate") or data.get("expiry_date")
         plan = data.get("plan") or data.get("plan_id") or "FREE"
-        print("🧾 SUBSCRIPTION DATA:", {"user_id": user_id, "plan": plan, "expiry": expiry})
+        log.debug("SUBSCRIPTION_DATA", user=user_id, plan=plan, expiry=expiry)
 
         if not expiry or not plan:
             return "FREE"
@@ -80,7 +84,7 @@ def get_user_plan(user_id: str) -> str:
         try:
             expiry_dt = datetime.fromisoformat(expiry.replace("Z", ""))
         except Exception:
-            print("⚠️ INVALID EXPIRY FORMAT, treating as FREE:", expiry)
+            log.warning("INVALID_EXPIRY_FORMAT", user=user_id, expiry=expiry)
             return "FREE"
 
         if datetime.utcnow() > expiry_dt:
@@ -89,7 +93,7 @@ def get_user_plan(user_id: str) -> str:
         return plan
 
     except Exception as e:
-        print("❌ get_user_plan error:", e)
+        log.error("GET_USER_PLAN_FAILED", user=user_id, error=str(e))
         raise HTTPException(
             status_code=500,
             detail="FIRESTORE_OR_SUBSCRIPTION_ERROR"
@@ -161,8 +165,8 @@ async def ai_coach(req: CoachRequest, request: Request):
         or getattr(request.state, "user_id", None)
     )
 
-    print("🔐 RESOLVED USER_ID:", user_id)
-    print("📦 HEADERS:", dict(request.headers))
+    # Header names only: values carry auth tokens.
+    log.debug("AI_COACH_REQUEST", user=user_id, headers=sorted(request.headers.keys()))
 
     if not user_id:
         raise HTTPException(
@@ -175,7 +179,7 @@ async def ai_coach(req: CoachRequest, request: Request):
 
     # ❗ AI CONFIG CHECK (do this BEFORE usage / premium checks)
     if not (os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")):
-        print("❌ GEMINI_API_KEY missing on server")
+        log.error("GEMINI_API_KEY_MISSING")
         return {
             "reply": "AI Coach is temporarily unavailable. Please try again later."
         }
@@ -1,80 +1,191 @@
 import cv2
 import os
+from dataclasses import dataclass, field
 
-def split_deliveries(video_path, output_folder, min_movement=15, idle_frames=25):
-    """
-    Automatically splits a cricket net session video into separate deliveries.
-    
-    Args:
-        video_path (str): Path to input video.
-        output_folder (str): Folder to save individual deliveries.
-        min_movement (int): Pixel movement threshold to detect ball.
-        idle_frames (int): Number of frames with no motion = delivery ended.
-    """
+from app_logging import get_logger
 
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
+log = get_logger("delivery_split")
 
-    cap = cv2.VideoCapture(video_path)
-    frame_id = 0
-    delivery_id = 1
+DEFAULT_FPS = 30.0
 
-    ret, prev_frame = cap.read()
-    if not ret:
-        print("Error: Cannot read video.")
-        return
 
-    prev_gray = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-    consecutive_idle = 0
-    recording = False
-    out = None
+@dataclass
+class DeliverySegment:
+    """One delivery: inclusive frame range, timestamps in seconds, and the frames themselves."""
+    index: int
+    start_frame: int
+    end_frame: int
+    start_ts: float
+    end_ts: float
+    frames: list = field(default_factory=list, repr=False)
 
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
+class DeliverySegmenter:
+    """
+    Incremental delivery splitter.
+
+    Feed frames one at a time with `push`; whenever a delivery ends it is
+    returned as a DeliverySegment holding references to the pushed frames
+    (no copies, no disk writes). A delivery starts on the first frame whose
+    movement exceeds `min_movement` and ends after more than `idle_frames`
+    quiet frames; its span runs up to the last moving frame, so short pauses
+    inside the delivery are kept. `max_segment_frames` bounds memory when a
+    scene never goes quiet. Call `flush` at end of stream.
+    """
 
+    def __init__(self, fps=None, min_movement=15, idle_frames=25, max_segment_frames=900, keep_frames=True):
+        self.fps = float(fps) if fps and fps > 1 else DEFAULT_FPS
+        self.min_movement = min_movement
+        self.idle_frames = idle_frames
+        self.max_segment_frames = max_segment_frames
+        self.keep_frames = keep_frames
+        self.frame_index = -1
+        self.segments_emitted = 0
+        self._prev_gray = None
+        self._consecutive_idle = 0
+        self._start = None
+        self._last_moving = None
+        self._timestamps = []
+        self._frames = []
+
+    def _timestamp(self, timestamp):
+        return float(timestamp) if timestamp is not None else self.frame_index / self.fps
+
+    def push(self, frame, timestamp=None):
+        """Add one BGR frame. Returns a list with the finished delivery, if any."""
+        self.frame_index += 1
+        ts = self._timestamp(timestamp)
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        prev_gray = self._prev_gray
+        self._prev_gray = gray
+        if prev_gray is None:
+            return []
 
-        # Difference between frames
         diff = cv2.absdiff(prev_gray, gray)
         movement = cv2.countNonZero(cv2.threshold(diff, 25, 255, cv2.THRESH_BINARY)[1])
 
-        # Ball (movement) detected
-        if movement > min_movement:
-            consecutive_idle = 0
+        finished = []
+        if movement > self.min_movement:
+            self._consecutive_idle = 0
+            if self._start is None:
+                self._start = self.frame_index
+                self._timestamps = []
+                self._frames = []
+            self._last_moving = self.frame_index
+        else:
+            self._consecutive_idle += 1
+
+        if self._start is not None:
+            self._timestamps.append(ts)
+            if self.keep_frames:
+                self._frames.append(frame)
+            if self._consecutive_idle > self.idle_frames:
+                finished.append(self._close())
+            elif self.max_segment_frames and len(self._timestamps) >= self.max_segment_frames:
+                finished.append(self._close())
+        return finished
+
+    def flush(self):
+        """End of stream: return the delivery still in progress, if any."""
+        if self._start is None:
+            return []
+        return [self._close()]
+
+    def _close(self):
+        length = self._last_moving - self._start + 1
+        self.segments_emitted += 1
+        segment = DeliverySegment(
+            index=self.segments_emitted,
+            start_frame=self._start,
+            end_frame=self._last_moving,
+            start_ts=self._timestamps[0],
+            end_ts=self._timestamps[length - 1],
+            frames=self._frames[:length] if self.keep_frames else [],
+        )
+        self._start = None
+        self._last_moving = None
+        self._timestamps = []
+        self._frames = []
+        return segment
+
+
+def iter_deliveries(frames, fps=None, **kwargs):
+    """Yield DeliverySegments from an iterable of frames or (frame, timestamp) pairs."""
+    segmenter = DeliverySegmenter(fps=fps, **kwargs)
+    for item in frames:
+        if isinstance(item, tuple):
+            yield from segmenter.push(*item)
+        else:
+            yield from segmenter.push(item)
+    yield from segmenter.flush()
 
-            if not recording:
-                # Start new delivery recording
-                delivery_path = os.path.join(
-                    output_folder, f"delivery_{delivery_id}.mp4"
-                )
-                out = cv2.VideoWriter(delivery_path, fourcc, 30,
-                                      (frame.shape[1], frame.shape[0]))
-                print(f"Recording Delivery {delivery_id}...")
-                recording = True
 
-            out.write(frame)
+def iter_video_deliveries(video_path, **kwargs):
+    """Decode `video_path` and yield its deliveries as they complete."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        log.error("DELIVERY_SPLIT_READ_FAILED", video=video_path)
+        return
+    kwargs.setdefault("fps", cap.get(cv2.CAP_PROP_FPS))
 
-        else:
-            # No movement
-            consecutive_idle += 1
+    def frames():
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                return
+            position_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            yield frame, (position_ms / 1000.0) if position_ms and position_ms > 0 else None
+
+    try:
+        yield from iter_deliveries(frames(), **kwargs)
+    finally:
+        cap.release()
+
+
+def split_deliveries(video_path, output_folder, min_movement=15, idle_frames=25):
+    """
+    Automatically splits a cricket net session video into separate deliveries.
 
-            # Delivery ends when idle for many frames
-            if recording and consecutive_idle > idle_frames:
-                recording = False
-                out.release()
-                print(f"Delivery {delivery_id} saved.")
-                delivery_id += 1
+    Args:
+        video_path (str): Path to input video.
+        output_folder (str): Folder to save individual deliveries.
+        min_movement (int): Pixel movement threshold to detect ball.
+        idle_frames (int): Number of frames with no motion = delivery ended.
+    """
 
-        prev_gray = gray
-        frame_id += 1
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
 
-    # Clean up
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
     cap.release()
-    if out:
-        out.release()
+    fps = fps if fps and fps > 1 else DEFAULT_FPS
 
-    print("Splitting complete!")
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    count = 0
+    for segment in iter_video_deliveries(
+        video_path,
+        fps=fps,
+        min_movement=min_movement,
+        idle_frames=idle_frames,
+    ):
+        if not segment.frames:
+            continue
+        delivery_path = os.path.join(
+            output_folder, f"delivery_{segment.index}.mp4"
+        )
+        height, width = segment.frames[0].shape[:2]
+        out = cv2.VideoWriter(delivery_path, fourcc, fps, (width, height))
+        for frame in segment.frames:
+            out.write(frame)
+        out.release()
+        count += 1
+        log.info(
+            "DELIVERY_SAVED",
+            delivery=segment.index,
+            path=delivery_path,
+            start_ts=round(segment.start_ts, 3),
+            end_ts=round(segment.end_ts, 3),
+        )
+
+    log.info("DELIVERY_SPLIT_COMPLETE", deliveries=count)
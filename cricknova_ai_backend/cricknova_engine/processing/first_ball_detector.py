@@ -8,6 +8,10 @@ import numpy as np
 import cv2
 from ultralytics import YOLO
 
+from app_logging import get_logger
+
+log = get_logger("first_ball_detector")
+
 
 class FirstBallDetector:
     def __init__(self, model_path="yolo11n.pt"):
@@ -16,7 +20,7 @@ class FirstBallDetector:
             self.model = YOLO(model_path)
         except:
             self.model = None
-            print(f"⚠️  Could not load YOLO model from {model_path}")
+            log.warning("FIRST_BALL_MODEL_LOAD_FAILED", model_path=model_path)
     
     def detect_first_ball(self, video_path):
         """
@@ -46,7 +50,7 @@ class FirstBallDetector:
         ball_detections = []  # (frame_idx, x, y, confidence)
         frame_idx = 0
         
-        print("🔍 Scanning video for first ball...")
+        log.debug("FIRST_BALL_SCAN_STARTED", fps=fps, width=frame_width, height=frame_height)
         
         while True:
             ret, frame = cap.read()
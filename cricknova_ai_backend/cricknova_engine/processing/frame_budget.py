@@ -0,0 +1,110 @@
+import math
+import time
+
+import cv2
+import numpy as np
+
+# Gemini bills an image that fits in 384x384 as one 258-token tile; anything
+# larger is cut into 768x768 tiles of 258 tokens each. Widths up to 768 on a
+# landscape phone frame therefore cost the same as 384, and the ladder only
+# drops below 768 to save bytes, not tokens.
+TOKENS_PER_TILE = 258
+SMALL_IMAGE_SIDE = 384
+TILE_SIDE = 768
+
+# (max_width, jpeg_quality) rungs, largest first.
+DEFAULT_LADDER = (
+    (1024, 82),
+    (768, 80),
+    (768, 68),
+    (640, 64),
+    (512, 60),
+    (384, 55),
+)
+
+
+def estimate_image_tokens(width, height):
+    if width <= 0 or height <= 0:
+        return 0
+    if width <= SMALL_IMAGE_SIDE and height <= SMALL_IMAGE_SIDE:
+        return TOKENS_PER_TILE
+    return math.ceil(width / TILE_SIDE) * math.ceil(height / TILE_SIDE) * TOKENS_PER_TILE
+
+
+def _encode(frame, width, quality):
+    h, w = frame.shape[:2]
+    if width < w:
+        frame = cv2.resize(
+            frame,
+            (width, max(1, int(h * width / float(w)))),
+            interpolation=cv2.INTER_AREA,
+        )
+    ok, encoded = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)])
+    if not ok:
+        return None, frame.shape[1], frame.shape[0]
+    return encoded.tobytes(), frame.shape[1], frame.shape[0]
+
+
+def fit_frame(frame_bytes, max_bytes, max_tokens, ladder=DEFAULT_LADDER):
+    """
+    Re-encode one JPEG so it fits `max_bytes` and `max_tokens`.
+
+    Walks the ladder from the largest rung down and returns the first rung that
+    fits; the original bytes are kept untouched when they already fit and are
+    no wider than the top rung. Frames that cannot be decoded pass through.
+    Returns (bytes, estimated_tokens).
+    """
+    frame = cv2.imdecode(np.frombuffer(frame_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        return frame_bytes, 0
+    h, w = frame.shape[:2]
+    original_tokens = estimate_image_tokens(w, h)
+    if len(frame_bytes) <= max_bytes and original_tokens <= max_tokens and w <= ladder[0][0]:
+        return frame_bytes, original_tokens
+
+    smallest = None
+    for width, quality in ladder:
+        target_width = min(width, w)
+        target_height = max(1, int(h * target_width / float(w)))
+        if estimate_image_tokens(target_width, target_height) > max_tokens and width != ladder[-1][0]:
+            continue
+        encoded, out_w, out_h = _encode(frame, target_width, quality)
+        if encoded is None:
+            continue
+        smallest = (encoded, estimate_image_tokens(out_w, out_h))
+        if len(encoded) <= max_bytes:
+            return smallest
+    if smallest is None or len(smallest[0]) >= len(frame_bytes):
+        return frame_bytes, original_tokens
+    return smallest
+
+
+def fit_frames_to_budget(frames, max_bytes, max_tokens, ladder=DEFAULT_LADDER):
+    """
+    Spread a per-request byte/token budget evenly over `frames` and re-encode
+    each frame down the ladder until it fits its share.
+    Returns (frames, report) where report carries bytes in/out and timing.
+    """
+    started = time.perf_counter()
+    if not frames:
+        return [], {"frames": 0, "bytes_in": 0, "bytes_out": 0, "bytes_saved": 0, "tokens_estimate": 0, "encode_ms": 0.0}
+
+    per_frame_bytes = max(1, int(max_bytes) // len(frames))
+    per_frame_tokens = max(TOKENS_PER_TILE, int(max_tokens) // len(frames))
+    fitted = []
+    tokens = 0
+    for frame_bytes in frames:
+        out, frame_tokens = fit_frame(frame_bytes, per_frame_bytes, per_frame_tokens, ladder)
+        fitted.append(out)
+        tokens += frame_tokens
+
+    bytes_in = sum(len(frame) for frame in frames)
+    bytes_out = sum(len(frame) for frame in fitted)
+    return fitted, {
+        "frames": len(frames),
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "bytes_saved": bytes_in - bytes_out,
+        "tokens_estimate": tokens,
+        "encode_ms": round((time.perf_counter() - started) * 1000.0, 2),
+    }
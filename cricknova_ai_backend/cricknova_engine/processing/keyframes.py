@@ -0,0 +1,118 @@
+import cv2
+import numpy as np
+
+ANALYSIS_WIDTH = 160          # motion energy is computed on tiny grayscale frames
+MAX_ANALYSIS_FRAMES = 900     # ~30 s at 30 fps; longer clips are truncated
+FLAT_MOTION_RATIO = 1.15      # peak must beat the median by this much to count
+
+
+def motion_energy_profile(video_path, analysis_width=ANALYSIS_WIDTH, max_frames=MAX_ANALYSIS_FRAMES):
+    """
+    Mean absolute frame difference for every frame of the clip.
+
+    Frames are downscaled to `analysis_width` and blurred before differencing,
+    so the whole pass costs a fraction of a full-resolution decode.
+    Index 0 has energy 0 (no previous frame).
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return []
+
+    energy = []
+    prev_gray = None
+    while len(energy) < max_frames:
+        ok, frame = cap.read()
+        if not ok or frame is None:
+            break
+        h, w = frame.shape[:2]
+        if w > analysis_width:
+            scale = analysis_width / float(w)
+            frame = cv2.resize(
+                frame,
+                (analysis_width, max(1, int(h * scale))),
+                interpolation=cv2.INTER_AREA,
+            )
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+        if prev_gray is None:
+            energy.append(0.0)
+        else:
+            energy.append(float(cv2.absdiff(prev_gray, gray).mean()))
+        prev_gray = gray
+
+    cap.release()
+    return energy
+
+
+def evenly_spaced_indexes(frame_count, count):
+    if frame_count <= 0 or count <= 0:
+        return []
+    return sorted({
+        min(frame_count - 1, max(0, round(i * (frame_count - 1) / max(1, count - 1))))
+        for i in range(count)
+    })
+
+
+def select_motion_keyframes(energy, count, min_gap=None):
+    """
+    Pick `count` frame indexes clustered around the motion peak.
+
+    - The peak of the smoothed energy curve is always selected.
+    - Remaining picks are the highest-energy frames inside the active window
+      (frames above half the peak energy, grown around the peak), at least
+      `min_gap` frames apart so near-duplicate frames are not sent twice.
+    - If the clip has no clear motion peak, evenly spaced frames are returned.
+
+    Returned indexes are sorted chronologically.
+    """
+    frame_count = len(energy)
+    if frame_count == 0 or count <= 0:
+        return []
+    if frame_count <= count:
+        return list(range(frame_count))
+
+    values = np.asarray(energy, dtype=np.float32)
+    smoothed = np.convolve(values, np.ones(3, dtype=np.float32) / 3.0, mode="same")
+    peak = int(np.argmax(smoothed))
+    peak_energy = float(smoothed[peak])
+    baseline = float(np.median(smoothed))
+    if peak_energy <= 0.0 or peak_energy < baseline * FLAT_MOTION_RATIO:
+        return evenly_spaced_indexes(frame_count, count)
+
+    if min_gap is None:
+        min_gap = max(1, frame_count // (count * 6))
+
+    # Grow the active window outward from the peak while motion stays high,
+    # then pad it so the lead-in and follow-through are still candidates.
+    threshold = baseline + 0.5 * (peak_energy - baseline)
+    start = peak
+    while start > 0 and smoothed[start - 1] >= threshold:
+        start -= 1
+    end = peak
+    while end < frame_count - 1 and smoothed[end + 1] >= threshold:
+        end += 1
+    padding = max(count * min_gap, (end - start + 1) // 2)
+    start = max(0, start - padding)
+    end = min(frame_count - 1, end + padding)
+
+    chosen = [peak]
+    # Highest energy first; ties go to the frame closest to the peak.
+    candidates = sorted(
+        range(start, end + 1),
+        key=lambda index: (-smoothed[index], abs(index - peak)),
+    )
+    for index in candidates:
+        if len(chosen) >= count:
+            break
+        if all(abs(index - picked) >= min_gap for picked in chosen):
+            chosen.append(index)
+
+    # Window too narrow for the diversity constraint: fill from the whole clip.
+    if len(chosen) < count:
+        for index in sorted(range(frame_count), key=lambda index: (-smoothed[index], abs(index - peak))):
+            if len(chosen) >= count:
+                break
+            if index not in chosen and all(abs(index - picked) >= min_gap for picked in chosen):
+                chosen.append(index)
+
+    return sorted(chosen)
@@ -5,6 +5,9 @@ from .ball_tracker import BallTracker
 from .trajectory import TrajectoryCalculator
 from .release_point import ReleasePointDetector
 from .shot_classifier import ShotClassifier
+from app_logging import get_logger
+
+log = get_logger("live_match_pipeline")
 
 
 class LiveMatchPipeline:
@@ -40,7 +43,7 @@ class LiveMatchPipeline:
         contact_frame = self._estimate_contact(positions)
 
         if self.debug:
-            print(f"[DEBUG] Release: {release_frame}, Contact: {contact_frame}")
+            log.debug("LIVE_MATCH_KEY_FRAMES", release=release_frame, contact=contact_frame)
 
         # 4) TRAJECTORY
         trajectory = self.trajectory_calc.compute(
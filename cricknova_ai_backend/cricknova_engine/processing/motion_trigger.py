@@ -0,0 +1,151 @@
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+ANALYSIS_WIDTH = 160       # differencing runs on tiny grayscale frames
+PIXEL_THRESHOLD = 25       # same per-pixel threshold as ball_tracker_motion
+MIN_BURST_FRACTION = 0.01  # at least 1% of the frame must change
+NOISE_FACTOR = 3.0         # ...and clearly more than the session's idle noise
+CAMERA_MOTION_FRACTION = 0.6  # most of the frame changed: camera moved / exposure jump
+MAX_CLIP_FRAMES = 240
+
+
+def _analysis_gray(frame, analysis_width=ANALYSIS_WIDTH):
+    h, w = frame.shape[:2]
+    if w > analysis_width:
+        frame = cv2.resize(
+            frame,
+            (analysis_width, max(1, int(h * analysis_width / float(w)))),
+            interpolation=cv2.INTER_AREA,
+        )
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return cv2.GaussianBlur(gray, (5, 5), 0)
+
+
+def changed_fraction(prev_gray, gray):
+    if prev_gray is None or prev_gray.shape != gray.shape:
+        return 0.0
+    diff = cv2.absdiff(prev_gray, gray)
+    return float(np.count_nonzero(diff > PIXEL_THRESHOLD)) / float(diff.size)
+
+
+def _decode_image(frame_bytes):
+    frame = cv2.imdecode(np.frombuffer(frame_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return None if frame is None else _analysis_gray(frame)
+
+
+def _clip_grays(video_bytes, max_frames=MAX_CLIP_FRAMES):
+    path = None
+    grays = []
+    try:
+        with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
+            tmp.write(video_bytes)
+            path = tmp.name
+        cap = cv2.VideoCapture(path)
+        while cap.isOpened() and len(grays) < max_frames:
+            ok, frame = cap.read()
+            if not ok or frame is None:
+                break
+            grays.append(_analysis_gray(frame))
+        cap.release()
+    finally:
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return grays
+
+
+class MotionTrigger:
+    """
+    Per-session local gate in front of Gemini for the live-nets stream.
+
+    - Consecutive frames are differenced at low resolution; a delivery or shot
+      shows up as a burst where a meaningful share of pixels changes.
+    - The threshold adapts to the session's idle noise (swaying nets, light
+      flicker), and near-full-frame changes count as camera motion.
+    - Clips need the burst on `clip_burst_pairs` consecutive frame pairs.
+    - Whatever the motion, media is let through once `keepalive_s` has passed
+      since the last analysis, so policy checks and coaching never go silent.
+
+    `check` returns "motion", "keepalive" or "idle".
+    """
+
+    def __init__(self, *, keepalive_s=15.0, clip_burst_pairs=2, alpha=0.1):
+        self.keepalive_s = keepalive_s
+        self.clip_burst_pairs = clip_burst_pairs
+        self.alpha = alpha
+        self.noise_floor = 0.0
+        self._prev_gray = None
+        self._last_pass_at = None
+        self._counters = {"checked": 0, "motion": 0, "keepalive": 0, "idle": 0}
+
+    def _threshold(self):
+        return max(MIN_BURST_FRACTION, self.noise_floor * NOISE_FACTOR)
+
+    def _is_burst(self, fraction):
+        return self._threshold() <= fraction < CAMERA_MOTION_FRACTION
+
+    def _observe_idle(self, fraction):
+        if fraction < CAMERA_MOTION_FRACTION:
+            self.noise_floor += self.alpha * (fraction - self.noise_floor)
+
+    def _score_images(self, frames):
+        burst = False
+        for frame_bytes in frames:
+            gray = _decode_image(frame_bytes)
+            if gray is None:
+                continue
+            fraction = changed_fraction(self._prev_gray, gray)
+            self._prev_gray = gray
+            if self._is_burst(fraction):
+                burst = True
+            else:
+                self._observe_idle(fraction)
+        return burst
+
+    def _score_clip(self, video_bytes):
+        grays = _clip_grays(video_bytes)
+        run = 0
+        burst = False
+        for prev_gray, gray in zip(grays, grays[1:]):
+            fraction = changed_fraction(prev_gray, gray)
+            if self._is_burst(fraction):
+                run += 1
+                if run >= self.clip_burst_pairs:
+                    burst = True
+            else:
+                run = 0
+                self._observe_idle(fraction)
+        if grays:
+            self._prev_gray = grays[-1]
+        return burst
+
+    def check(self, media, is_video, now):
+        self._counters["checked"] += 1
+        if is_video:
+            burst = self._score_clip(bytes(media))
+        else:
+            burst = self._score_images(media if isinstance(media, list) else [media])
+        if burst:
+            decision = "motion"
+        elif self._last_pass_at is None or now - self._last_pass_at >= self.keepalive_s:
+            decision = "keepalive"
+        else:
+            decision = "idle"
+        if decision != "idle":
+            self._last_pass_at = now
+        self._counters[decision] += 1
+        return decision
+
+    def stats(self):
+        checked = self._counters["checked"]
+        return {
+            **self._counters,
+            "noise_floor": round(self.noise_floor, 5),
+            "threshold": round(self._threshold(), 5),
+            "skipped_ratio": round(self._counters["idle"] / checked, 4) if checked else 0.0,
+        }
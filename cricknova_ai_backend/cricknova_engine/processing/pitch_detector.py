@@ -2,6 +2,10 @@ import cv2
 import numpy as np
 from typing import List, Tuple, Optional
 
+from app_logging import get_logger
+
+log = get_logger("pitch_detector")
+
 class PitchDetector:
     """
     Dynamic pitch detection for real speed calculation.
@@ -51,7 +55,7 @@ class PitchDetector:
             return pitch_corners
 
         except Exception as e:
-            print(f"Pitch detection failed: {e}")
+            log.warning("PITCH_DETECTION_FAILED", error=str(e))
             return None
 
     def _find_pitch_rectangle(self, lines: List[Tuple], frame_shape: Tuple) -> Optional[List[Tuple[float, float]]]:
@@ -168,7 +172,7 @@ class PitchDetector:
             matrix, _ = cv2.findHomography(src_pts, dst_pts)
             return matrix
         except Exception as e:
-            print(f"Homography calculation failed: {e}")
+            log.warning("PITCH_HOMOGRAPHY_FAILED", error=str(e))
             return None
 
     def validate_pitch_detection(self, corners: List[Tuple[float, float]], frame_shape: Tuple) -> bool:
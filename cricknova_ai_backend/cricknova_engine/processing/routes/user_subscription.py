@@ -2,6 +2,10 @@ from fastapi import APIRouter, HTTPException, Request
 from datetime import datetime, timedelta
 from google.cloud import firestore
 
+from app_logging import get_logger
+
+log = get_logger("user_subscription")
+
 # 🔐 Backend is the single source of truth for subscription & limits.
 # Uses Firestore for persistence (NO in-memory loss)
 
@@ -14,7 +18,7 @@ def get_db():
         try:
             _db = firestore.Client()
         except Exception as e:
-            print("❌ Firestore init failed:", e)
+            log.error("FIRESTORE_INIT_FAILED", error=str(e))
             return None
     return _db
 
@@ -0,0 +1,144 @@
+# FILE: cricknova_engine/scripts/bench_session_timers.py
+#
+# Event-loop overhead of live-session billing timers.
+#
+#   python cricknova_engine/scripts/bench_session_timers.py --seconds 10
+#
+# For 100, 500 and 1,000 simulated sessions it compares:
+#   poll  - every session loops on asyncio.sleep(0.1) (the original guard)
+#   sleep - every session sleeps until its next displayed second
+#   wheel - every session waits on the worker's shared TimerWheel
+# and reports CPU time, session wakeups, wheel wakeups and loop lag measured
+# by a 10 ms probe task.
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from timer_wheel import TimerWheel
+
+
+def _seconds(remaining_ms):
+    return 0 if remaining_ms <= 0 else (remaining_ms + 999) // 1000
+
+
+async def _poll_session(balance_ms, counters):
+    start = time.monotonic()
+    while True:
+        await asyncio.sleep(0.1)
+        counters["wakeups"] += 1
+        counters["frames"] += 1
+        if (time.monotonic() - start) * 1000 >= balance_ms:
+            counters["expired"] += 1
+            return
+
+
+async def _sleep_session(balance_ms, counters):
+    start = time.monotonic()
+    while True:
+        remaining_ms = balance_ms - (time.monotonic() - start) * 1000
+        if remaining_ms <= 0:
+            counters["expired"] += 1
+            return
+        counters["frames"] += 1
+        await asyncio.sleep((remaining_ms - (_seconds(remaining_ms) - 1) * 1000) / 1000.0)
+        counters["wakeups"] += 1
+
+
+async def _wheel_session(balance_ms, counters, wheel):
+    start = time.monotonic()
+    wake = asyncio.Event()
+    while True:
+        remaining_ms = balance_ms - (time.monotonic() - start) * 1000
+        if remaining_ms <= 0:
+            counters["expired"] += 1
+            return
+        counters["frames"] += 1
+        wake.clear()
+        wheel.call_later((remaining_ms - (_seconds(remaining_ms) - 1) * 1000) / 1000.0, wake.set)
+        await wake.wait()
+        counters["wakeups"] += 1
+
+
+async def _probe(stop, lags):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append((time.perf_counter() - started - 0.01) * 1000.0)
+
+
+async def _run(strategy, sessions, seconds, seed):
+    rng = random.Random(seed)
+    counters = {"wakeups": 0, "frames": 0, "expired": 0}
+    wheel = TimerWheel(tick_s=0.05)
+    stop = asyncio.Event()
+    lags = []
+    probe = asyncio.create_task(_probe(stop, lags))
+
+    tasks = []
+    for _ in range(sessions):
+        # A quarter of the sessions run out of balance during the run.
+        balance_ms = rng.randint(1000, int(seconds * 1000)) if rng.random() < 0.25 else 3_600_000
+        if strategy == "poll":
+            tasks.append(asyncio.create_task(_poll_session(balance_ms, counters)))
+        elif strategy == "sleep":
+            tasks.append(asyncio.create_task(_sleep_session(balance_ms, counters)))
+        else:
+            tasks.append(asyncio.create_task(_wheel_session(balance_ms, counters, wheel)))
+
+    cpu_started = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu_ms = (time.process_time() - cpu_started) * 1000.0
+
+    stop.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, probe, return_exceptions=True)
+
+    lags.sort()
+    return {
+        "cpu_ms_per_s": cpu_ms / seconds,
+        "session_wakeups_per_s": counters["wakeups"] / seconds,
+        "frames_per_s": counters["frames"] / seconds,
+        "expired": counters["expired"],
+        "wheel_wakeups_per_s": wheel.stats()["wakeups"] / seconds if strategy == "wheel" else 0.0,
+        "lag_ms_mean": statistics.fmean(lags) if lags else 0.0,
+        "lag_ms_p99": lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event-loop overhead of live-session billing timers")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--strategies", nargs="+", default=["poll", "sleep", "wheel"])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    header = (
+        f"{'sessions':>8} {'strategy':>8} {'cpu ms/s':>9} {'wakeups/s':>10} "
+        f"{'frames/s':>9} {'wheel/s':>8} {'expired':>8} {'lag avg':>8} {'lag p99':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for sessions in args.sessions:
+        for strategy in args.strategies:
+            result = asyncio.run(_run(strategy, sessions, args.seconds, args.seed))
+            print(
+                f"{sessions:>8} {strategy:>8} {result['cpu_ms_per_s']:>9.1f} "
+                f"{result['session_wakeups_per_s']:>10.0f} {result['frames_per_s']:>9.0f} "
+                f"{result['wheel_wakeups_per_s']:>8.1f} {result['expired']:>8} "
+                f"{result['lag_ms_mean']:>8.2f} {result['lag_ms_p99']:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
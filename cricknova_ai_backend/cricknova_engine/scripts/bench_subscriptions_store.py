@@ -0,0 +1,183 @@
+# FILE: cricknova_engine/scripts/bench_subscriptions_store.py
+#
+# subscriptions.json versus the SQLite subscriptions store.
+#
+#   python cricknova_engine/scripts/bench_subscriptions_store.py --users 100000
+#
+# Seeds a subscriptions.json with --users users in a temporary directory and
+# reports:
+#   json   - per-call cost of the original store, which loads and rewrites
+#            the whole file on every get_subscription / increment_*
+#   sqlite - one-time migration of that file, then get_subscription and
+#            increment_chat on random users
+#   concurrent increments of one user from --workers processes, with the
+#   number of updates lost by each store
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+def _seed(path, users, seed):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    subs = {}
+    for index in range(users):
+        user_id = f"user-{index:07d}"
+        subs[user_id] = {
+            "user_id": user_id,
+            "plan": "yearly",
+            "active": True,
+            "limits": {"chat": 3000, "mistake": 60, "compare": 50},
+            "chat_used": rng.randint(0, 100),
+            "mistake_used": rng.randint(0, 10),
+            "compare_used": 0,
+            "payment_id": f"pay_{index}",
+            "order_id": f"order_{index}",
+            "started_at": now.isoformat(),
+            "expiry": (now + timedelta(days=rng.randint(-30, 365))).isoformat(),
+        }
+    with open(path, "w") as f:
+        json.dump(subs, f, indent=2)
+
+
+# The original JSON store, kept here as the baseline.
+def _json_load(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _json_save(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _json_get(path, user_id):
+    return _json_load(path).get(user_id)
+
+
+def _json_increment_chat(path, user_id):
+    subs = _json_load(path)
+    sub = subs.get(user_id)
+    if not sub:
+        return
+    sub["chat_used"] += 1
+    _json_save(path, subs)
+
+
+def _timed_us(fn, user_ids):
+    samples = []
+    for user_id in user_ids:
+        started = time.perf_counter()
+        fn(user_id)
+        samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return statistics.fmean(samples), samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def _sqlite_worker(user_id, ops):
+    from subscriptions_store import increment_chat
+
+    for _ in range(ops):
+        increment_chat(user_id)
+
+
+def _json_worker(path, user_id, ops):
+    for _ in range(ops):
+        try:
+            _json_increment_chat(path, user_id)
+        except OSError:
+            # Workers share one .tmp path; a replace that loses the race fails.
+            pass
+
+
+def _concurrent(target, args, workers):
+    # Spawned workers import the store fresh, as separate uvicorn workers would.
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=target, args=args) for _ in range(workers)]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="subscriptions.json versus the SQLite subscriptions store")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=20_000, help="SQLite calls per operation")
+    parser.add_argument("--json-ops", type=int, default=10, help="JSON calls per operation (each is O(users))")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrent-ops", type=int, default=2_000, help="SQLite increments per worker")
+    parser.add_argument("--json-concurrent-ops", type=int, default=5, help="JSON increments per worker")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_subscriptions_")
+    json_path = os.path.join(workdir, "subscriptions.json")
+    os.environ["SUBSCRIPTIONS_JSON_PATH"] = json_path
+    os.environ["SUBSCRIPTIONS_DB_PATH"] = os.path.join(workdir, "subscriptions.db")
+    rng = random.Random(args.seed)
+
+    started = time.perf_counter()
+    _seed(json_path, args.users, args.seed)
+    print(f"seeded {args.users} users in {time.perf_counter() - started:.1f}s "
+          f"({os.path.getsize(json_path) / 2**20:.1f} MB) at {workdir}")
+
+    header = f"{'store':>7} {'operation':>16} {'calls':>7} {'mean us':>12} {'p99 us':>12}"
+    print(header)
+    print("-" * len(header))
+
+    def row(store, operation, calls, result):
+        print(f"{store:>7} {operation:>16} {calls:>7} {result[0]:>12.1f} {result[1]:>12.1f}")
+
+    json_users = [f"user-{rng.randrange(args.users):07d}" for _ in range(args.json_ops)]
+    row("json", "get", args.json_ops, _timed_us(lambda user_id: _json_get(json_path, user_id), json_users))
+    row("json", "increment_chat", args.json_ops,
+        _timed_us(lambda user_id: _json_increment_chat(json_path, user_id), json_users))
+
+    import subscriptions_store
+
+    started = time.perf_counter()
+    subscriptions_store.get_subscription("user-0000000")
+    print(f"{'sqlite':>7} {'migrate':>16} {args.users:>7} {(time.perf_counter() - started) * 1000:>11.0f}ms")
+    users = [f"user-{rng.randrange(args.users):07d}" for _ in range(args.ops)]
+    row("sqlite", "get", args.ops, _timed_us(subscriptions_store.get_subscription, users))
+    row("sqlite", "increment_chat", args.ops, _timed_us(subscriptions_store.increment_chat, users))
+    row("sqlite", "get (missing)", args.ops,
+        _timed_us(subscriptions_store.get_subscription, [f"absent-{index}" for index in range(args.ops)]))
+
+    print()
+    hot_user = "user-0000001"
+    # Read the row directly: get_subscription reports an expired user as free.
+    before = subscriptions_store.load_subscriptions()[hot_user]["chat_used"]
+    elapsed = _concurrent(_sqlite_worker, (hot_user, args.concurrent_ops), args.workers)
+    expected = args.workers * args.concurrent_ops
+    gained = subscriptions_store.load_subscriptions()[hot_user]["chat_used"] - before
+    print(f"sqlite  {args.workers} workers x {args.concurrent_ops} increments: "
+          f"{expected / elapsed:.0f} ops/s, lost {expected - gained} of {expected}")
+
+    before = _json_get(json_path, hot_user)["chat_used"]
+    elapsed = _concurrent(_json_worker, (json_path, hot_user, args.json_concurrent_ops), args.workers)
+    expected = args.workers * args.json_concurrent_ops
+    gained = _json_get(json_path, hot_user)["chat_used"] - before
+    print(f"json    {args.workers} workers x {args.json_concurrent_ops} increments: "
+          f"{expected / elapsed:.1f} ops/s, lost {expected - gained} of {expected}")
+
+
+if __name__ == "__main__":
+    main()
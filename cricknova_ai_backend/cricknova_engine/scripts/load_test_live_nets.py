@@ -0,0 +1,560 @@
+# FILE: cricknova_engine/scripts/load_test_live_nets.py
+#
+# Load test for /ws/live-nets against a fake model backend.
+#
+#   python cricknova_engine/scripts/load_test_live_nets.py --sessions 50 --seconds 60
+#   python cricknova_engine/scripts/load_test_live_nets.py --sessions 200 --latency-ms 1500 --error-429 0.05
+#
+# Starts a fake Gemini server (generateContent plus the file upload calls
+# used for clips) whose latency is lognormal around --latency-ms and which
+# fails a configurable share of calls with 429, 500 or a hang. The app is
+# started under uvicorn with GEMINI_BASE_URL pointing at it and SKIP_BILLING
+# on; use --app-url / --app-pid to drive an app that is already running
+# (start it with GEMINI_BASE_URL=http://127.0.0.1:<--model-port> and
+# LOOP_LAG_PROBE_S=0.1, which turns on the app's event-loop lag probe).
+#
+# Each synthetic client sends client_config with protocol 1, then framed
+# JPEG frames of a moving bat-like bar at --fps (or recorded frames from
+# --frames-dir, or MP4 clips from --clips-dir every --clip-interval-s).
+# Every JPEG carries a per-session trailer after its end marker so sessions
+# never share a single-flight analysis. MP4 clips are sent unchanged.
+#
+# Reports time-to-ready and time-to-first-transcript, billing-tick jitter
+# against the cadence, event-loop lag from /__stats, and CPU and RSS of the
+# app process per session.
+
+import argparse
+import asyncio
+import glob
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import cv2
+import numpy as np
+import uvicorn
+import websockets
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from live_protocol import CODEC_JPEG, CODEC_MP4, KIND_CLIP, KIND_IMAGE, encode_record
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_REPLIES = [
+    {
+        "positive": "Your head stayed still over the ball at release.",
+        "mistake": "Your front elbow dropped as the bat came down.",
+        "correction": "Lead with the top hand and keep the elbow high.",
+        "mood": "correction",
+    },
+    {
+        "positive": "Good high backlift with the face open to the ball.",
+        "mistake": "You planted the front foot before reading the length.",
+        "correction": "Wait on the ball and step to the pitch of it.",
+        "mood": "correction",
+    },
+    {
+        "positive": "That was a balanced stride with a full follow through.",
+        "mistake": "There was nothing major to fix on that delivery.",
+        "correction": "Keep the same rhythm for the next ball you face.",
+        "mood": "praise",
+    },
+]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+# -----------------------------
+# Fake model server
+# -----------------------------
+
+class FakeModel:
+    def __init__(self, latency_ms, sigma, error_429, error_500, hang, hang_s, seed):
+        self.mu = math.log(max(1.0, latency_ms))
+        self.sigma = sigma
+        self.error_429 = error_429
+        self.error_500 = error_500
+        self.hang = hang
+        self.hang_s = hang_s
+        self.rng = random.Random(seed)
+        self.uploads = itertools.count(1)
+        self.counters = {"calls": 0, "ok": 0, "429": 0, "500": 0, "hang": 0, "uploads": 0}
+
+    async def generate(self, model):
+        self.counters["calls"] += 1
+        roll = self.rng.random()
+        await asyncio.sleep(self.rng.lognormvariate(self.mu, self.sigma) / 1000.0)
+        if roll < self.error_429:
+            self.counters["429"] += 1
+            return _error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota).")
+        roll -= self.error_429
+        if roll < self.error_500:
+            self.counters["500"] += 1
+            return _error(500, "INTERNAL", "An internal error has occurred.")
+        roll -= self.error_500
+        if roll < self.hang:
+            self.counters["hang"] += 1
+            await asyncio.sleep(self.hang_s)
+            return _error(504, "DEADLINE_EXCEEDED", "Deadline expired before operation could complete.")
+        self.counters["ok"] += 1
+        reply = {"label": "ACTIVE_CRICKET_ACTION", **self.rng.choice(_REPLIES)}
+        return JSONResponse(
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": json.dumps(reply)}]},
+                        "finishReason": "STOP",
+                        "index": 0,
+                    }
+                ],
+                "usageMetadata": {"promptTokenCount": 600, "candidatesTokenCount": 60, "totalTokenCount": 660},
+                "modelVersion": model,
+            }
+        )
+
+
+def _error(code, status, message):
+    return JSONResponse({"error": {"code": code, "message": message, "status": status}}, status_code=code)
+
+
+def _file_resource(name, size):
+    return {
+        "name": name,
+        "mimeType": "video/mp4",
+        "sizeBytes": str(size),
+        "uri": f"https://fake-model.invalid/v1beta/{name}",
+        "state": "ACTIVE",
+    }
+
+
+def create_fake_model_app(model):
+    app = FastAPI()
+
+    @app.post("/{version}/models/{model_call}")
+    async def generate(version: str, model_call: str, request: Request):
+        await request.body()
+        name, _, method = model_call.partition(":")
+        if method != "generateContent":
+            return _error(404, "NOT_FOUND", f"unsupported method {method}")
+        return await model.generate(name)
+
+    @app.post("/upload/{version}/files")
+    async def upload(version: str, request: Request):
+        # Resumable upload: "start" hands out an upload URL, the follow-up
+        # "upload, finalize" call on that URL returns the file resource.
+        body = await request.body()
+        command = request.headers.get("x-goog-upload-command", "")
+        if "start" in command:
+            upload_id = next(model.uploads)
+            return JSONResponse(
+                {},
+                headers={
+                    "x-goog-upload-url": f"{str(request.base_url).rstrip('/')}/upload/{version}/files?upload_id={upload_id}",
+                    "x-goog-upload-status": "active",
+                },
+            )
+        model.counters["uploads"] += 1
+        upload_id = request.query_params.get("upload_id", "0")
+        return JSONResponse(
+            {"file": _file_resource(f"files/load-{upload_id}", len(body))},
+            headers={"x-goog-upload-status": "final"},
+        )
+
+    @app.get("/{version}/files/{file_id}")
+    async def get_file(version: str, file_id: str):
+        return _file_resource(f"files/{file_id}", 0)
+
+    @app.delete("/{version}/files/{file_id}")
+    async def delete_file(version: str, file_id: str):
+        return {}
+
+    return app
+
+
+def _start_fake_model(model, port):
+    server = uvicorn.Server(
+        uvicorn.Config(create_fake_model_app(model), host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("fake model server failed to start")
+        time.sleep(0.05)
+    return server, thread
+
+
+# -----------------------------
+# App process
+# -----------------------------
+
+def _start_app(args, port, model_url):
+    env = dict(os.environ)
+    env.update(
+        {
+            "GEMINI_BASE_URL": model_url,
+            "GEMINI_API_KEY": env.get("GEMINI_API_KEY") or "load-test",
+            "SKIP_BILLING": "true",
+            "LOOP_LAG_PROBE_S": "0.1",
+            "LIVE_BILLING_CADENCE_S": str(args.billing_cadence_s),
+        }
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "spacefoco_backend:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=None if args.app_logs else subprocess.DEVNULL,
+        stderr=None if args.app_logs else subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + args.startup_timeout_s
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"app exited with code {process.returncode} (rerun with --app-logs)")
+        try:
+            _get_json(f"http://127.0.0.1:{port}/__alive", timeout=1.0)
+            return process
+        except OSError:
+            time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError("app did not start in time")
+
+
+def _get_json(url, timeout=5.0):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class ProcessSampler:
+    def __init__(self, pid):
+        self.pid = pid
+        self.process = psutil.Process(pid) if psutil is not None else None
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if self.process is None else 0
+
+    def sample(self):
+        """(cpu seconds, rss bytes) of the app process."""
+        if self.process is not None:
+            cpu = self.process.cpu_times()
+            return cpu.user + cpu.system, self.process.memory_info().rss
+        with open(f"/proc/{self.pid}/stat") as handle:
+            # Fields after the parenthesised command name; utime and stime are 14 and 15.
+            fields = handle.read().rsplit(")", 1)[1].split()
+        cpu_s = (int(fields[11]) + int(fields[12])) / self.clock_ticks
+        rss = 0
+        with open(f"/proc/{self.pid}/status") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                    break
+        return cpu_s, rss
+
+
+# -----------------------------
+# Synthetic clients
+# -----------------------------
+
+def _synthetic_frames(count, width, height):
+    frames = []
+    rng = np.random.default_rng(3)
+    # Textured pitch so frames are never rejected as too dark or blank.
+    background = rng.integers(60, 140, size=(height, width, 3), dtype=np.uint8)
+    for index in range(count):
+        image = background.copy()
+        angle = math.pi * (0.15 + 0.7 * (0.5 + 0.5 * math.sin(2 * math.pi * index / count)))
+        pivot = (width // 2, height // 4)
+        tip = (int(pivot[0] + math.cos(angle) * height * 0.6), int(pivot[1] + math.sin(angle) * height * 0.6))
+        cv2.line(image, pivot, tip, (220, 220, 230), max(4, width // 40))
+        cv2.circle(image, (width // 3 + index * width // (3 * count), height * 2 // 3), max(3, width // 60), (40, 40, 200), -1)
+        ok, encoded = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), 80])
+        if ok:
+            frames.append(encoded.tobytes())
+    return frames
+
+
+def _load_media(args):
+    """(payloads, kind, codec, interval_s)."""
+    if args.clips_dir:
+        paths = sorted(glob.glob(os.path.join(args.clips_dir, "*.mp4")))
+        if not paths:
+            raise SystemExit(f"no .mp4 clips in {args.clips_dir}")
+        return [open(path, "rb").read() for path in paths], KIND_CLIP, CODEC_MP4, args.clip_interval_s
+    if args.frames_dir:
+        paths = sorted(glob.glob(os.path.join(args.frames_dir, "*.jpg")) + glob.glob(os.path.join(args.frames_dir, "*.jpeg")))
+        if not paths:
+            raise SystemExit(f"no .jpg frames in {args.frames_dir}")
+        frames = [open(path, "rb").read() for path in paths]
+    else:
+        frames = _synthetic_frames(48, args.width, args.height)
+    return frames, KIND_IMAGE, CODEC_JPEG, 1.0 / args.fps
+
+
+class SessionResult:
+    def __init__(self, index):
+        self.index = index
+        self.ready_ms = None
+        self.first_transcript_ms = None
+        self.transcripts = 0
+        self.billing_at_ms = []
+        self.messages_sent = 0
+        self.termination = None
+        self.errors = []
+        self.close_code = None
+
+
+async def _receive(ws, result, opened):
+    try:
+        async for message in ws:
+            if isinstance(message, bytes):
+                continue
+            payload = json.loads(message)
+            kind = payload.get("type")
+            now_ms = (time.perf_counter() - opened) * 1000.0
+            if kind == "ready":
+                result.ready_ms = now_ms
+            elif kind == "transcript":
+                result.transcripts += 1
+                if result.first_transcript_ms is None:
+                    result.first_transcript_ms = now_ms
+            elif kind == "billing":
+                result.billing_at_ms.append(now_ms)
+            elif kind == "termination":
+                result.termination = payload.get("reason")
+            elif kind == "error":
+                result.errors.append(payload.get("reason"))
+    except websockets.ConnectionClosed:
+        pass
+    result.close_code = ws.close_code
+
+
+async def _run_session(index, args, media, deadline):
+    payloads, kind, codec, interval_s = media
+    result = SessionResult(index)
+    url = f"{args.ws_url}/ws/live-nets/{args.user_prefix}-{index}"
+    trailer = f"load-session-{index}".encode()
+    opened = time.perf_counter()
+    try:
+        async with websockets.connect(url, max_size=None, open_timeout=30, close_timeout=5) as ws:
+            receiver = asyncio.create_task(_receive(ws, result, opened))
+            await ws.send(
+                json.dumps(
+                    {"type": "client_config", "name": f"Load {index}", "language": "English",
+                     "discipline": "Batting", "protocol": 1}
+                )
+            )
+            next_at = time.monotonic()
+            for count in itertools.count():
+                if receiver.done() or time.monotonic() >= deadline:
+                    break
+                payload = payloads[(index + count) % len(payloads)]
+                if kind == KIND_IMAGE:
+                    payload = payload + trailer
+                record = encode_record(kind, payload, codec=codec, clip_index=count if kind == KIND_CLIP else None)
+                await ws.send(record)
+                result.messages_sent += 1
+                next_at += interval_s
+                await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+            if not receiver.done():
+                await ws.send(json.dumps({"type": "stop"}))
+                try:
+                    await asyncio.wait_for(receiver, args.drain_s)
+                except asyncio.TimeoutError:
+                    receiver.cancel()
+    except Exception as exc:
+        result.errors.append(f"{type(exc).__name__}: {exc}")
+    return result
+
+
+async def _monitor(args, sampler, stop, samples):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            stats = await asyncio.to_thread(_get_json, f"{args.http_url}/__stats")
+        except Exception:
+            stats = None
+        poll_ms = (time.perf_counter() - started) * 1000.0
+        cpu_s, rss = sampler.sample() if sampler else (None, None)
+        samples.append({"at": time.monotonic(), "stats": stats, "poll_ms": poll_ms, "cpu_s": cpu_s, "rss": rss})
+        try:
+            await asyncio.wait_for(stop.wait(), 1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _run(args, sampler):
+    media = _load_media(args)
+    baseline = sampler.sample() if sampler else None
+    stop = asyncio.Event()
+    samples = []
+    monitor = asyncio.create_task(_monitor(args, sampler, stop, samples))
+
+    started = time.monotonic()
+    deadline = started + args.ramp_s + args.seconds
+    tasks = []
+    for index in range(args.sessions):
+        tasks.append(asyncio.create_task(_run_session(index, args, media, deadline)))
+        if args.ramp_s > 0:
+            await asyncio.sleep(args.ramp_s / args.sessions)
+    results = await asyncio.gather(*tasks)
+    stop.set()
+    await monitor
+    return results, samples, baseline, started + args.ramp_s
+
+
+def _report(args, results, samples, baseline, steady_from, fake_model):
+    ready = [r.ready_ms for r in results if r.ready_ms is not None]
+    first = [r.first_transcript_ms for r in results if r.first_transcript_ms is not None]
+    cadence_ms = args.billing_cadence_s * 1000.0
+    jitter = []
+    for r in results:
+        # The first gap includes the partial second before the first tick.
+        gaps = [b - a for a, b in zip(r.billing_at_ms[1:], r.billing_at_ms[2:])]
+        jitter.extend(abs(gap - cadence_ms) for gap in gaps)
+    errors = [error for r in results for error in r.errors]
+    terminations = [r.termination for r in results if r.termination]
+
+    def line(label, values, unit="ms"):
+        if not values:
+            print(f"  {label:<26} n=0")
+            return
+        print(
+            f"  {label:<26} n={len(values):<5} p50={_percentile(values, 0.5):>8.1f}{unit} "
+            f"p90={_percentile(values, 0.9):>8.1f}{unit} p99={_percentile(values, 0.99):>8.1f}{unit} "
+            f"max={max(values):>8.1f}{unit}"
+        )
+
+    print(f"sessions={args.sessions} seconds={args.seconds} ramp_s={args.ramp_s} "
+          f"latency_ms={args.latency_ms} sigma={args.latency_sigma} 429={args.error_429} "
+          f"500={args.error_500} hang={args.error_hang}")
+    print("latency")
+    line("time to ready", ready)
+    line("time to first transcript", first)
+    line("billing tick jitter", jitter)
+    print(f"  transcripts={sum(r.transcripts for r in results)} "
+          f"media_messages={sum(r.messages_sent for r in results)} "
+          f"sessions_without_transcript={len(results) - len(first)}")
+
+    probed = [s["stats"]["event_loop"] for s in samples
+              if s["stats"] and (s["stats"].get("event_loop") or {}).get("samples")]
+    lag_p99 = [loop["lag_ms_p99"] for loop in probed]
+    lag_max = [loop["lag_ms_max"] for loop in probed]
+    print("event loop")
+    if not probed:
+        print("  no lag samples (is the app running with LOOP_LAG_PROBE_S set?)")
+    line("lag p99 per poll", lag_p99)
+    line("lag max per poll", lag_max)
+    line("/__stats round trip", [s["poll_ms"] for s in samples])
+
+    steady = [s for s in samples if s["at"] >= steady_from and s["cpu_s"] is not None]
+    if baseline and len(steady) >= 2:
+        window_s = steady[-1]["at"] - steady[0]["at"]
+        cpu_s = steady[-1]["cpu_s"] - steady[0]["cpu_s"]
+        peak_rss = max(s["rss"] for s in steady)
+        print("app process")
+        print(f"  cpu={100.0 * cpu_s / window_s:.1f}% "
+              f"cpu_ms_per_session_s={1000.0 * cpu_s / window_s / args.sessions:.2f} "
+              f"rss_baseline_mb={baseline[1] / 2**20:.1f} rss_peak_mb={peak_rss / 2**20:.1f} "
+              f"rss_per_session_kb={(peak_rss - baseline[1]) / 1024 / args.sessions:.1f}")
+
+    if samples and samples[-1]["stats"]:
+        stats = samples[-1]["stats"]
+        print("server")
+        print(f"  scheduler={json.dumps(stats.get('scheduler'))}")
+        print(f"  singleflight={json.dumps(stats.get('singleflight'))}")
+    if fake_model is not None:
+        print(f"fake model  {json.dumps(fake_model.counters)}")
+    if terminations:
+        print(f"terminations  {json.dumps({reason: terminations.count(reason) for reason in set(terminations)})}")
+    if errors:
+        print(f"errors  {json.dumps({error: errors.count(error) for error in set(errors)})}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test /ws/live-nets against a fake model backend")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=30.0, help="streaming time once every session is open")
+    parser.add_argument("--ramp-s", type=float, default=5.0, help="spread session starts over this long")
+    parser.add_argument("--fps", type=float, default=4.0)
+    parser.add_argument("--width", type=int, default=320)
+    parser.add_argument("--height", type=int, default=240)
+    parser.add_argument("--frames-dir", help="recorded .jpg frames to stream instead of synthetic ones")
+    parser.add_argument("--clips-dir", help="recorded .mp4 clips to stream instead of frames")
+    parser.add_argument("--clip-interval-s", type=float, default=3.0)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="median fake model latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.4, help="lognormal sigma of the latency")
+    parser.add_argument("--error-429", type=float, default=0.0, help="share of calls answered 429")
+    parser.add_argument("--error-500", type=float, default=0.0, help="share of calls answered 500")
+    parser.add_argument("--error-hang", type=float, default=0.0, help="share of calls that hang")
+    parser.add_argument("--hang-s", type=float, default=30.0)
+    parser.add_argument("--billing-cadence-s", type=int, default=1)
+    parser.add_argument("--model-port", type=int, help="fixed fake model port (default: any free port)")
+    parser.add_argument("--app-url", help="drive a running app (e.g. http://127.0.0.1:8000) instead of starting one")
+    parser.add_argument("--app-pid", type=int, help="pid of the running app, for CPU and RSS")
+    parser.add_argument("--app-logs", action="store_true", help="show the started app's output")
+    parser.add_argument("--startup-timeout-s", type=float, default=60.0)
+    parser.add_argument("--drain-s", type=float, default=10.0)
+    parser.add_argument("--user-prefix", default="load-test")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    fake_model = FakeModel(
+        args.latency_ms, args.latency_sigma, args.error_429, args.error_500,
+        args.error_hang, args.hang_s, args.seed,
+    )
+    model_port = args.model_port or _free_port()
+    model_server, model_thread = _start_fake_model(fake_model, model_port)
+    model_url = f"http://127.0.0.1:{model_port}"
+    print(f"fake model server at {model_url}")
+
+    process = None
+    try:
+        if args.app_url:
+            args.http_url = args.app_url.rstrip("/")
+            pid = args.app_pid
+        else:
+            app_port = _free_port()
+            process = _start_app(args, app_port, model_url)
+            args.http_url = f"http://127.0.0.1:{app_port}"
+            pid = process.pid
+        args.ws_url = "ws" + args.http_url[len("http"):]
+        sampler = ProcessSampler(pid) if pid else None
+        results, samples, baseline, steady_from = asyncio.run(_run(args, sampler))
+        _report(args, results, samples, baseline, steady_from, fake_model)
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        model_server.should_exit = True
+        model_thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
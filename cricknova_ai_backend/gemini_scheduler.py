@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+# Highest priority first. Live coaching must never queue behind a burst of
+# compare requests, so classes are served strictly in this order.
+PRIORITY_CLASSES = ("live", "upload", "chat", "diff")
+
+_WAIT_WINDOW = 256
+
+
+class GeminiScheduler:
+    """
+    Central admission control for Gemini calls.
+
+    - A global concurrency cap bounds how many calls are in flight per worker.
+    - Waiters are queued per priority class; within a class every user has
+      their own FIFO and users are served round-robin, so one heavy user
+      cannot monopolise the keys.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._running = 0
+        self._queues: dict[str, OrderedDict[str, deque[asyncio.Future]]] = {
+            priority: OrderedDict() for priority in PRIORITY_CLASSES
+        }
+        self._waits: dict[str, deque[float]] = {
+            priority: deque(maxlen=_WAIT_WINDOW) for priority in PRIORITY_CLASSES
+        }
+        self._counters: dict[str, dict[str, float]] = {
+            priority: {"admitted": 0, "queued": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+            for priority in PRIORITY_CLASSES
+        }
+
+    @asynccontextmanager
+    async def slot(self, priority: str, user_id: str | None = None) -> AsyncIterator[None]:
+        if priority not in self._queues:
+            raise ValueError(f"Unknown Gemini priority class: {priority}")
+        queued_at = time.monotonic()
+        await self._acquire(priority, user_id or "anonymous")
+        self._record_wait(priority, (time.monotonic() - queued_at) * 1000.0)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _has_waiters(self) -> bool:
+        return any(users for users in self._queues.values())
+
+    async def _acquire(self, priority: str, user_id: str) -> None:
+        if self._running < self.max_concurrency and not self._has_waiters():
+            self._running += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(user_id, deque()).append(future)
+        self._counters[priority]["queued"] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as this waiter was cancelled.
+                self._release()
+            else:
+                self._discard(priority, user_id, future)
+            raise
+
+    def _discard(self, priority: str, user_id: str, future: asyncio.Future) -> None:
+        waiters = self._queues[priority].get(user_id)
+        if not waiters:
+            return
+        with_future_removed = deque(item for item in waiters if item is not future)
+        if with_future_removed:
+            self._queues[priority][user_id] = with_future_removed
+        else:
+            del self._queues[priority][user_id]
+
+    def _release(self) -> None:
+        self._running = max(0, self._running - 1)
+        while self._running < self.max_concurrency:
+            future = self._pop_next()
+            if future is None:
+                return
+            if future.done():
+                continue
+            self._running += 1
+            future.set_result(None)
+
+    def _pop_next(self) -> asyncio.Future | None:
+        for priority in PRIORITY_CLASSES:
+            users = self._queues[priority]
+            if not users:
+                continue
+            user_id, waiters = next(iter(users.items()))
+            future = waiters.popleft()
+            if waiters:
+                users.move_to_end(user_id)
+            else:
+                del users[user_id]
+            return future
+        return None
+
+    def _record_wait(self, priority: str, wait_ms: float) -> None:
+        counters = self._counters[priority]
+        counters["admitted"] += 1
+        counters["wait_ms_total"] += wait_ms
+        counters["wait_ms_max"] = max(counters["wait_ms_max"], wait_ms)
+        self._waits[priority].append(wait_ms)
+
+    def stats(self) -> dict[str, Any]:
+        classes: dict[str, Any] = {}
+        for priority in PRIORITY_CLASSES:
+            counters = self._counters[priority]
+            admitted = int(counters["admitted"])
+            recent = sorted(self._waits[priority])
+            p95 = recent[min(len(recent) - 1, int(len(recent) * 0.95))] if recent else 0.0
+            classes[priority] = {
+                "admitted": admitted,
+                "queued": int(counters["queued"]),
+                "queue_depth": sum(len(waiters) for waiters in self._queues[priority].values()),
+                "waiting_users": len(self._queues[priority]),
+                "wait_ms_avg": round(counters["wait_ms_total"] / admitted, 2) if admitted else 0.0,
+                "wait_ms_p95": round(p95, 2),
+                "wait_ms_max": round(counters["wait_ms_max"], 2),
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self._running,
+            "classes": classes,
+        }
@@ -1,11 +1,15 @@
 import os
 import re
 from functools import lru_cache
+from typing import Iterator
 
 import google.generativeai as genai
 from google.generativeai.types import GenerationConfig
 
+from singleflight import SingleFlight, content_key
+
 _key_index = 0
+_text_flight = SingleFlight("text")
 
 
 def _gemini_api_keys() -> list[str]:
@@ -93,6 +97,29 @@ def generate_text(
     user_prompt: str,
     max_output_tokens: int = 256,
     temperature: float = 0.6,
+) -> str:
+    key = content_key(system_instruction, user_prompt, max_output_tokens, temperature)
+    return _text_flight.do(
+        key,
+        lambda: _generate_text_uncoalesced(
+            system_instruction=system_instruction,
+            user_prompt=user_prompt,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        ),
+    )
+
+
+def text_singleflight_stats() -> dict:
+    return _text_flight.stats()
+
+
+def _generate_text_uncoalesced(
+    *,
+    system_instruction: str,
+    user_prompt: str,
+    max_output_tokens: int,
+    temperature: float,
 ) -> str:
     keys = _gemini_api_keys()
     if not keys:
@@ -128,3 +155,58 @@ def generate_text(
                 continue
             raise
     raise RuntimeError(f"GEMINI_TEXT_ALL_KEYS_QUOTA_EXHAUSTED: {last_quota_error}")
+
+
+def stream_text(
+    *,
+    system_instruction: str,
+    user_prompt: str,
+    max_output_tokens: int = 256,
+    temperature: float = 0.6,
+) -> Iterator[str]:
+    keys = _gemini_api_keys()
+    if not keys:
+        raise RuntimeError("GEMINI_API_KEY environment variable is not set")
+
+    global _key_index
+    last_quota_error: Exception | None = None
+    for offset in range(len(keys)):
+        index = (_key_index + offset) % len(keys)
+        emitted = False
+        try:
+            genai.configure(api_key=keys[index])
+            model = genai.GenerativeModel(
+                model_name=_resolve_model_name(),
+                system_instruction=system_instruction,
+            )
+            response = model.generate_content(
+                user_prompt,
+                generation_config=GenerationConfig(
+                    max_output_tokens=max_output_tokens,
+                    temperature=temperature,
+                ),
+                stream=True,
+            )
+            for chunk in response:
+                try:
+                    text = getattr(chunk, "text", None) or ""
+                except ValueError:
+                    # Chunks without text parts (e.g. safety-only) raise on .text.
+                    continue
+                if text:
+                    emitted = True
+                    yield text
+            _key_index = index
+            if offset > 0:
+                print(f"GEMINI_TEXT_KEY_RECOVERED active_index={index + 1}/{len(keys)}")
+            return
+        except Exception as exc:
+            # Once text has reached the client a key switch would restart the reply.
+            if not emitted and _is_quota_error(exc):
+                last_quota_error = exc
+                print(
+                    f"GEMINI_TEXT_KEY_QUOTA_EXHAUSTED index={index + 1}/{len(keys)}: {exc}"
+                )
+                continue
+            raise
+    raise RuntimeError(f"GEMINI_TEXT_ALL_KEYS_QUOTA_EXHAUSTED: {last_quota_error}")
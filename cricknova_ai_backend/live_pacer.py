@@ -0,0 +1,82 @@
+from typing import Any
+
+
+class LivePacer:
+    """
+    Per-session analysis cadence for the live-nets mailbox.
+
+    - Model latency is tracked as an EWMA; the gap enforced between one
+      analysis finishing and the next starting is a fraction of it, so a slow
+      model is not hammered back to back and a fast one is not held to a
+      fixed interval.
+    - The mailbox keeps only the newest frame. Every overwrite is a dropped
+      frame; when frames are regularly dropped between analyses the gap is
+      halved, because waiting only makes the analysed frame older.
+    - A frame that sat in the mailbox longer than `stale_after_s` is skipped.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_gap_s: float = 0.2,
+        max_gap_s: float = 3.0,
+        gap_ratio: float = 0.25,
+        alpha: float = 0.3,
+        stale_after_s: float = 6.0,
+    ):
+        self.min_gap_s = min_gap_s
+        self.max_gap_s = max(min_gap_s, max_gap_s)
+        self.gap_ratio = gap_ratio
+        self.alpha = alpha
+        self.stale_after_s = stale_after_s
+        self.latency_ewma_s: float | None = None
+        self.overwrite_ewma = 0.0
+        self._overwrites_since_start = 0
+        self._last_finished_at: float | None = None
+        self._counters = {"received": 0, "dropped": 0, "stale": 0, "analysed": 0}
+
+    def on_received(self, replaced: bool) -> None:
+        self._counters["received"] += 1
+        if replaced:
+            self._counters["dropped"] += 1
+            self._overwrites_since_start += 1
+
+    def gap_s(self) -> float:
+        if self.latency_ewma_s is None:
+            return self.min_gap_s
+        gap = self.latency_ewma_s * self.gap_ratio
+        if self.overwrite_ewma >= 1.0:
+            gap *= 0.5
+        return min(self.max_gap_s, max(self.min_gap_s, gap))
+
+    def wait_s(self, now: float) -> float:
+        if self._last_finished_at is None:
+            return 0.0
+        return max(0.0, self._last_finished_at + self.gap_s() - now)
+
+    def is_stale(self, received_at: float, now: float) -> bool:
+        if now - received_at <= self.stale_after_s:
+            return False
+        self._counters["stale"] += 1
+        return True
+
+    def on_started(self) -> None:
+        overwrites = self._overwrites_since_start
+        self._overwrites_since_start = 0
+        self.overwrite_ewma += self.alpha * (overwrites - self.overwrite_ewma)
+
+    def on_finished(self, latency_s: float, now: float) -> None:
+        self._counters["analysed"] += 1
+        self._last_finished_at = now
+        if self.latency_ewma_s is None:
+            self.latency_ewma_s = latency_s
+        else:
+            self.latency_ewma_s += self.alpha * (latency_s - self.latency_ewma_s)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._counters,
+            "latency_ewma_ms": round(self.latency_ewma_s * 1000.0, 1) if self.latency_ewma_s is not None else None,
+            "overwrites_per_analysis": round(self.overwrite_ewma, 3),
+            "gap_ms": round(self.gap_s() * 1000.0, 1),
+        }
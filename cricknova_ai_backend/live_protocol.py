@@ -0,0 +1,127 @@
+import struct
+from dataclasses import dataclass
+
+# Binary media framing for /ws/live-nets.
+#
+# Every binary WebSocket message is one or more records laid back to back:
+#
+#   offset  size  field
+#   0       2     magic b"CN"
+#   2       1     protocol version
+#   3       1     kind        (1 = image frame, 2 = video clip)
+#   4       1     codec       (1 = JPEG, 2 = MP4)
+#   5       1     flags       (reserved, must be 0)
+#   6       4     clip index  (signed, -1 = none)
+#   10      4     payload length
+#   14      n     payload
+#
+# All integers are big-endian. Several image records in one message form a
+# batch (the binary equivalent of the JSON `video_batch` message). Control
+# messages (client_config, stop, ...) stay JSON text frames.
+
+MAGIC = b"CN"
+PROTOCOL_VERSION = 1
+SUPPORTED_VERSIONS = (1,)
+
+KIND_IMAGE = 1
+KIND_CLIP = 2
+
+CODEC_JPEG = 1
+CODEC_MP4 = 2
+CODEC_MIME_TYPES = {
+    CODEC_JPEG: "image/jpeg",
+    CODEC_MP4: "video/mp4",
+}
+
+_HEADER = struct.Struct(">2sBBBBiI")
+HEADER_SIZE = _HEADER.size
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class MediaRecord:
+    kind: int
+    codec: int
+    clip_index: int | None
+    payload: memoryview
+
+
+def negotiate_version(requested: object) -> int:
+    """
+    Highest version both sides speak; 0 means legacy base64-in-JSON.
+    `requested` is what the client sent in client_config: an int or a list.
+    """
+    if isinstance(requested, (list, tuple)):
+        offered = requested
+    else:
+        offered = [requested]
+    versions = set()
+    for item in offered:
+        try:
+            versions.add(int(item))
+        except (TypeError, ValueError):
+            continue
+    common = versions.intersection(SUPPORTED_VERSIONS)
+    return max(common) if common else 0
+
+
+def parse_media_message(data: bytes | bytearray | memoryview) -> list[MediaRecord]:
+    """Split one binary message into records. Payloads are views into `data`."""
+    view = memoryview(data).cast("B")
+    records: list[MediaRecord] = []
+    offset = 0
+    while offset < len(view):
+        if len(view) - offset < HEADER_SIZE:
+            raise ProtocolError(f"truncated header at offset {offset}")
+        magic, version, kind, codec, flags, clip_index, length = _HEADER.unpack_from(view, offset)
+        if magic != MAGIC:
+            raise ProtocolError(f"bad magic at offset {offset}")
+        if version not in SUPPORTED_VERSIONS:
+            raise ProtocolError(f"unsupported protocol version {version}")
+        if kind not in (KIND_IMAGE, KIND_CLIP):
+            raise ProtocolError(f"unknown record kind {kind}")
+        if codec not in CODEC_MIME_TYPES:
+            raise ProtocolError(f"unknown codec {codec}")
+        if flags != 0:
+            raise ProtocolError(f"reserved flags set ({flags:#04x}) at offset {offset}")
+        start = offset + HEADER_SIZE
+        end = start + length
+        if end > len(view):
+            raise ProtocolError(f"payload length {length} exceeds message at offset {offset}")
+        if length == 0:
+            raise ProtocolError(f"empty payload at offset {offset}")
+        records.append(
+            MediaRecord(
+                kind=kind,
+                codec=codec,
+                clip_index=clip_index if clip_index >= 0 else None,
+                payload=view[start:end],
+            )
+        )
+        offset = end
+    if not records:
+        raise ProtocolError("empty media message")
+    return records
+
+
+def encode_record(
+    kind: int,
+    payload: bytes,
+    *,
+    codec: int,
+    clip_index: int | None = None,
+    version: int = PROTOCOL_VERSION,
+) -> bytes:
+    header = _HEADER.pack(
+        MAGIC,
+        version,
+        kind,
+        codec,
+        0,
+        -1 if clip_index is None else int(clip_index),
+        len(payload),
+    )
+    return header + bytes(payload)
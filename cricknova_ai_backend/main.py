@@ -5,8 +5,9 @@ import json
 import os
 import sys
 import time
-from contextlib import suppress
-from typing import Any
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
 
 # Ensure the repo root (the directory containing this file) is on sys.path.
 # Using the parent-of-parent can point outside the deployed repo on Render.
@@ -21,6 +22,8 @@ import math
 import numpy as np
 import cv2
 from gemini_text import generate_text
+from outbound_queue import OutboundQueue
+from voice_activity import VoiceActivityGate
 from pydantic import BaseModel
 from fastapi import Body
 from fastapi import FastAPI
@@ -63,6 +66,17 @@ def _resolve_live_model_name() -> str:
 
 
 LIVE_MODEL_NAME = _resolve_live_model_name()
+# Client PCM is passed through a local voice-activity gate so silence is not
+# streamed to the Live API; set LIVE_AUDIO_VAD=false to forward everything.
+LIVE_AUDIO_VAD_ENABLED = os.getenv("LIVE_AUDIO_VAD", "true").lower() in ("true", "1", "yes")
+LIVE_AUDIO_SAMPLE_RATE = int(os.getenv("LIVE_AUDIO_SAMPLE_RATE", "16000"))
+
+EDGE_POLICY_BAN_NOTICE = (
+    "ACCOUNT LOCKED FOR 27 DAYS.\n\n"
+    "Repeated non-cricket uploads triggered an account restriction. "
+    "All CrickNova AI and paid features are disabled until the lock expires."
+)
+
 LIVE_SYSTEM_INSTRUCTION = """Context & Role:
 You are "CrickNova AI", an elite cricket coach giving short real-time feedback from the non-striker's end.
 Keep every response under 25 words.
@@ -116,14 +130,111 @@ def _live_gemini() -> Client:
     return _live_gemini_client
 
 
-async def _get_live_balance_ms(user_id: str) -> int:
-    def read() -> int:
+def _live_banned_until(data: dict[str, Any]) -> str | None:
+    banned_until = data.get("edge_policy_banned_until")
+    if not isinstance(banned_until, datetime):
+        return None
+    if banned_until.tzinfo is None:
+        banned_until = banned_until.replace(tzinfo=timezone.utc)
+    if banned_until <= datetime.now(timezone.utc):
+        return None
+    return banned_until.isoformat()
+
+
+async def _get_live_start_state(user_id: str) -> tuple[int, str | None]:
+    # Balance and ban come from the same user document, so one read serves both.
+    def read() -> tuple[int, str | None]:
         snap = _live_doc(user_id).get()
-        return _live_balance_ms_from_data(snap.to_dict() if snap.exists else {})
+        data = snap.to_dict() if snap.exists else {}
+        return _live_balance_ms_from_data(data), _live_banned_until(data)
 
     return await asyncio.to_thread(read)
 
 
+def _live_instruction(player_name: str, language: str, discipline: str) -> str:
+    return f"""Context & Role:
+You are "CrickNova AI", a tough, high-energy, elite cricket coach standing at the non-striker's end talking directly into the earbuds of the player named {player_name}.
+You see their live training frames ({discipline}) and give real-time coaching advice.
+Format: Respond with exactly ONE complete punchy coaching line/sentence of 10 to 22 words. Do NOT output single words, bullet points, or formatting.
+
+Strict Tone Rules:
+1. If the shot/movement is GOOD: Be extremely happy, proud, and use encouraging, positive coaching language.
+2. If the shot/movement is a MISTAKE/BAD: Be extremely strict, rude, harsh, and cruel. Point out the technical fault sharply and command an instant fix.
+
+Language Rule:
+You MUST respond only in {language}. For example, if the language is Marathi, speak in Marathi. If Hindi, speak in Hindi. If English, speak in English. Do not use any other language.
+"""
+
+
+def _live_settings_turn(payload: dict[str, Any]) -> str:
+    # The Live session is opened with the generic instruction before the
+    # client's config is known; the player's settings follow as a turn.
+    player_name = str(payload.get("name", "Player")).strip() or "Player"
+    language = str(payload.get("language", "English")).strip() or "English"
+    discipline = str(payload.get("discipline", "Batting")).strip() or "Batting"
+    return (
+        f"Session settings: the player's name is {player_name} and they are training {discipline}. "
+        f"From now on you MUST respond only in {language}."
+    )
+
+
+async def _receive_client_config(client_ws: WebSocket, timeout_s: float) -> dict[str, Any] | None:
+    try:
+        config_msg = await asyncio.wait_for(client_ws.receive(), timeout=timeout_s)
+        if config_msg.get("text"):
+            payload = json.loads(config_msg["text"])
+            if payload.get("type") == "client_config":
+                return payload
+    except Exception as e:
+        print(f"Failed to receive client_config: {e}")
+    return None
+
+
+async def _timed(step: str, timings: dict[str, int], awaitable: Any) -> Any:
+    started_ns = time.monotonic_ns()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = (time.monotonic_ns() - started_ns) // 1_000_000
+
+
+@asynccontextmanager
+async def _live_connect_in_task(connect: Any, timings: dict[str, int]) -> AsyncIterator[asyncio.Future]:
+    # The Live API connect context is entered and exited by one task of its
+    # own, so the account checks can run while it connects. Leaving this
+    # block releases the session, or cancels the connect if it is still
+    # pending (a banned or zero-balance user never gets a model session).
+    session: asyncio.Future = asyncio.get_running_loop().create_future()
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        started_ns = time.monotonic_ns()
+        try:
+            async with connect as live_session:
+                timings["model_connect_ms"] = (time.monotonic_ns() - started_ns) // 1_000_000
+                session.set_result(live_session)
+                await release.wait()
+        except asyncio.CancelledError:
+            session.cancel()
+            raise
+        except Exception as exc:
+            if not session.done():
+                session.set_exception(exc)
+            raise
+
+    task = asyncio.create_task(hold())
+    try:
+        yield session
+    finally:
+        release.set()
+        if not session.done():
+            task.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await task
+        if session.done() and not session.cancelled():
+            session.exception()
+
+
 async def _charge_live_elapsed_ms(user_id: str, elapsed_ms: int) -> int:
     @firestore.transactional
     def txn_body(transaction: firestore.Transaction) -> int:
@@ -151,7 +262,7 @@ async def _charge_live_elapsed_ms(user_id: str, elapsed_ms: int) -> int:
 
 
 async def _live_billing_guard(
-    client_ws: WebSocket,
+    client_ws: WebSocket | OutboundQueue,
     stop: asyncio.Event,
     start_ns: int,
     starting_balance_ms: int,
@@ -177,7 +288,12 @@ async def _live_billing_guard(
             return
 
 
-async def _live_from_flutter(client_ws: WebSocket, live_session: Any, stop: asyncio.Event) -> None:
+async def _live_from_flutter(
+    client_ws: WebSocket,
+    live_session: Any,
+    stop: asyncio.Event,
+    vad: VoiceActivityGate | None = None,
+) -> None:
     frame_count = 0
 
     async def send_video_frame(frame_bytes: bytes) -> None:
@@ -215,12 +331,15 @@ async def _live_from_flutter(client_ws: WebSocket, live_session: Any, stop: asyn
                 await send_video_frame(frame)
             elif kind == "audio":
                 audio = base64.b64decode(payload["data"])
-                await live_session.send(input={"data": audio, "mime_type": "audio/pcm"},
-                                        end_of_turn=True)
+                for chunk in vad.process(audio) if vad is not None else [audio]:
+                    await live_session.send(input={"data": chunk, "mime_type": "audio/pcm"},
+                                            end_of_turn=True)
             elif kind == "user_text":
                 spoken = str(payload.get("text", "")).strip()
                 if spoken:
                     await live_session.send(input=spoken, end_of_turn=True)
+            elif kind == "client_config":
+                await live_session.send(input=_live_settings_turn(payload), end_of_turn=False)
             elif kind == "stop":
                 stop.set()
                 return
@@ -230,7 +349,11 @@ async def _live_from_flutter(client_ws: WebSocket, live_session: Any, stop: asyn
             await send_video_frame(raw)
 
 
-async def _live_from_gemini(client_ws: WebSocket, live_session: Any, stop: asyncio.Event) -> None:
+async def _live_from_gemini(
+    client_ws: WebSocket | OutboundQueue,
+    live_session: Any,
+    stop: asyncio.Event,
+) -> None:
     async for response in live_session.receive():
         if stop.is_set():
             return
@@ -250,68 +373,72 @@ async def _live_from_gemini(client_ws: WebSocket, live_session: Any, stop: async
 
 @app.websocket("/ws/live-nets/{user_id}")
 async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
-    try:
-        await websocket.accept()
-        starting_balance_ms = await _get_live_balance_ms(user_id)
-        if starting_balance_ms <= 0:
-            await websocket.send_json({"type": "termination", "reason": "NO_LIVE_BALANCE"})
-            await websocket.close(code=4003)
-            return
-
-        await websocket.send_json(
-            {
-                "type": "ready",
-                "live_milliseconds_remaining": starting_balance_ms,
-                "live_seconds_remaining": _legacy_seconds(starting_balance_ms),
-            }
-        )
-
-        stop = asyncio.Event()
-        start_ns = time.monotonic_ns()
-        billed = False
-
-        # Read client config first to customize system instruction with correct language
-        player_name = "Player"
-        language = "English"
-        discipline = "Batting"
+    stop = asyncio.Event()
+    billed = False
+    async with AsyncExitStack() as stack:
         try:
-            config_msg = await asyncio.wait_for(websocket.receive(), timeout=5.0)
-            if config_msg.get("text"):
-                payload = json.loads(config_msg["text"])
-                if payload.get("type") == "client_config":
-                    player_name = str(payload.get("name", player_name)).strip() or player_name
-                    language = str(payload.get("language", language)).strip() or language
-                    discipline = str(payload.get("discipline", discipline)).strip() or discipline
-        except Exception as e:
-            print(f"Failed to receive client_config: {e}")
-
-        # Build dynamic system instruction using the user's preferred language and training mode
-        dynamic_instruction = f"""Context & Role:
-You are "CrickNova AI", a tough, high-energy, elite cricket coach standing at the non-striker's end talking directly into the earbuds of the player named {player_name}.
-You see their live training frames ({discipline}) and give real-time coaching advice.
-Format: Respond with exactly ONE complete punchy coaching line/sentence of 10 to 22 words. Do NOT output single words, bullet points, or formatting.
-
-Strict Tone Rules:
-1. If the shot/movement is GOOD: Be extremely happy, proud, and use encouraging, positive coaching language.
-2. If the shot/movement is a MISTAKE/BAD: Be extremely strict, rude, harsh, and cruel. Point out the technical fault sharply and command an instant fix.
-
-Language Rule:
-You MUST respond only in {language}. For example, if the language is Marathi, speak in Marathi. If Hindi, speak in Hindi. If English, speak in English. Do not use any other language.
-"""
-
-        config = types.LiveConnectConfig(
-            response_modalities=["TEXT"],
-            system_instruction=dynamic_instruction,
-        )
+            await websocket.accept()
+            accepted_ns = time.monotonic_ns()
+
+            # The Live API connect starts first and runs while the ban/balance
+            # read and the client_config wait do; the session starts with the
+            # generic instruction.
+            config = types.LiveConnectConfig(
+                response_modalities=["TEXT"],
+                system_instruction=_live_instruction("Player", "English", "Batting"),
+            )
+            timings: dict[str, int] = {}
+            connecting = await stack.enter_async_context(
+                _live_connect_in_task(_live_gemini().aio.live.connect(model=LIVE_MODEL_NAME, config=config), timings)
+            )
+            state, client_config = await asyncio.gather(
+                _timed("account_ms", timings, _get_live_start_state(user_id)),
+                _timed("client_config_ms", timings, _receive_client_config(websocket, 5.0)),
+                return_exceptions=True,
+            )
+            if isinstance(state, BaseException):
+                raise state
+            starting_balance_ms, banned_until = state
+            if banned_until is not None:
+                await websocket.send_json(
+                    {
+                        "type": "policy_banned",
+                        "text": EDGE_POLICY_BAN_NOTICE,
+                        "refund_minutes": False,
+                        "terminate_session": True,
+                        "banned_until": banned_until,
+                    }
+                )
+                await websocket.close(code=4003)
+                return
+            if starting_balance_ms <= 0:
+                await websocket.send_json({"type": "termination", "reason": "NO_LIVE_BALANCE"})
+                await websocket.close(code=4003)
+                return
+            session = await connecting
 
-        async with _live_gemini().aio.live.connect(model=LIVE_MODEL_NAME, config=config) as session:
+            start_ns = time.monotonic_ns()
+            time_to_ready_ms = (start_ns - accepted_ns) // 1_000_000
+            print(f"LIVE_SESSION_READY user={user_id} time_to_ready_ms={time_to_ready_ms} {timings}")
+            await websocket.send_json(
+                {
+                    "type": "ready",
+                    "live_milliseconds_remaining": starting_balance_ms,
+                    "live_seconds_remaining": _legacy_seconds(starting_balance_ms),
+                    "time_to_ready_ms": time_to_ready_ms,
+                }
+            )
             await websocket.send_json(
                 {
                     "type": "connected",
                     "model": LIVE_MODEL_NAME,
+                    "time_to_ready_ms": time_to_ready_ms,
+                    "startup": timings,
                 }
             )
             with suppress(Exception):
+                if isinstance(client_config, dict):
+                    await session.send(input=_live_settings_turn(client_config), end_of_turn=False)
                 await session.send(
                     input=(
                         "Start live cricket detection now. Watch every incoming frame "
@@ -321,17 +448,30 @@ You MUST respond only in {language}. For example, if the language is Marathi, sp
                     ),
                     end_of_turn=True,
                 )
+            # Model output and billing are queued per socket so a slow link
+            # drops stale audio/transcripts instead of stalling the stream.
+            outbound = OutboundQueue(websocket)
+            outbound_task = asyncio.create_task(outbound.run())
+            vad = VoiceActivityGate(sample_rate=LIVE_AUDIO_SAMPLE_RATE) if LIVE_AUDIO_VAD_ENABLED else None
             tasks = [
                 asyncio.create_task(
-                    _live_billing_guard(websocket, stop, start_ns, starting_balance_ms)
+                    _live_billing_guard(outbound, stop, start_ns, starting_balance_ms)
                 ),
-                asyncio.create_task(_live_from_flutter(websocket, session, stop)),
-                asyncio.create_task(_live_from_gemini(websocket, session, stop)),
+                asyncio.create_task(_live_from_flutter(websocket, session, stop, vad)),
+                asyncio.create_task(_live_from_gemini(outbound, session, stop)),
+                outbound_task,
             ]
             done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
             stop.set()
             for task in pending:
-                task.cancel()
+                if task is not outbound_task:
+                    task.cancel()
+            outbound.finish()
+            with suppress(Exception):
+                await asyncio.wait_for(outbound_task, 2.0)
+            print(f"LIVE_SESSION_OUTBOUND user={user_id} {outbound.stats()}")
+            if vad is not None:
+                print(f"LIVE_SESSION_AUDIO_VAD user={user_id} {vad.stats()}")
             for task in done:
                 with suppress(WebSocketDisconnect):
                     task.result()
@@ -341,28 +481,28 @@ You MUST respond only in {language}. For example, if the language is Marathi, sp
             )
             await _charge_live_elapsed_ms(user_id, elapsed_ms)
             billed = True
-    except WebSocketDisconnect:
-        with suppress(Exception):
-            stop.set()
-    except Exception as exc:
-        with suppress(Exception):
-            await websocket.send_json(
-                {
-                    "type": "error",
-                    "reason": f"Live AI backend error: {exc}",
-                }
-            )
-            await websocket.close(code=1011)
-    finally:
-        with suppress(Exception):
-            stop.set()
-        if "starting_balance_ms" in locals() and "start_ns" in locals() and not billed:
-            elapsed_ms = min(
-                starting_balance_ms,
-                (time.monotonic_ns() - start_ns) // 1_000_000,
-            )
+        except WebSocketDisconnect:
             with suppress(Exception):
-                await _charge_live_elapsed_ms(user_id, elapsed_ms)
+                stop.set()
+        except Exception as exc:
+            with suppress(Exception):
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "reason": f"Live AI backend error: {exc}",
+                    }
+                )
+                await websocket.close(code=1011)
+        finally:
+            with suppress(Exception):
+                stop.set()
+            if "starting_balance_ms" in locals() and "start_ns" in locals() and not billed:
+                elapsed_ms = min(
+                    starting_balance_ms,
+                    (time.monotonic_ns() - start_ns) // 1_000_000,
+                )
+                with suppress(Exception):
+                    await _charge_live_elapsed_ms(user_id, elapsed_ms)
 
 try:
     from subscriptions_store import get_current_user
@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+PRIORITY_CRITICAL = 0    # termination, billing, policy, errors: never dropped
+PRIORITY_TRANSCRIPT = 1  # coaching text
+PRIORITY_AUDIO = 2       # model audio chunks: dropped first
+
+_PRIORITY_NAMES = {PRIORITY_TRANSCRIPT: "transcript", PRIORITY_AUDIO: "audio"}
+
+
+def priority_of(payload: dict[str, Any]) -> int:
+    # Unknown message types are treated as critical rather than risk losing one.
+    if payload.get("type") == "transcript":
+        return PRIORITY_TRANSCRIPT
+    return PRIORITY_CRITICAL
+
+
+class OutboundQueue:
+    """
+    Bounded per-socket send queue with one sender task.
+
+    Producers call `send_json` / `send_bytes` / `close` exactly as they would
+    on the WebSocket, but only enqueue, so a slow client link never stalls
+    the billing guard, the analysis loop or the model stream.
+
+    - At most `max_items` droppable messages wait. When the queue is full the
+      oldest audio chunk goes first, then the oldest transcript; if nothing
+      queued is less important than the new message, the new one is dropped.
+    - Critical messages (termination, billing, policy, errors) are never
+      dropped and may exceed the limit. A billing snapshot still waiting in
+      the queue is replaced by a newer one rather than queued twice.
+    - Transcripts and audio older than their max age when they reach the
+      front are dropped as stale.
+    - `finish` lets the sender flush what is queued and then stop.
+    """
+
+    def __init__(
+        self,
+        websocket: Any,
+        *,
+        max_items: int = 64,
+        transcript_max_age_s: float = 10.0,
+        audio_max_age_s: float = 2.0,
+    ):
+        self.websocket = websocket
+        self.max_items = max(1, max_items)
+        self._max_age = {
+            PRIORITY_TRANSCRIPT: transcript_max_age_s,
+            PRIORITY_AUDIO: audio_max_age_s,
+        }
+        # (priority, enqueued_at, kind, data)
+        self._items: deque[tuple[int, float, str, Any]] = deque()
+        self._droppable = 0
+        self._wake = asyncio.Event()
+        self._finishing = False
+        self._closed = False
+        self._counters = {
+            "enqueued": 0,
+            "sent": 0,
+            "max_depth": 0,
+            "dropped_audio": 0,
+            "dropped_transcript": 0,
+            "stale_audio": 0,
+            "stale_transcript": 0,
+            "dropped_after_close": 0,
+            "billing_coalesced": 0,
+        }
+
+    async def send_json(self, payload: dict[str, Any], priority: int | None = None) -> bool:
+        return self.put("json", payload, priority_of(payload) if priority is None else priority)
+
+    async def send_bytes(self, data: bytes, priority: int = PRIORITY_AUDIO) -> bool:
+        return self.put("bytes", data, priority)
+
+    async def close(self, code: int = 1000) -> bool:
+        return self.put("close", code, PRIORITY_CRITICAL)
+
+    def put(self, kind: str, data: Any, priority: int) -> bool:
+        if self._closed:
+            self._counters["dropped_after_close"] += 1
+            return False
+        if kind == "json" and data.get("type") == "billing" and self._replace_billing(data):
+            return True
+        if priority != PRIORITY_CRITICAL and self._droppable >= self.max_items:
+            if not self._evict_for(priority):
+                self._counters[f"dropped_{_PRIORITY_NAMES[priority]}"] += 1
+                return False
+        self._items.append((priority, time.monotonic(), kind, data))
+        if priority != PRIORITY_CRITICAL:
+            self._droppable += 1
+        self._counters["enqueued"] += 1
+        self._counters["max_depth"] = max(self._counters["max_depth"], len(self._items))
+        self._wake.set()
+        return True
+
+    def _replace_billing(self, payload: dict[str, Any]) -> bool:
+        for index, (priority, enqueued_at, kind, data) in enumerate(self._items):
+            if kind == "json" and data.get("type") == "billing":
+                self._items[index] = (priority, enqueued_at, kind, payload)
+                self._counters["billing_coalesced"] += 1
+                return True
+        return False
+
+    def _evict_for(self, priority: int) -> bool:
+        victim = None
+        for index, item in enumerate(self._items):
+            if item[0] == PRIORITY_CRITICAL:
+                continue
+            if victim is None or item[0] > self._items[victim][0]:
+                victim = index
+        if victim is None or self._items[victim][0] < priority:
+            return False
+        evicted = self._items[victim][0]
+        del self._items[victim]
+        self._droppable -= 1
+        self._counters[f"dropped_{_PRIORITY_NAMES[evicted]}"] += 1
+        return True
+
+    def finish(self) -> None:
+        self._finishing = True
+        self._wake.set()
+
+    async def run(self) -> None:
+        while True:
+            if not self._items:
+                if self._finishing or self._closed:
+                    return
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            priority, enqueued_at, kind, data = self._items.popleft()
+            if priority != PRIORITY_CRITICAL:
+                self._droppable -= 1
+                if time.monotonic() - enqueued_at > self._max_age[priority]:
+                    self._counters[f"stale_{_PRIORITY_NAMES[priority]}"] += 1
+                    continue
+            try:
+                if kind == "json":
+                    await self.websocket.send_json(data)
+                elif kind == "bytes":
+                    await self.websocket.send_bytes(data)
+                else:
+                    self._closed = True
+                    await self.websocket.close(code=data)
+                    return
+            except Exception:
+                self._closed = True
+                raise
+            self._counters["sent"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": len(self._items),
+            "max_items": self.max_items,
+            **self._counters,
+        }
@@ -0,0 +1,263 @@
+import json
+import os
+import socket
+import time
+from typing import Any
+
+# Shared live-session state for running /ws/live-nets on several workers or
+# nodes. Everything goes through a Redis client (redis.asyncio when
+# LIVE_REGISTRY_URL / REDIS_URL is set); InMemoryRedis implements the same
+# command subset for a single process and for tests.
+#
+# Keys (all under `prefix`):
+#   lease:{user}      -> session id holding the user's live balance (PX ttl)
+#   session:{sid}     -> JSON route + billing checkpoint, kept for a day so a
+#                        crashed worker's elapsed time can still be charged
+#   last:{user}       -> most recent session id for the user
+#   ban:{user}        -> JSON ban status published by any worker
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+NODE_ID = os.getenv("RENDER_INSTANCE_ID") or os.getenv("HOSTNAME") or socket.gethostname()
+
+SESSION_META_TTL_MS = 24 * 60 * 60 * 1000
+
+# KEYS[1] = lease key, ARGV[1] = expected owner, ARGV[2] = ttl ms
+_REFRESH_IF_OWNER = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# KEYS[1] = lease key, ARGV[1] = expected owner
+_DELETE_IF_OWNER = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# KEYS[1] = lease key, ARGV[1] = new owner, ARGV[2] = ttl ms; returns the
+# previous owner (nil if the lease was free)
+_TAKE_OVER = """
+local previous = redis.call('GET', KEYS[1])
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return previous
+"""
+
+_SCRIPT_NAMES = {
+    _REFRESH_IF_OWNER: "refresh_if_owner",
+    _DELETE_IF_OWNER: "delete_if_owner",
+    _TAKE_OVER: "take_over",
+}
+
+
+class InMemoryRedis:
+    """
+    Single-process stand-in for the redis.asyncio commands SessionRegistry
+    uses: GET, SET (px), DEL, PEXPIRE and EVAL of the registry's own
+    compare-and-act scripts. Values are stored as bytes like real Redis.
+    """
+
+    def __init__(self):
+        self._data: dict[str, tuple[bytes, float | None]] = {}
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _live(self, key: str) -> bytes | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= self._now():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> bytes | None:
+        return self._live(key)
+
+    async def set(self, key: str, value: Any, px: int | None = None) -> bool:
+        data = value if isinstance(value, bytes) else str(value).encode("utf-8")
+        self._data[key] = (data, self._now() + px / 1000.0 if px else None)
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._live(key) is not None:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    async def pexpire(self, key: str, milliseconds: int) -> bool:
+        value = self._live(key)
+        if value is None:
+            return False
+        self._data[key] = (value, self._now() + milliseconds / 1000.0)
+        return True
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        name = _SCRIPT_NAMES.get(script)
+        if name is None:
+            raise ValueError(f"InMemoryRedis cannot run script {script.strip().splitlines()[0]!r}")
+        keys = keys_and_args[:numkeys]
+        args = [str(arg).encode("utf-8") for arg in keys_and_args[numkeys:]]
+        if name == "take_over":
+            previous = self._live(keys[0])
+            await self.set(keys[0], args[0], px=int(args[1]))
+            return previous
+        if self._live(keys[0]) != args[0]:
+            return 0
+        if name == "refresh_if_owner":
+            return int(await self.pexpire(keys[0], int(args[1])))
+        # delete_if_owner
+        return await self.delete(keys[0])
+
+
+def _decode(value: Any) -> str | None:
+    if value is None:
+        return None
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+class SessionRegistry:
+    """
+    One live session per user across all workers.
+
+    - `acquire_lease` grants the user's balance to exactly one session. A
+      new socket takes the lease over, so a reconnect after a half-open drop
+      is not locked out; the old owner's next refresh fails and it ends.
+    - The owner refreshes the lease with its elapsed-ms checkpoint; if the
+      worker dies the lease expires and the next connection finds the
+      unsettled session through `last:{user}` and can charge it.
+    - Ban status published by one worker is visible to all of them.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        prefix: str = "cricknova:live",
+        lease_ttl_ms: int = 15_000,
+        worker_id: str = WORKER_ID,
+        node_id: str = NODE_ID,
+        backend: str = "memory",
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.lease_ttl_ms = int(lease_ttl_ms)
+        self.worker_id = worker_id
+        self.node_id = node_id
+        self.backend = backend
+        self._held: set[str] = set()
+        self._counters = {
+            "leases_granted": 0,
+            "leases_taken_over": 0,
+            "leases_lost": 0,
+            "orphans_found": 0,
+            "bans_published": 0,
+        }
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def route(self) -> dict[str, str]:
+        return {"worker": self.worker_id, "node": self.node_id}
+
+    async def _get_json(self, key: str) -> dict[str, Any] | None:
+        raw = _decode(await self.client.get(key))
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    async def acquire_lease(self, user_id: str, session_id: str) -> dict[str, Any]:
+        """
+        Returns {"replaced": session id the lease was taken from or None,
+        "orphans": [...]}. A replaced session is still running somewhere and
+        charges itself when it ends, so it is never reported as an orphan.
+        """
+        replaced = _decode(
+            await self.client.eval(_TAKE_OVER, 1, self._key("lease", user_id), session_id, self.lease_ttl_ms)
+        )
+        if replaced:
+            self._counters["leases_taken_over"] += 1
+
+        orphans = []
+        previous = _decode(await self.client.get(self._key("last", user_id)))
+        if previous and previous not in (session_id, replaced):
+            meta = await self._get_json(self._key("session", previous))
+            if meta and not meta.get("settled"):
+                orphans.append({"session_id": previous, **meta})
+                self._counters["orphans_found"] += 1
+
+        await self.client.set(self._key("last", user_id), session_id, px=SESSION_META_TTL_MS)
+        await self._write_session(session_id, user_id, elapsed_ms=0)
+        self._held.add(session_id)
+        self._counters["leases_granted"] += 1
+        return {"replaced": replaced, "orphans": orphans}
+
+    async def _write_session(self, session_id: str, user_id: str, *, elapsed_ms: int, settled: bool = False) -> None:
+        meta = {
+            "user_id": user_id,
+            **self.route(),
+            "elapsed_ms": int(elapsed_ms),
+            "settled": settled,
+            "updated_at": time.time(),
+        }
+        await self.client.set(self._key("session", session_id), json.dumps(meta), px=SESSION_META_TTL_MS)
+
+    async def refresh_lease(self, user_id: str, session_id: str, elapsed_ms: int) -> bool:
+        """Extend the lease and checkpoint elapsed time. False means the lease was lost."""
+        refreshed = await self.client.eval(
+            _REFRESH_IF_OWNER,
+            1,
+            self._key("lease", user_id),
+            session_id,
+            self.lease_ttl_ms,
+        )
+        if not refreshed:
+            self._held.discard(session_id)
+            self._counters["leases_lost"] += 1
+            return False
+        await self._write_session(session_id, user_id, elapsed_ms=elapsed_ms)
+        return True
+
+    async def settle(self, user_id: str, session_id: str, elapsed_ms: int) -> None:
+        """Mark a session's elapsed time as charged so it is never picked up as an orphan."""
+        await self._write_session(session_id, user_id, elapsed_ms=elapsed_ms, settled=True)
+
+    async def release_lease(self, user_id: str, session_id: str) -> None:
+        self._held.discard(session_id)
+        await self.client.eval(_DELETE_IF_OWNER, 1, self._key("lease", user_id), session_id)
+
+    async def publish_ban(self, user_id: str, status: dict[str, Any], ttl_ms: int) -> None:
+        await self.client.set(self._key("ban", user_id), json.dumps(status), px=max(1, int(ttl_ms)))
+        self._counters["bans_published"] += 1
+
+    async def ban_status(self, user_id: str) -> dict[str, Any] | None:
+        return await self._get_json(self._key("ban", user_id))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.backend,
+            "lease_ttl_ms": self.lease_ttl_ms,
+            "held": len(self._held),
+            **self._counters,
+        }
+
+
+def create_session_registry(url: str | None = None, **kwargs: Any) -> SessionRegistry:
+    """Redis-backed registry when `url` is set and redis is installed, else in-process."""
+    if url:
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            redis_asyncio = None
+        if redis_asyncio is not None:
+            return SessionRegistry(redis_asyncio.from_url(url), backend="redis", **kwargs)
+    return SessionRegistry(InMemoryRedis(), backend="memory", **kwargs)
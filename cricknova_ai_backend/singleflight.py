@@ -0,0 +1,77 @@
+import hashlib
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+def content_key(*parts: Any) -> str:
+    """
+    Stable hash over raw payload bytes and prompt text.
+    Lists/tuples are hashed element by element so frame batches key correctly.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            data = memoryview(part).cast("B")
+        elif isinstance(part, (list, tuple)):
+            data = content_key(*part).encode("ascii")
+        else:
+            data = str(part).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs the
+    function, every caller arriving while it is in flight waits on the same
+    future and receives the same result (or exception).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        self._counters = {"leaders": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self._counters["leaders"] += 1
+            else:
+                self._counters["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            with self._lock:
+                self._calls.pop(key, None)
+                self._counters["errors"] += 1
+            future.set_exception(exc)
+            raise
+        # Drop the key before publishing so callers arriving afterwards start a
+        # fresh request instead of reusing a finished one.
+        with self._lock:
+            self._calls.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            in_flight = len(self._calls)
+        total = counters["leaders"] + counters["coalesced"]
+        return {
+            **counters,
+            "in_flight": in_flight,
+            "coalesced_ratio": round(counters["coalesced"] / total, 4) if total else 0.0,
+        }
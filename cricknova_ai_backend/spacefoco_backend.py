@@ -2,24 +2,39 @@ import os
 import sys
 import asyncio
 import base64
+import itertools
 import json
+import logging
 import math
 import re
 import time
 import tempfile
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import threading
+import uuid
+from functools import partial
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FutureTimeoutError,
+    wait as wait_futures,
+)
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
-from typing import Any
-print("💤😡💀")
+from typing import Any, Literal
 # Ensure the repo root (the directory containing this file) is on sys.path.
 # Using the parent-of-parent can point outside the deployed repo on Render.
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
+from app_logging import get_logger, logging_stats
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 
+log = get_logger("spacefoco")
+log.info("BACKEND_MODULE_LOADED", file="spacefoco_backend.py")
+
 app = FastAPI(title="CrickNova AI Backend")
 
 STRICT_POLICY_NOTICE = (
@@ -58,6 +73,32 @@ def alive():
         "has_google_credentials": bool(os.getenv("GOOGLE_APPLICATION_CREDENTIALS")),
     }
 
+
+@app.get("/__stats")
+def stats():
+    return {
+        "hedge": _hedge_stats_snapshot(),
+        "analysis_modes": _analysis_mode_stats_snapshot(),
+        "frame_budget": _frame_budget_stats_snapshot(),
+        "logging": logging_stats(),
+        "billing": _billing_stats_snapshot(),
+        "billing_ledger": _billing_ledger.stats(),
+        "ban_cache": _ban_cache.stats(),
+        "policy_flags": _policy_stats_snapshot(),
+        "session_timers": _session_timers.stats(),
+        "event_loop": _loop_lag_stats_snapshot(),
+        "session_registry": _session_registry.stats(),
+        "live_sessions": {
+            key: {name: part.stats() for name, part in parts.items()}
+            for key, parts in list(_live_sessions.items())
+        },
+        "scheduler": _gemini_scheduler.stats(),
+        "singleflight": {
+            "vision": _vision_flight.stats(),
+            "text": text_singleflight_stats(),
+        },
+    }
+
 @app.get("/__test_gemini")
 async def test_gemini():
     try:
@@ -65,7 +106,7 @@ async def test_gemini():
         if not api_key:
             return {"success": False, "error": "No API key configured in environment variables (GOOGLE_API_KEY and GEMINI_API_KEY are empty)"}
         
-        client = Client(api_key=api_key)
+        client = _gemini_client(api_key)
         # Try a simple text prompt first to check key and client
         model_name = _resolve_vision_model_name()
         resp = client.models.generate_content(
@@ -89,17 +130,34 @@ async def test_gemini():
 from fastapi import UploadFile, File, HTTPException, Request, Form
 from cricknova_engine.processing.routes.payment_verify import router as subscription_router
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 import tempfile
 import math
 import numpy as np
 import cv2
-from gemini_text import generate_text
+from gemini_text import generate_text, stream_text, text_singleflight_stats
+from singleflight import SingleFlight, content_key
+from gemini_scheduler import GeminiScheduler
+from ban_cache import BanStatusCache
+from billing_ledger import BillingLedger, Checkpoint
+from live_pacer import LivePacer
+from outbound_queue import OutboundQueue
+from session_registry import SESSION_META_TTL_MS, create_session_registry
+from timer_wheel import TimerWheel
+from live_protocol import (
+    KIND_CLIP,
+    KIND_IMAGE,
+    SUPPORTED_VERSIONS as LIVE_MEDIA_PROTOCOLS,
+    ProtocolError,
+    negotiate_version,
+    parse_media_message,
+)
 from google.cloud import firestore
 from google.genai import Client
 from google.genai import types
 from cricknova_engine.processing.firestore_db import get_firestore_client
  
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError, field_validator
 from fastapi import Body
 from dotenv import load_dotenv
 load_dotenv()
@@ -128,6 +186,13 @@ def razorpay_ready():
 
 
 from cricknova_engine.processing.ball_tracker_motion import track_ball_positions
+from cricknova_engine.processing.frame_budget import fit_frames_to_budget
+from cricknova_engine.processing.motion_trigger import MotionTrigger
+from cricknova_engine.processing.keyframes import (
+    evenly_spaced_indexes,
+    motion_energy_profile,
+    select_motion_keyframes,
+)
 import time
 
 # Subscription management (external store)
@@ -260,6 +325,115 @@ def _vision_model_candidates() -> list[str]:
     return candidates
 
 
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in ("true", "1", "yes")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except (TypeError, ValueError):
+        return default
+
+
+# Hedged vision requests: if the model in flight has not answered within its
+# recent p90 latency, the same request is fired at the next candidate and the
+# first usable reply wins. LIVE_HEDGE_MAX_RATIO caps hedges as a fraction of
+# all hedged requests so a slow upstream cannot double our spend.
+LIVE_HEDGE_ENABLED = _env_flag("LIVE_HEDGE_ENABLED", True)
+LIVE_HEDGE_MAX_RATIO = _env_float("LIVE_HEDGE_MAX_RATIO", 0.15)
+LIVE_HEDGE_DEFAULT_DELAY_S = _env_float("LIVE_HEDGE_DEFAULT_DELAY_S", 6.0)
+_HEDGE_MIN_DELAY_S = 1.0
+_HEDGE_MAX_DELAY_S = 20.0
+_HEDGE_LATENCY_WINDOW = 64
+_HEDGE_MIN_SAMPLES = 8
+
+# Every Gemini call goes through one scheduler per worker: live > upload
+# analysis > chat > diff, round-robin across users within a class.
+GEMINI_MAX_CONCURRENCY = int(_env_float("GEMINI_MAX_CONCURRENCY", 8))
+
+# Coaching replies are structured JSON that carry their own policy label, so by
+# default the cricket-only check rides on the coaching generation.
+# LIVE_TWO_CALL_MODE=true restores the separate classifier pre-check.
+LIVE_TWO_CALL_MODE = _env_flag("LIVE_TWO_CALL_MODE", False)
+
+# Live billing frames go out when the displayed whole-second balance has
+# dropped by this many seconds (plus client resyncs and exhaustion).
+LIVE_BILLING_CADENCE_S = max(1, int(_env_float("LIVE_BILLING_CADENCE_S", 1)))
+# Resolution of the shared session timer wheel; billing and exhaustion
+# deadlines fire at most one tick late.
+LIVE_TIMER_TICK_S = _env_float("LIVE_TIMER_TICK_S", 0.05)
+
+# Live analysis pacing: the gap between analyses follows the session's model
+# latency EWMA within these bounds; mailbox frames older than the stale
+# threshold are skipped instead of analysed.
+LIVE_PACER_MIN_GAP_S = _env_float("LIVE_PACER_MIN_GAP_S", 0.2)
+LIVE_PACER_MAX_GAP_S = _env_float("LIVE_PACER_MAX_GAP_S", 3.0)
+LIVE_PACER_STALE_AFTER_S = _env_float("LIVE_PACER_STALE_AFTER_S", 6.0)
+
+# Everything the live socket sends goes through a bounded per-socket queue so
+# a slow client link cannot stall analysis or billing; stale coaching text is
+# dropped first, termination/billing never.
+LIVE_OUTBOUND_MAX_ITEMS = int(_env_float("LIVE_OUTBOUND_MAX_ITEMS", 32))
+LIVE_OUTBOUND_TRANSCRIPT_MAX_AGE_S = _env_float("LIVE_OUTBOUND_TRANSCRIPT_MAX_AGE_S", 10.0)
+LIVE_OUTBOUND_DRAIN_S = _env_float("LIVE_OUTBOUND_DRAIN_S", 2.0)
+
+# Live media only reaches Gemini when local frame differencing sees a
+# delivery/shot-like motion burst, or when LIVE_MOTION_KEEPALIVE_S has passed
+# since the last analysis.
+LIVE_MOTION_TRIGGER_ENABLED = _env_flag("LIVE_MOTION_TRIGGER_ENABLED", True)
+LIVE_MOTION_KEEPALIVE_S = _env_float("LIVE_MOTION_KEEPALIVE_S", 15.0)
+
+# Shared live-session registry. With LIVE_REGISTRY_URL/REDIS_URL (and the
+# redis package) leases, routes and bans are shared by every worker and node;
+# without it the registry is in-process, which is only correct for a single
+# worker.
+LIVE_REGISTRY_URL = os.getenv("LIVE_REGISTRY_URL") or os.getenv("REDIS_URL")
+LIVE_LEASE_TTL_S = _env_float("LIVE_LEASE_TTL_S", 15.0)
+
+GEMINI_BASE_URL = (os.getenv("GEMINI_BASE_URL") or "").strip() or None
+
+# Off by default (0). When set, e.g. by the load-test harness, a probe task
+# started with the first live socket sleeps this long and records how late
+# it wakes; /__stats reports the spread as the worker's event-loop lag.
+LOOP_LAG_PROBE_S = _env_float("LOOP_LAG_PROBE_S", 0.0)
+
+# Elapsed live time of every open session on this worker is debited in one
+# batched Firestore write per interval (0 disables), so a crash loses at most
+# one interval and the close-time transaction only charges the remainder.
+LIVE_BILLING_CHECKPOINT_S = _env_float("LIVE_BILLING_CHECKPOINT_S", 30.0)
+
+# Charged session ids are kept on the user doc (live_settled) so a repeated
+# charge for the same session is a no-op; entries outlive the registry's
+# record of the session, after which it can no longer be charged again.
+LIVE_SETTLED_RETENTION_MS = 2 * SESSION_META_TTL_MS
+
+# A checkpoint entry not rewritten for this long belongs to a session that
+# never closed (worker crash with no registry to report it); the next write
+# to the user doc drops it and marks that session settled.
+LIVE_CHECKPOINT_STALE_MS = int(max(300.0, 4 * LIVE_BILLING_CHECKPOINT_S) * 1000)
+
+# Ban checks on socket open, analyze-chunk and /coach/* read the user's ban
+# fields through a per-worker cache. "Not banned" is cached briefly; bans
+# recorded in this process invalidate the entry immediately.
+BAN_CACHE_TTL_S = _env_float("BAN_CACHE_TTL_S", 300.0)
+BAN_CACHE_NEGATIVE_TTL_S = _env_float("BAN_CACHE_NEGATIVE_TTL_S", 15.0)
+
+# Raw Gemini responses and per-frame receive events are sampled so logging cost
+# stays flat at high frame rates; LOG_SAMPLE_RATES can still override per event.
+GEMINI_DEBUG_SAMPLE_RATE = _env_float("GEMINI_DEBUG_SAMPLE_RATE", 0.02)
+LIVE_FRAME_LOG_SAMPLE_RATE = _env_float("LIVE_FRAME_LOG_SAMPLE_RATE", 0.05)
+
+# Frames sent to Gemini as inline images are re-encoded down a resolution /
+# JPEG-quality ladder until the whole request fits these budgets. The token
+# budget defaults to eight single-tile (258 token) images.
+LIVE_FRAME_BUDGET_ENABLED = _env_flag("LIVE_FRAME_BUDGET_ENABLED", True)
+LIVE_FRAME_BYTE_BUDGET = int(_env_float("LIVE_FRAME_BYTE_BUDGET", 480_000))
+LIVE_FRAME_TOKEN_BUDGET = int(_env_float("LIVE_FRAME_TOKEN_BUDGET", 2064))
+
 LIVE_MODEL_NAME = _resolve_live_model_name()
 LIVE_SYSTEM_INSTRUCTION = """Context & Role:
 You are CrickNova Elite Coach, a real professional cricket coach standing beside the player during practice.
@@ -272,6 +446,72 @@ _live_firestore_client: firestore.Client | None = None
 _live_gemini_client: Client | None = None
 _live_vision_client: Client | None = None
 _vision_key_index = 0
+_vision_flight = SingleFlight("vision")
+_gemini_scheduler = GeminiScheduler(GEMINI_MAX_CONCURRENCY)
+_session_timers = TimerWheel(tick_s=LIVE_TIMER_TICK_S)
+_loop_lag_ms: deque[float] = deque(maxlen=600)
+_loop_lag_task: asyncio.Task | None = None
+# Per-session pacing/motion/outbound counters for /__stats, keyed by a
+# worker-local serial so the unauthenticated endpoint names no user.
+_live_sessions: dict[int, dict[str, Any]] = {}
+_live_session_serial = itertools.count(1)
+_session_registry = create_session_registry(
+    LIVE_REGISTRY_URL,
+    lease_ttl_ms=int(LIVE_LEASE_TTL_S * 1000),
+)
+if LIVE_REGISTRY_URL and _session_registry.backend != "redis":
+    log.warning("LIVE_REGISTRY_FALLBACK_IN_PROCESS", reason="redis package not installed")
+_background_tasks: set[asyncio.Task] = set()
+_ban_cache = BanStatusCache(
+    lambda user_id: _load_ban_fields(user_id),
+    is_negative=lambda fields: not any(fields.get(key) for key in _BAN_FIELDS),
+    ttl_s=BAN_CACHE_TTL_S,
+    negative_ttl_s=BAN_CACHE_NEGATIVE_TTL_S,
+)
+# Policy violations are recorded off the request path by one queue worker.
+_policy_queue: asyncio.Queue = asyncio.Queue()
+_policy_worker_task: asyncio.Task | None = None
+_policy_pending: dict[str, int] = {}
+_policy_counters: dict[str, int] = {"queued": 0, "recorded": 0, "failed": 0, "mispredicted": 0}
+_billing_ledger = BillingLedger(
+    lambda checkpoints: _commit_live_checkpoints(checkpoints),
+    interval_s=LIVE_BILLING_CHECKPOINT_S,
+)
+_hedge_lock = threading.Lock()
+_hedge_latencies: dict[str, deque[float]] = {}
+_analysis_mode_lock = threading.Lock()
+_analysis_mode_counters: dict[str, dict[str, int]] = {
+    mode: {
+        "clips": 0,
+        "model_calls": 0,
+        "latency_ms_total": 0,
+        "policy_violations": 0,
+        "schema_failures": 0,
+        "schema_retry_recoveries": 0,
+    }
+    for mode in ("single_call", "two_call")
+}
+_frame_budget_lock = threading.Lock()
+_frame_budget_counters: dict[str, float] = {
+    "requests": 0,
+    "frames": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "bytes_saved": 0,
+    "tokens_estimate": 0,
+    "encode_ms_total": 0.0,
+    "request_ms_total": 0.0,
+}
+# Only touched from the event loop.
+_billing_counters: dict[str, int] = {"frames_sent": 0, "wakeups": 0, "resyncs": 0}
+_hedge_counters: dict[str, int] = {
+    "requests": 0,
+    "hedges_fired": 0,
+    "hedge_wins": 0,
+    "primary_wins": 0,
+    "budget_denied": 0,
+    "no_reply": 0,
+}
 
 
 def _live_db() -> firestore.Client:
@@ -306,13 +546,18 @@ def _legacy_seconds(milliseconds: int) -> int:
 def _live_gemini() -> Client:
     global _live_gemini_client
     if _live_gemini_client is None:
-        _live_gemini_client = Client(
-            api_key=_current_gemini_api_key(),
-            http_options={"api_version": "v1alpha"},
-        )
+        _live_gemini_client = _gemini_client(_current_gemini_api_key(), api_version="v1alpha")
     return _live_gemini_client
 
 
+def _gemini_client(api_key: str, **http_options: Any) -> Client:
+    # GEMINI_BASE_URL points every model client at another endpoint, e.g. the
+    # fake model server used by cricknova_engine/scripts/load_test_live_nets.py.
+    if GEMINI_BASE_URL:
+        http_options["base_url"] = GEMINI_BASE_URL
+    return Client(api_key=api_key, http_options=http_options or None)
+
+
 def _gemini_api_keys() -> list[str]:
     keys: list[str] = []
     for env_name in ("GEMINI_API_KEYS", "GOOGLE_API_KEYS"):
@@ -348,7 +593,7 @@ def _current_gemini_api_key() -> str:
 def _vision_gemini() -> Client:
     global _live_vision_client
     if _live_vision_client is None:
-        _live_vision_client = Client(api_key=_current_gemini_api_key())
+        _live_vision_client = _gemini_client(_current_gemini_api_key())
     return _live_vision_client
 
 
@@ -358,8 +603,8 @@ def _rotate_vision_key() -> None:
     if not keys:
         return
     _vision_key_index = (_vision_key_index + 1) % len(keys)
-    _live_vision_client = Client(api_key=keys[_vision_key_index])
-    print(f"GEMINI_KEY_ROTATED active_index={_vision_key_index + 1}/{len(keys)}")
+    _live_vision_client = _gemini_client(keys[_vision_key_index])
+    log.info("GEMINI_KEY_ROTATED", active_index=_vision_key_index + 1, keys=len(keys))
 
 
 def _generate_vision_content_with_key_rotation(
@@ -375,7 +620,7 @@ def _generate_vision_content_with_key_rotation(
     last_quota_error: Exception | None = None
     for offset in range(len(keys)):
         key_index = (_vision_key_index + offset) % len(keys)
-        client = Client(api_key=keys[key_index])
+        client = _gemini_client(keys[key_index])
         try:
             response = client.models.generate_content(
                 model=model,
@@ -385,14 +630,17 @@ def _generate_vision_content_with_key_rotation(
             _vision_key_index = key_index
             _live_vision_client = client
             if offset > 0:
-                print(f"GEMINI_KEY_RECOVERED active_index={key_index + 1}/{len(keys)}")
+                log.info("GEMINI_KEY_RECOVERED", active_index=key_index + 1, keys=len(keys))
             return response
         except Exception as exc:
             if _is_gemini_quota_error(exc):
                 last_quota_error = exc
-                print(
-                    f"GEMINI_KEY_QUOTA_EXHAUSTED index={key_index + 1}/{len(keys)} "
-                    f"model={model}: {exc}"
+                log.warning(
+                    "GEMINI_KEY_QUOTA_EXHAUSTED",
+                    index=key_index + 1,
+                    keys=len(keys),
+                    model=model,
+                    error=str(exc),
                 )
                 continue
             raise
@@ -430,26 +678,6 @@ def _normalize_live_language(language: str) -> str:
     return "English"
 
 
-def _clean_live_reply(raw_text: str) -> tuple[str, str]:
-    text = " ".join((raw_text or "").replace("\n", " ").split()).strip()
-    mood = ""
-    tag_match = re.match(
-        r"^\s*[\[\(\{]?\s*(praise|correction)\s*[\]\)\}]?\s*[:\-–—,]*\s*",
-        text,
-        flags=re.IGNORECASE,
-    )
-    if tag_match:
-        mood = tag_match.group(1).lower()
-        text = text[tag_match.end():].strip()
-    text = re.sub(
-        r"^\s*[\[\]\(\)\{\,\s]*(praise|correction)?[\]\(\)\{\,\s:;\-–—]*",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    ).strip()
-    return text, mood
-
-
 def _extract_gemini_text(response: Any) -> str:
     text = (getattr(response, "text", None) or "").strip()
     if text:
@@ -457,7 +685,7 @@ def _extract_gemini_text(response: Any) -> str:
     candidates = getattr(response, "candidates", None) or []
     for index, candidate in enumerate(candidates):
         finish_reason = getattr(candidate, "finish_reason", None)
-        print(f"⚠️ Gemini candidate {index} finish_reason={finish_reason}")
+        log.debug("GEMINI_CANDIDATE_FINISH_REASON", index=index, finish_reason=str(finish_reason))
         content = getattr(candidate, "content", None)
         if not content:
             continue
@@ -486,29 +714,35 @@ def _is_usable_gemini_reply(text: str) -> bool:
     return True
 
 
-def _extract_usable_gemini_text(response: Any) -> str:
-    text = _extract_gemini_text(response)
-    if text.strip().upper().replace(" ", "_") in {
-        "NO_CRICKET_ACTION",
-        "STRICT_POLICY_VIOLATION",
-    }:
-        return "STRICT_POLICY_VIOLATION"
-    if _is_usable_gemini_reply(text):
-        return text
-    if text:
-        print(f"GEMINI_FRAGMENT_RESPONSE text={text}")
-    return ""
-
-
 def _is_gemini_quota_error(exc: Exception) -> bool:
     text = str(exc)
     return "429" in text or "RESOURCE_EXHAUSTED" in text or "quota" in text.lower()
 
 
-def _edge_policy_ban_status(user_id: str) -> dict[str, Any] | None:
-    try:
-        snapshot = _live_db().collection("users").document(user_id).get()
+_BAN_FIELDS = (
+    "edge_policy_banned",
+    "edge_policy_banned_until",
+    "is_banned",
+    "banned_until",
+    "account_banned",
+    "account_banned_until",
+)
+# Cached with the ban fields so a new violation can be answered without a read.
+_BAN_CACHE_FIELDS = _BAN_FIELDS + ("edge_policy_violation_count",)
+
+
+async def _load_ban_fields(user_id: str) -> dict[str, Any]:
+    def read() -> dict[str, Any]:
+        snapshot = _live_doc(user_id).get()
         data = snapshot.to_dict() or {}
+        return {key: data.get(key) for key in _BAN_CACHE_FIELDS}
+
+    return await asyncio.to_thread(read)
+
+
+async def _edge_policy_ban_status(user_id: str) -> dict[str, Any] | None:
+    try:
+        data = await _ban_cache.get(user_id)
         banned_until = data.get("edge_policy_banned_until")
         if isinstance(banned_until, datetime):
             now = datetime.now(timezone.utc)
@@ -521,12 +755,12 @@ def _edge_policy_ban_status(user_id: str) -> dict[str, Any] | None:
                     "banned_until": banned_until.isoformat(),
                 }
     except Exception as exc:
-        print(f"EDGE_POLICY_BAN_CHECK_FAILED user={user_id}: {exc}")
+        log.error("EDGE_POLICY_BAN_CHECK_FAILED", user=user_id, error=str(exc))
     return None
 
 
-def _reject_if_edge_banned(user_id: str) -> dict[str, Any] | None:
-    ban_status = _edge_policy_ban_status(user_id)
+async def _reject_if_edge_banned(user_id: str) -> dict[str, Any] | None:
+    ban_status = await _edge_policy_ban_status(user_id)
     if ban_status is None:
         return None
     return {
@@ -539,10 +773,9 @@ def _reject_if_edge_banned(user_id: str) -> dict[str, Any] | None:
     }
 
 
-def _reject_if_any_ai_banned(user_id: str) -> dict[str, Any] | None:
+async def _reject_if_any_ai_banned(user_id: str) -> dict[str, Any] | None:
     try:
-        snapshot = _live_db().collection("users").document(user_id).get()
-        data = snapshot.to_dict() or {}
+        data = await _ban_cache.get(user_id)
         banned = (
             data.get("edge_policy_banned") == True
             or data.get("is_banned") == True
@@ -561,47 +794,56 @@ def _reject_if_any_ai_banned(user_id: str) -> dict[str, Any] | None:
                 "banned_until": until.isoformat() if until else None,
             }
     except Exception as exc:
-        print(f"AI_BAN_CHECK_FAILED user={user_id}: {exc}")
+        log.error("AI_BAN_CHECK_FAILED", user=user_id, error=str(exc))
     return None
 
 
-def _flag_policy_violation(
-    user_id: str,
-    reason: str,
-    clip_index: int | None = None,
-) -> dict[str, Any]:
-    print(
-        f"STRICT_POLICY_VIOLATION user={user_id} clip={clip_index} reason={reason}"
-    )
+def _policy_outcome(count: int) -> dict[str, Any]:
     result: dict[str, Any] = {
-        "count": 1,
+        "count": count,
         "text": STRICT_POLICY_NOTICE,
         "banned": False,
         "banned_until": None,
     }
-    try:
-        user_ref = _live_db().collection("users").document(user_id)
-        snapshot = user_ref.get()
-        data = snapshot.to_dict() or {}
-        current_count = int(data.get("edge_policy_violation_count") or 0)
-        next_count = current_count + 1
+    if 7 <= count < 10:
+        result["text"] = FINAL_POLICY_WARNING_NOTICE
+    elif count >= 10:
+        result["text"] = EDGE_POLICY_BAN_NOTICE
+        result["banned"] = True
+        result["banned_until"] = (datetime.now(timezone.utc) + timedelta(days=27)).isoformat()
+    return result
+
+
+def _record_policy_violation(
+    user_id: str,
+    reason: str,
+    clip_index: int | None,
+) -> tuple[int, datetime | None]:
+    # The flag document and the counter update commit together; the count
+    # read inside the transaction decides warning vs ban, so concurrent clips
+    # cannot both see the same count.
+    user_ref = _live_doc(user_id)
+    flag_ref = user_ref.collection("policy_flags").document()
+
+    @firestore.transactional
+    def txn_body(transaction: firestore.Transaction) -> tuple[int, datetime | None]:
+        snapshot = user_ref.get(transaction=transaction)
+        data = snapshot.to_dict() if snapshot.exists else {}
+        next_count = int(data.get("edge_policy_violation_count") or 0) + 1
+        banned_until = None
         update_data: dict[str, Any] = {
             "last_policy_flag": "non_cricket_edge_upload",
             "last_policy_flag_at": firestore.SERVER_TIMESTAMP,
-            "edge_policy_violation_count": next_count,
+            "edge_policy_violation_count": firestore.Increment(1),
         }
         if 7 <= next_count < 10:
             update_data["edge_policy_final_warning_count"] = next_count - 6
-            result["text"] = FINAL_POLICY_WARNING_NOTICE
         elif next_count >= 10:
             banned_until = datetime.now(timezone.utc) + timedelta(days=27)
             update_data["edge_policy_banned_until"] = banned_until
             update_data["edge_policy_ban_reason"] = "repeated_non_cricket_edge_uploads"
-            result["text"] = EDGE_POLICY_BAN_NOTICE
-            result["banned"] = True
-            result["banned_until"] = banned_until.isoformat()
-        result["count"] = next_count
-        user_ref.collection("policy_flags").add(
+        transaction.set(
+            flag_ref,
             {
                 "type": "non_cricket_edge_upload",
                 "reason": reason,
@@ -609,39 +851,176 @@ def _flag_policy_violation(
                 "violation_count": next_count,
                 "created_at": firestore.SERVER_TIMESTAMP,
                 "source": "cricknova_edge",
-            }
+            },
         )
-        user_ref.set(update_data, merge=True)
+        transaction.set(user_ref, update_data, merge=True)
+        return next_count, banned_until
+
+    return txn_body(_live_db().transaction())
+
+
+async def _policy_violation_worker() -> None:
+    while True:
+        user_id, reason, clip_index, predicted_count = await _policy_queue.get()
+        try:
+            count, banned_until = await asyncio.to_thread(
+                _record_policy_violation, user_id, reason, clip_index
+            )
+            _policy_counters["recorded"] += 1
+            if count != predicted_count:
+                _policy_counters["mispredicted"] += 1
+                log.info(
+                    "STRICT_POLICY_COUNT_RECONCILED",
+                    user=user_id,
+                    predicted=predicted_count,
+                    recorded=count,
+                )
+            if banned_until is not None:
+                _publish_shared_ban(user_id, banned_until)
+        except Exception as exc:
+            _policy_counters["failed"] += 1
+            log.error("STRICT_POLICY_FLAG_FAILED", user=user_id, error=str(exc))
+        finally:
+            _ban_cache.invalidate(user_id)
+            pending = _policy_pending.get(user_id, 1) - 1
+            if pending > 0:
+                _policy_pending[user_id] = pending
+            else:
+                _policy_pending.pop(user_id, None)
+            _policy_queue.task_done()
+
+
+async def _flag_policy_violation(
+    user_id: str,
+    reason: str,
+    clip_index: int | None = None,
+) -> dict[str, Any]:
+    # Answers straight away from the cached violation count plus this
+    # worker's not-yet-recorded flags; the Firestore write happens on the
+    # policy queue and its own count decides the ban that is stored.
+    global _policy_worker_task
+    log.warning("STRICT_POLICY_VIOLATION", user=user_id, clip=clip_index, reason=reason)
+    try:
+        known = int((await _ban_cache.get(user_id)).get("edge_policy_violation_count") or 0)
     except Exception as exc:
-        print(f"STRICT_POLICY_FLAG_FAILED user={user_id}: {exc}")
+        log.error("STRICT_POLICY_COUNT_LOOKUP_FAILED", user=user_id, error=str(exc))
+        known = 0
+    pending = _policy_pending.get(user_id, 0) + 1
+    _policy_pending[user_id] = pending
+    result = _policy_outcome(known + pending)
+
+    if _policy_worker_task is None or _policy_worker_task.done():
+        _policy_worker_task = asyncio.get_running_loop().create_task(_policy_violation_worker())
+    _policy_queue.put_nowait((user_id, reason, clip_index, result["count"]))
+    _policy_counters["queued"] += 1
     return result
 
 
-def _debug_gemini_response(label: str, response: Any, model_name: str) -> None:
-    print(f"===== {label} =====")
-    print(f"MODEL: {model_name}")
-    print("GEMINI RAW RESPONSE:")
+def _policy_stats_snapshot() -> dict[str, Any]:
+    return {
+        **_policy_counters,
+        "queue_depth": _policy_queue.qsize(),
+        "users_pending": len(_policy_pending),
+    }
+
+
+def _publish_shared_ban(user_id: str, banned_until: datetime) -> None:
+    # Other workers see the ban on their next socket open without waiting
+    # for their own Firestore read.
     try:
-        print(response)
-    except Exception as exc:
-        print(f"<raw response print failed: {exc}>")
-    print("TEXT:")
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    status = {
+        "status": "policy_banned",
+        "text": EDGE_POLICY_BAN_NOTICE,
+        "banned_until": banned_until.isoformat(),
+    }
+    ttl_ms = int((banned_until - datetime.now(timezone.utc)).total_seconds() * 1000)
+    task = loop.create_task(_session_registry.publish_ban(user_id, status, ttl_ms))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _debug_gemini_response(label: str, response: Any, model_name: str) -> None:
+    # Runs on every Gemini call: sampled, and the payload is only built for
+    # responses that are actually logged.
+    if not log.enabled(logging.DEBUG, "GEMINI_RAW_RESPONSE", GEMINI_DEBUG_SAMPLE_RATE):
+        return
     try:
-        print(getattr(response, "text", None))
+        text = getattr(response, "text", None)
     except Exception as exc:
-        print(f"<text read failed: {exc}>")
-    print("CANDIDATES:")
-    candidates = getattr(response, "candidates", None) or []
-    print(candidates)
-    for index, candidate in enumerate(candidates):
-        print(f"CANDIDATE[{index}]: {candidate}")
-        print(f"FINISH_REASON[{index}]: {getattr(candidate, 'finish_reason', None)}")
-        print(f"SAFETY_RATINGS[{index}]: {getattr(candidate, 'safety_ratings', None)}")
+        text = f"<text read failed: {exc}>"
+    candidates = []
+    for candidate in getattr(response, "candidates", None) or []:
         content = getattr(candidate, "content", None)
-        if content:
-            print(f"CONTENT[{index}]: {content}")
-            print(f"PARTS[{index}]: {getattr(content, 'parts', None)}")
-    print(f"===== END {label} =====")
+        candidates.append(
+            {
+                "finish_reason": str(getattr(candidate, "finish_reason", None)),
+                "safety_ratings": str(getattr(candidate, "safety_ratings", None)),
+                "parts": str(getattr(content, "parts", None)) if content else None,
+            }
+        )
+    log.emit(
+        logging.DEBUG,
+        "GEMINI_RAW_RESPONSE",
+        label=label,
+        model=model_name,
+        text=text,
+        candidates=candidates,
+    )
+
+
+class LiveCoachReply(BaseModel):
+    label: Literal["ACTIVE_CRICKET_ACTION", "STRICT_POLICY_VIOLATION"]
+    positive: str
+    mistake: str
+    correction: str
+    mood: Literal["praise", "correction"]
+
+    @field_validator("positive", "mistake", "correction")
+    @classmethod
+    def _normalize_sentence(cls, value: str) -> str:
+        return " ".join((value or "").split()).strip()
+
+    def coaching_errors(self) -> list[str]:
+        if self.label == "STRICT_POLICY_VIOLATION":
+            return []
+        # A praise reply may have nothing to fix; an empty mistake is fine then.
+        return [
+            f"{field} must be one complete coaching sentence"
+            for field in ("positive", "mistake", "correction")
+            if not (field == "mistake" and self.mood == "praise" and not self.mistake)
+            and not _is_usable_gemini_reply(getattr(self, field))
+        ]
+
+    def coaching_text(self) -> str:
+        return " ".join(
+            part for part in (self.positive, self.mistake, self.correction) if part
+        )
+
+
+def _live_analysis_mode() -> str:
+    return "two_call" if LIVE_TWO_CALL_MODE else "single_call"
+
+
+def _count_analysis(counter: str, amount: int = 1) -> None:
+    with _analysis_mode_lock:
+        _analysis_mode_counters[_live_analysis_mode()][counter] += amount
+
+
+def _analysis_mode_stats_snapshot() -> dict[str, Any]:
+    with _analysis_mode_lock:
+        counters = {mode: dict(values) for mode, values in _analysis_mode_counters.items()}
+    snapshot: dict[str, Any] = {"active": _live_analysis_mode()}
+    for mode, values in counters.items():
+        clips = values["clips"]
+        snapshot[mode] = {
+            **values,
+            "avg_latency_ms": round(values["latency_ms_total"] / clips, 1) if clips else 0.0,
+            "model_calls_per_clip": round(values["model_calls"] / clips, 3) if clips else 0.0,
+        }
+    return snapshot
 
 
 def _live_edge_prompt(coach_name: str, language: str, discipline: str) -> str:
@@ -664,7 +1043,7 @@ def _live_edge_prompt(coach_name: str, language: str, discipline: str) -> str:
         "Analyze this cricket training clip.\n\n"
         "Critical cricket-only policy check:\n"
         "- First check whether this is a cricket-related video.\n"
-        "- If it is not cricket-related, return exactly STRICT_POLICY_VIOLATION and nothing else.\n"
+        "- If it is not cricket-related, set label to STRICT_POLICY_VIOLATION and leave the other text fields empty.\n"
         "- If it is cricket-related, continue with coaching.\n\n"
         "Rules:\n"
         "- Only comment on visible actions.\n"
@@ -690,7 +1069,10 @@ def _live_edge_prompt(coach_name: str, language: str, discipline: str) -> str:
         "Sound like a real academy coach training a player one-to-one.\n\n"
         f"Training mode: {discipline}.\n"
         f"Reply language: {coach_language}.\n"
-        "Return natural coaching feedback as one flowing coach line."
+        "Return JSON only. Set label to ACTIVE_CRICKET_ACTION for cricket clips. "
+        "Write positive, mistake and correction as one complete spoken coaching sentence each. "
+        "Set mood to praise if the visible action is mostly good, otherwise correction; "
+        "with praise, leave mistake empty if there is nothing to fix."
     )
 
 
@@ -710,7 +1092,7 @@ def _is_frame_too_dark(frame_bytes: bytes) -> bool:
 
 
 def _video_has_visible_action(video_bytes: bytes) -> bool:
-    frames = _sample_video_frames(video_bytes, max_frames=3)
+    frames = _sample_video_frames(video_bytes, max_frames=3, motion_peak=False)
     if not frames:
         return False
     visible = 0
@@ -746,6 +1128,7 @@ def _classify_active_cricket_action(frames: list[bytes]) -> str:
     ])
 
     def request_label(model_name: str) -> str:
+        _count_analysis("model_calls")
         response = _generate_vision_content_with_key_rotation(
             model=model_name,
             contents=contents,
@@ -760,19 +1143,19 @@ def _classify_active_cricket_action(frames: list[bytes]) -> str:
         executor = ThreadPoolExecutor(max_workers=1)
         try:
             label = executor.submit(request_label, model_name).result(timeout=8)
-            print(f"CRICKET_ACTION_CLASSIFIER model={model_name} label={label}")
+            log.info("CRICKET_ACTION_CLASSIFIER", model=model_name, label=label)
             if label == "STRICT_POLICY_VIOLATION":
                 return "violation"
             if label == "ACTIVE_CRICKET_ACTION":
                 return "active"
         except FutureTimeoutError:
-            print(f"CRICKET_ACTION_CLASSIFIER_TIMEOUT model={model_name}")
+            log.warning("CRICKET_ACTION_CLASSIFIER_TIMEOUT", model=model_name)
             return "unknown"
         except Exception as exc:
             if _is_gemini_quota_error(exc):
-                print(f"GEMINI_QUOTA_EXHAUSTED classifier model={model_name}: {exc}")
+                log.warning("GEMINI_QUOTA_EXHAUSTED", kind="classifier", model=model_name, error=str(exc))
                 continue
-            print(f"CRICKET_ACTION_CLASSIFIER_FAILED model={model_name}: {exc}")
+            log.error("CRICKET_ACTION_CLASSIFIER_FAILED", model=model_name, error=str(exc))
         finally:
             executor.shutdown(wait=False, cancel_futures=True)
     return "unknown"
@@ -783,10 +1166,10 @@ def _classify_uploaded_cricket_video(video_path: str) -> str:
         with open(video_path, "rb") as video_file:
             video_bytes = video_file.read()
         if not _video_has_visible_action(video_bytes):
-            print("UPLOAD_VIDEO_SKIPPED_TOO_DARK_OR_BLANK")
+            log.info("UPLOAD_VIDEO_SKIPPED_TOO_DARK_OR_BLANK")
             return "violation"
     except Exception as exc:
-        print(f"UPLOAD_VIDEO_LOCAL_VISIBILITY_CHECK_FAILED: {exc}")
+        log.error("UPLOAD_VIDEO_LOCAL_VISIBILITY_CHECK_FAILED", error=str(exc))
         return "unknown"
 
     def request_video_label() -> str:
@@ -826,20 +1209,20 @@ def _classify_uploaded_cricket_video(video_path: str) -> str:
     executor = ThreadPoolExecutor(max_workers=1)
     try:
         label = executor.submit(request_video_label).result(timeout=10)
-        print(f"UPLOAD_CRICKET_VIDEO_CLASSIFIER label={label}")
+        log.info("UPLOAD_CRICKET_VIDEO_CLASSIFIER", label=label)
         if label == "STRICT_POLICY_VIOLATION":
             return "violation"
         if label == "ACTIVE_CRICKET_ACTION":
             return "active"
         return "unknown"
     except FutureTimeoutError:
-        print("UPLOAD_CRICKET_VIDEO_CLASSIFIER_TIMEOUT")
+        log.warning("UPLOAD_CRICKET_VIDEO_CLASSIFIER_TIMEOUT")
         return "unknown"
     except Exception as exc:
         if _is_gemini_quota_error(exc):
-            print(f"GEMINI_QUOTA_EXHAUSTED upload_video_classifier: {exc}")
+            log.warning("GEMINI_QUOTA_EXHAUSTED", kind="upload_video_classifier", error=str(exc))
         else:
-            print(f"UPLOAD_CRICKET_VIDEO_CLASSIFIER_FAILED: {exc}")
+            log.error("UPLOAD_CRICKET_VIDEO_CLASSIFIER_FAILED", error=str(exc))
         return "unknown"
     finally:
         executor.shutdown(wait=False, cancel_futures=True)
@@ -868,7 +1251,7 @@ def _upload_gemini_video_file(client: Client, video_path: str) -> Any:
             config=types.UploadFileConfig(mime_type="video/mp4"),
         )
     except Exception as first_exc:
-        print(f"⚠️ Gemini file upload with config failed, retrying plain upload: {first_exc}")
+        log.warning("GEMINI_UPLOAD_CONFIG_FAILED_RETRYING_PLAIN", error=str(first_exc))
         return client.files.upload(file=video_path)
 
 
@@ -877,21 +1260,29 @@ def _wait_for_gemini_file_active(
     uploaded_file: Any,
     *,
     max_attempts: int = 60,
+    cancel: threading.Event | None = None,
 ) -> Any:
     name = getattr(uploaded_file, "name", None)
     current = uploaded_file
     for attempt in range(max_attempts):
+        if cancel is not None and cancel.is_set():
+            raise RuntimeError("Gemini uploaded video wait cancelled")
         state_name = _file_state_name(current)
         uri = getattr(current, "uri", None)
-        print(
-            f"VIDEO_UPLOADED state={state_name or 'UNKNOWN'} "
-            f"attempt={attempt} uri={uri or 'NO_URI'}"
+        log.debug(
+            "VIDEO_UPLOAD_STATE",
+            state=state_name or "UNKNOWN",
+            attempt=attempt,
+            uri=uri or "NO_URI",
         )
         if state_name in ("ACTIVE", "FILE_STATE_ACTIVE"):
             return current
         if state_name in ("FAILED", "FILE_STATE_FAILED"):
             raise RuntimeError(f"Gemini uploaded file failed processing: {current}")
-        time.sleep(1)
+        if cancel is not None:
+            cancel.wait(1)
+        else:
+            time.sleep(1)
         if name:
             current = client.files.get(name=name)
         elif uri and attempt >= 2:
@@ -899,6 +1290,31 @@ def _wait_for_gemini_file_active(
     raise TimeoutError("Gemini uploaded video did not become ACTIVE in time")
 
 
+def _upload_active_video_file(
+    client: Client,
+    video_path: str,
+    cancel: threading.Event,
+) -> Any:
+    uploaded_file = _upload_gemini_video_file(client, video_path)
+    log.info("VIDEO_UPLOADED", file=getattr(uploaded_file, "name", None))
+    try:
+        return _wait_for_gemini_file_active(client, uploaded_file, cancel=cancel)
+    except Exception:
+        _delete_gemini_file(client, uploaded_file)
+        raise
+
+
+def _discard_upload_future(client: Client, upload_future: Future) -> None:
+    def discard(future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        if future.result() is not None:
+            _delete_gemini_file(client, future.result())
+
+    upload_future.cancel()
+    upload_future.add_done_callback(discard)
+
+
 def _file_part_for_gemini(uploaded_file: Any) -> Any:
     uri = getattr(uploaded_file, "uri", None)
     mime_type = getattr(uploaded_file, "mime_type", None) or "video/mp4"
@@ -913,9 +1329,9 @@ def _text_part_for_gemini(text: str) -> Any:
     return text
 
 
-def _content_from_parts(parts: list[Any]) -> list[Any]:
+def _content_from_parts(parts: list[Any], role: str = "user") -> list[Any]:
     try:
-        return [types.Content(role="user", parts=parts)]
+        return [types.Content(role=role, parts=parts)]
     except Exception:
         return parts
 
@@ -934,6 +1350,7 @@ def _sample_video_frames(
     *,
     max_width: int | None = None,
     jpeg_quality: int = 88,
+    motion_peak: bool = True,
 ) -> list[bytes]:
     path = None
     try:
@@ -943,16 +1360,20 @@ def _sample_video_frames(
 
         cap = cv2.VideoCapture(path)
         if not cap.isOpened():
-            print("⚠️ Could not open video clip for frame fallback")
+            log.warning("VIDEO_FRAME_SAMPLE_OPEN_FAILED")
             return []
 
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
-        if frame_count <= 0:
-            frame_count = max_frames
-        indexes = sorted({
-            min(frame_count - 1, max(0, round(i * (frame_count - 1) / max(1, max_frames - 1))))
-            for i in range(max_frames)
-        })
+        indexes: list[int] = []
+        if motion_peak:
+            # Most of an evenly spaced sample is run-up or empty pitch; spend
+            # the frame budget around the delivery/shot instead.
+            energy = motion_energy_profile(path)
+            indexes = select_motion_keyframes(energy, max_frames)
+        if not indexes:
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+            if frame_count <= 0:
+                frame_count = max_frames
+            indexes = evenly_spaced_indexes(frame_count, max_frames)
 
         sampled: list[bytes] = []
         for index in indexes:
@@ -975,10 +1396,10 @@ def _sample_video_frames(
             if ok:
                 sampled.append(encoded.tobytes())
         cap.release()
-        print(f"🎞️ Extracted {len(sampled)} frames from live video fallback")
+        log.debug("VIDEO_FRAMES_SAMPLED", frames=len(sampled), indexes=indexes)
         return sampled
     except Exception as exc:
-        print(f"❌ Video frame fallback failed: {exc}")
+        log.error("VIDEO_FRAME_SAMPLE_FAILED", error=str(exc))
         return []
     finally:
         if path:
@@ -986,188 +1407,418 @@ def _sample_video_frames(
                 os.remove(path)
 
 
+def _hedge_observe_latency(model_name: str, seconds: float) -> None:
+    with _hedge_lock:
+        window = _hedge_latencies.setdefault(
+            model_name,
+            deque(maxlen=_HEDGE_LATENCY_WINDOW),
+        )
+        window.append(seconds)
+
+
+def _hedge_delay_s(model_name: str) -> float:
+    with _hedge_lock:
+        samples = sorted(_hedge_latencies.get(model_name) or ())
+    if len(samples) < _HEDGE_MIN_SAMPLES:
+        return LIVE_HEDGE_DEFAULT_DELAY_S
+    p90 = samples[min(len(samples) - 1, int(math.ceil(0.9 * len(samples))) - 1)]
+    return min(_HEDGE_MAX_DELAY_S, max(_HEDGE_MIN_DELAY_S, p90))
+
+
+def _hedge_count(counter: str) -> None:
+    with _hedge_lock:
+        _hedge_counters[counter] += 1
+
+
+def _hedge_try_reserve() -> bool:
+    with _hedge_lock:
+        fired = _hedge_counters["hedges_fired"]
+        if fired + 1 > LIVE_HEDGE_MAX_RATIO * _hedge_counters["requests"]:
+            _hedge_counters["budget_denied"] += 1
+            return False
+        _hedge_counters["hedges_fired"] = fired + 1
+        return True
+
+
+def _hedge_stats_snapshot() -> dict[str, Any]:
+    with _hedge_lock:
+        counters = dict(_hedge_counters)
+        models = list(_hedge_latencies)
+    fired = counters["hedges_fired"]
+    return {
+        "enabled": LIVE_HEDGE_ENABLED,
+        "max_ratio": LIVE_HEDGE_MAX_RATIO,
+        **counters,
+        "hedge_win_rate": round(counters["hedge_wins"] / fired, 4) if fired else 0.0,
+        "delay_s": {model: round(_hedge_delay_s(model), 3) for model in models},
+    }
+
+
+def _parse_live_coach_reply(response: Any) -> tuple[LiveCoachReply | None, str]:
+    reply = getattr(response, "parsed", None)
+    if not isinstance(reply, LiveCoachReply):
+        raw = _extract_gemini_text(response)
+        if not raw:
+            return None, "the reply was empty"
+        try:
+            reply = LiveCoachReply.model_validate_json(raw)
+        except ValidationError as exc:
+            return None, "; ".join(
+                f"{'.'.join(str(loc) for loc in error['loc']) or 'reply'}: {error['msg']}"
+                for error in exc.errors()
+            )
+    errors = reply.coaching_errors()
+    if errors:
+        return None, "; ".join(errors)
+    return reply, ""
+
+
+def _schema_repair_prompt(error: str) -> str:
+    return (
+        f"Your previous reply failed validation: {error}.\n"
+        "Return the corrected JSON object only, following the same schema and rules."
+    )
+
+
+def _request_usable_reply(
+    model_name: str,
+    contents: Any,
+    *,
+    kind: str,
+    debug_label: str,
+    success_label: str,
+) -> tuple[str, str]:
+    config = types.GenerateContentConfig(
+        temperature=0.7,
+        max_output_tokens=300,
+        response_mime_type="application/json",
+        response_schema=LiveCoachReply,
+    )
+    request_contents = contents
+    # One targeted retry: the failed reply goes back as the model's turn and
+    # the repair instruction names the schema check it failed, so the model
+    # corrects its own answer instead of regenerating blind.
+    for attempt in range(2):
+        if attempt > 0:
+            log.info("GEMINI_SCHEMA_RETRY", kind=kind, model=model_name)
+        _count_analysis("model_calls")
+        try:
+            response = _generate_vision_content_with_key_rotation(
+                model=model_name,
+                contents=request_contents,
+                config=config,
+            )
+        except Exception as model_exc:
+            if _is_gemini_quota_error(model_exc):
+                log.warning("GEMINI_QUOTA_EXHAUSTED", kind=kind, model=model_name, error=str(model_exc))
+                return "", ""
+            raise
+        _debug_gemini_response(debug_label, response, model_name)
+        reply, error = _parse_live_coach_reply(response)
+        if reply is not None:
+            if attempt > 0:
+                _count_analysis("schema_retry_recoveries")
+            if reply.label == "STRICT_POLICY_VIOLATION":
+                log.info(success_label, model=model_name, label="STRICT_POLICY_VIOLATION")
+                return "STRICT_POLICY_VIOLATION", ""
+            text = reply.coaching_text()
+            log.info(success_label, model=model_name, mood=reply.mood, text=text)
+            return text, reply.mood
+        _count_analysis("schema_failures")
+        log.warning("GEMINI_SCHEMA_FAILURE", kind=kind, model=model_name, error=error)
+        failed_reply = _extract_gemini_text(response)
+        request_contents = [
+            *contents,
+            *(_content_from_parts([_text_part_for_gemini(failed_reply)], role="model") if failed_reply else []),
+            *_content_from_parts([_text_part_for_gemini(_schema_repair_prompt(error))]),
+        ]
+    log.warning("GEMINI_EMPTY_RESPONSE", kind=kind, model=model_name)
+    return "", ""
+
+
+def _generate_usable_reply(
+    contents: Any,
+    *,
+    kind: str,
+    debug_label: str,
+    success_label: str,
+) -> tuple[str, str]:
+    model_candidates = _vision_model_candidates()
+    labels = {"kind": kind, "debug_label": debug_label, "success_label": success_label}
+    if not LIVE_HEDGE_ENABLED or len(model_candidates) < 2:
+        for model_name in model_candidates:
+            reply = _request_usable_reply(model_name, contents, **labels)
+            if reply[0]:
+                return reply
+        return "", ""
+
+    _hedge_count("requests")
+    executor = ThreadPoolExecutor(max_workers=len(model_candidates))
+    in_flight: dict[Future, tuple[str, float, bool]] = {}
+    next_index = 0
+    hedging_allowed = True
+    last_error: Exception | None = None
+
+    def launch(hedge: bool) -> None:
+        nonlocal next_index
+        model_name = model_candidates[next_index]
+        next_index += 1
+        future = executor.submit(_request_usable_reply, model_name, contents, **labels)
+        in_flight[future] = (model_name, time.monotonic(), hedge)
+        if hedge:
+            log.info("GEMINI_HEDGE_FIRED", kind=kind, model=model_name)
+
+    try:
+        launch(False)
+        while in_flight:
+            timeout = None
+            if hedging_allowed and next_index < len(model_candidates):
+                newest_model, newest_start, _ = max(
+                    in_flight.values(),
+                    key=lambda item: item[1],
+                )
+                deadline = newest_start + _hedge_delay_s(newest_model)
+                timeout = max(0.0, deadline - time.monotonic())
+            done, _ = wait_futures(
+                list(in_flight),
+                timeout=timeout,
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                if _hedge_try_reserve():
+                    launch(True)
+                else:
+                    hedging_allowed = False
+                    log.info("GEMINI_HEDGE_BUDGET_DENIED", kind=kind)
+                continue
+            for future in done:
+                model_name, started_at, hedged = in_flight.pop(future)
+                try:
+                    reply = future.result()
+                except Exception as exc:
+                    last_error = exc
+                    log.warning("GEMINI_HEDGE_CANDIDATE_FAILED", kind=kind, model=model_name, error=str(exc))
+                    continue
+                _hedge_observe_latency(model_name, time.monotonic() - started_at)
+                if reply[0]:
+                    _hedge_count("hedge_wins" if hedged else "primary_wins")
+                    if in_flight:
+                        log.info(
+                            "GEMINI_HEDGE_LOSERS_CANCELLED",
+                            kind=kind,
+                            winner=model_name,
+                            losers=[item[0] for item in in_flight.values()],
+                        )
+                    return reply
+            if not in_flight and next_index < len(model_candidates):
+                launch(False)
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    _hedge_count("no_reply")
+    if last_error is not None:
+        raise last_error
+    return "", ""
+
+
+def _frame_budget_stats_snapshot() -> dict[str, Any]:
+    with _frame_budget_lock:
+        counters = dict(_frame_budget_counters)
+    requests = counters["requests"]
+    return {
+        "enabled": LIVE_FRAME_BUDGET_ENABLED,
+        "byte_budget": LIVE_FRAME_BYTE_BUDGET,
+        "token_budget": LIVE_FRAME_TOKEN_BUDGET,
+        **{key: int(value) for key, value in counters.items() if not key.endswith("_ms_total")},
+        "saved_ratio": round(counters["bytes_saved"] / counters["bytes_in"], 4) if counters["bytes_in"] else 0.0,
+        "avg_encode_ms": round(counters["encode_ms_total"] / requests, 2) if requests else 0.0,
+        "avg_request_ms": round(counters["request_ms_total"] / requests, 1) if requests else 0.0,
+    }
+
+
+def _generate_budgeted_frame_reply(
+    frames: list[bytes | memoryview],
+    prompt: str,
+    *,
+    debug_label: str,
+    success_label: str,
+) -> tuple[str, str]:
+    if LIVE_FRAME_BUDGET_ENABLED:
+        frames, report = fit_frames_to_budget(
+            [bytes(frame) for frame in frames],
+            LIVE_FRAME_BYTE_BUDGET,
+            LIVE_FRAME_TOKEN_BUDGET,
+        )
+    else:
+        frames = [bytes(frame) for frame in frames]
+        size = sum(len(frame) for frame in frames)
+        report = {"frames": len(frames), "bytes_in": size, "bytes_out": size,
+                  "bytes_saved": 0, "tokens_estimate": 0, "encode_ms": 0.0}
+    frame_parts = [
+        types.Part.from_bytes(data=frame, mime_type="image/jpeg")
+        for frame in frames
+    ]
+    frame_contents = _content_from_parts([
+        _text_part_for_gemini(prompt),
+        *frame_parts,
+    ])
+    started_at = time.perf_counter()
+    reply = _generate_usable_reply(
+        frame_contents,
+        kind="frames",
+        debug_label=debug_label,
+        success_label=success_label,
+    )
+    request_ms = (time.perf_counter() - started_at) * 1000.0
+    log.info("FRAME_BUDGET", sample=0.1, **report, request_ms=round(request_ms, 1))
+    with _frame_budget_lock:
+        _frame_budget_counters["requests"] += 1
+        for key in ("frames", "bytes_in", "bytes_out", "bytes_saved", "tokens_estimate"):
+            _frame_budget_counters[key] += report[key]
+        _frame_budget_counters["encode_ms_total"] += report["encode_ms"]
+        _frame_budget_counters["request_ms_total"] += request_ms
+    return reply
+
+
 async def _analyze_live_frame(
-    frame_bytes: bytes | list[bytes],
+    frame_bytes: bytes | memoryview | list[bytes | memoryview],
     *,
     coach_name: str = "Player",
     language: str = "English",
     discipline: str = "Batting",
     is_video: bool = False,
 ) -> tuple[str, str]:
-    def run() -> str:
-        prompt = _live_edge_prompt(coach_name, language, discipline)
+    prompt = _live_edge_prompt(coach_name, language, discipline)
+
+    def run() -> tuple[str, str]:
         model_candidates = _vision_model_candidates()
-        print(f"VIDEO_ANALYSIS_STARTED models={model_candidates} is_video={is_video}")
+        log.info(
+            "VIDEO_ANALYSIS_STARTED",
+            models=model_candidates,
+            is_video=is_video,
+            mode=_live_analysis_mode(),
+        )
         try:
             client = _vision_gemini()
 
-            if is_video and isinstance(frame_bytes, (bytes, bytearray)):
+            if is_video and isinstance(frame_bytes, (bytes, bytearray, memoryview)):
                 video_path = None
                 uploaded_file = None
+                # In two-call mode the upload runs while the classifier decides,
+                # so a legitimate clip no longer waits for both round trips.
+                upload_cancel = threading.Event()
+                upload_executor = ThreadPoolExecutor(max_workers=1)
+                upload_future: Future | None = None
                 try:
                     if not _video_has_visible_action(bytes(frame_bytes)):
-                        print("VIDEO_SKIPPED_TOO_DARK_OR_BLANK")
-                        return "STRICT_POLICY_VIOLATION"
-                    action_frames = _sample_video_frames(bytes(frame_bytes), max_frames=6)
-                    action_label = _classify_active_cricket_action(action_frames)
-                    if action_label == "violation":
-                        print("VIDEO_SKIPPED_NON_CRICKET_ACTION")
-                        return "STRICT_POLICY_VIOLATION"
+                        log.info("VIDEO_SKIPPED_TOO_DARK_OR_BLANK")
+                        return "STRICT_POLICY_VIOLATION", ""
                     with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as tmp:
                         tmp.write(bytes(frame_bytes))
                         video_path = tmp.name
-                    print(f"VIDEO_RECEIVED bytes={len(frame_bytes)} path={video_path}")
-                    uploaded_file = _upload_gemini_video_file(client, video_path)
-                    print(f"VIDEO_UPLOADED file={uploaded_file}")
-                    uploaded_file = _wait_for_gemini_file_active(client, uploaded_file)
+                    log.debug("VIDEO_RECEIVED", bytes=len(frame_bytes), path=video_path)
+                    upload_future = upload_executor.submit(
+                        _upload_active_video_file,
+                        client,
+                        video_path,
+                        upload_cancel,
+                    )
+                    if LIVE_TWO_CALL_MODE:
+                        action_frames = _sample_video_frames(bytes(frame_bytes), max_frames=4)
+                        action_label = _classify_active_cricket_action(action_frames)
+                        if action_label == "violation":
+                            log.info("VIDEO_SKIPPED_NON_CRICKET_ACTION", upload_cancelled=True)
+                            upload_cancel.set()
+                            _discard_upload_future(client, upload_future)
+                            upload_future = None
+                            return "STRICT_POLICY_VIOLATION", ""
+                    uploaded_file = upload_future.result()
+                    upload_future = None
                     file_part = _file_part_for_gemini(uploaded_file)
                     video_contents = _content_from_parts([
                         file_part,
                         _text_part_for_gemini(prompt),
                     ])
 
-                    for model_name in model_candidates:
-                        for attempt in range(2):
-                            if attempt > 0:
-                                print(f"GEMINI_RETRY video model={model_name}")
-                            try:
-                                response = _generate_vision_content_with_key_rotation(
-                                    model=model_name,
-                                    contents=video_contents,
-                                    config=types.GenerateContentConfig(
-                                        temperature=0.7,
-                                        max_output_tokens=300,
-                                    ),
-                                )
-                            except Exception as model_exc:
-                                if _is_gemini_quota_error(model_exc):
-                                    print(
-                                        f"GEMINI_QUOTA_EXHAUSTED video model={model_name}: "
-                                        f"{model_exc}"
-                                    )
-                                    break
-                                raise
-                            _debug_gemini_response(
-                                "VIDEO_ANALYSIS_RESPONSE",
-                                response,
-                                model_name,
-                            )
-                            text = _extract_usable_gemini_text(response)
-                            if text:
-                                print(f"VIDEO_ANALYSIS_SUCCESS model={model_name} text={text}")
-                                return text
-                        print(f"GEMINI_EMPTY_RESPONSE video model={model_name}")
+                    reply = _generate_usable_reply(
+                        video_contents,
+                        kind="video",
+                        debug_label="VIDEO_ANALYSIS_RESPONSE",
+                        success_label="VIDEO_ANALYSIS_SUCCESS",
+                    )
+                    if reply[0]:
+                        return reply
                 except Exception as video_exc:
                     if _is_gemini_quota_error(video_exc):
-                        print(f"GEMINI_QUOTA_EXHAUSTED video: {video_exc}")
-                    print(f"❌ VIDEO_ANALYSIS_FAILED: {video_exc}")
+                        log.warning("GEMINI_QUOTA_EXHAUSTED", kind="video", error=str(video_exc))
+                    log.error("VIDEO_ANALYSIS_FAILED", error=str(video_exc))
                 finally:
+                    if upload_future is not None:
+                        upload_cancel.set()
+                        _discard_upload_future(client, upload_future)
+                    upload_executor.shutdown(wait=False, cancel_futures=True)
                     if uploaded_file is not None:
                         _delete_gemini_file(client, uploaded_file)
                     if video_path:
                         with suppress(Exception):
                             os.remove(video_path)
 
-                print("FRAME_FALLBACK_STARTED")
-                frames = _sample_video_frames(bytes(frame_bytes), max_frames=8)
+                log.info("FRAME_FALLBACK_STARTED")
+                frames = _sample_video_frames(bytes(frame_bytes), max_frames=5)
                 if frames:
-                    frame_parts = [
-                        types.Part.from_bytes(data=frame, mime_type="image/jpeg")
-                        for frame in frames
-                    ]
-                    frame_contents = _content_from_parts([
-                        _text_part_for_gemini(prompt),
-                        *frame_parts,
-                    ])
-                    for model_name in model_candidates:
-                        for attempt in range(2):
-                            if attempt > 0:
-                                print(f"GEMINI_RETRY frames model={model_name}")
-                            try:
-                                response = _generate_vision_content_with_key_rotation(
-                                    model=model_name,
-                                    contents=frame_contents,
-                                    config=types.GenerateContentConfig(
-                                        temperature=0.7,
-                                        max_output_tokens=300,
-                                    ),
-                                )
-                            except Exception as model_exc:
-                                if _is_gemini_quota_error(model_exc):
-                                    print(
-                                        f"GEMINI_QUOTA_EXHAUSTED frames model={model_name}: "
-                                        f"{model_exc}"
-                                    )
-                                    break
-                                raise
-                            _debug_gemini_response(
-                                "FRAME_FALLBACK_RESPONSE",
-                                response,
-                                model_name,
-                            )
-                            text = _extract_usable_gemini_text(response)
-                            if text:
-                                print(f"FRAME_FALLBACK_SUCCESS model={model_name} text={text}")
-                                return text
-                        print(f"GEMINI_EMPTY_RESPONSE frames model={model_name}")
-                print("GEMINI_EMPTY_RESPONSE frame_fallback")
-                return ""
+                    reply = _generate_budgeted_frame_reply(
+                        frames,
+                        prompt,
+                        debug_label="FRAME_FALLBACK_RESPONSE",
+                        success_label="FRAME_FALLBACK_SUCCESS",
+                    )
+                    if reply[0]:
+                        return reply
+                log.warning("GEMINI_EMPTY_RESPONSE", kind="frame_fallback")
+                return "", ""
 
             frames = frame_bytes if isinstance(frame_bytes, list) else [frame_bytes]
-            if frames and all(_is_frame_too_dark(frame) for frame in frames if isinstance(frame, (bytes, bytearray))):
-                print("FRAME_SKIPPED_TOO_DARK_OR_BLANK")
-                return ""
-            frame_parts = [
-                types.Part.from_bytes(data=frame, mime_type="image/jpeg")
-                for frame in frames
-            ]
-            frame_contents = _content_from_parts([
-                _text_part_for_gemini(prompt),
-                *frame_parts,
-            ])
-            for model_name in model_candidates:
-                for attempt in range(2):
-                    if attempt > 0:
-                        print(f"GEMINI_RETRY frames model={model_name}")
-                    try:
-                        response = _generate_vision_content_with_key_rotation(
-                            model=model_name,
-                            contents=frame_contents,
-                            config=types.GenerateContentConfig(
-                                temperature=0.7,
-                                max_output_tokens=300,
-                            ),
-                        )
-                    except Exception as model_exc:
-                        if _is_gemini_quota_error(model_exc):
-                            print(
-                                f"GEMINI_QUOTA_EXHAUSTED frames model={model_name}: "
-                                f"{model_exc}"
-                            )
-                            break
-                        raise
-                    _debug_gemini_response("FRAME_RESPONSE", response, model_name)
-                    text = _extract_usable_gemini_text(response)
-                    if text:
-                        print(f"FRAME_FALLBACK_SUCCESS model={model_name} text={text}")
-                        return text
-                print(f"GEMINI_EMPTY_RESPONSE frames model={model_name}")
-            print("GEMINI_EMPTY_RESPONSE frames")
-            return ""
+            if frames and all(_is_frame_too_dark(frame) for frame in frames if isinstance(frame, (bytes, bytearray, memoryview))):
+                log.info("FRAME_SKIPPED_TOO_DARK_OR_BLANK")
+                return "", ""
+            reply = _generate_budgeted_frame_reply(
+                frames,
+                prompt,
+                debug_label="FRAME_RESPONSE",
+                success_label="FRAME_FALLBACK_SUCCESS",
+            )
+            if reply[0]:
+                return reply
+            log.warning("GEMINI_EMPTY_RESPONSE", kind="frames")
+            return "", ""
         except Exception as exc:
             if _is_gemini_quota_error(exc):
-                print(f"GEMINI_QUOTA_EXHAUSTED model_candidates={model_candidates}: {exc}")
-            print(f"❌ _analyze_live_frame FAILED: {exc}")
-            return ""
-
-    raw = await asyncio.to_thread(run)
+                log.warning("GEMINI_QUOTA_EXHAUSTED", models=model_candidates, error=str(exc))
+            log.error("LIVE_FRAME_ANALYSIS_FAILED", error=str(exc))
+            return "", ""
+
+    # A retried clip or a second tab sending the same frames while the first
+    # analysis is still running shares that analysis instead of starting another.
+    flight_key = content_key(
+        "live_frame",
+        is_video,
+        LIVE_TWO_CALL_MODE,
+        frame_bytes,
+        prompt,
+    )
+    started_at = time.monotonic()
+    raw, mood = await asyncio.to_thread(_vision_flight.do, flight_key, run)
+    _count_analysis("clips")
+    _count_analysis("latency_ms_total", int((time.monotonic() - started_at) * 1000))
     if raw == "STRICT_POLICY_VIOLATION":
+        _count_analysis("policy_violations")
         return "", "policy_violation"
-    clean, mood = _clean_live_reply(raw)
-    if not clean:
-        print("GEMINI_NO_USABLE_REPLY returning_empty_text")
+    if not raw:
+        log.info("GEMINI_NO_USABLE_REPLY")
         return "", ""
-    return clean, mood
+    return raw, mood
 
 
 @app.post("/live-nets/analyze-chunk/{user_id}")
@@ -1180,14 +1831,18 @@ async def analyze_live_nets_chunk(
     clip_index: int = Form(0),
 ):
     try:
-        banned_payload = _reject_if_edge_banned(user_id)
+        banned_payload = await _reject_if_edge_banned(user_id)
         if banned_payload is not None:
             banned_payload["clip_index"] = clip_index
             return banned_payload
         video_bytes = await file.read()
-        print(
-            f"🎬 HTTP live chunk user={user_id} clip={clip_index} "
-            f"bytes={len(video_bytes)} lang={language} discipline={discipline}"
+        log.info(
+            "LIVE_CHUNK_RECEIVED",
+            user=user_id,
+            clip=clip_index,
+            bytes=len(video_bytes),
+            language=language,
+            discipline=discipline,
         )
         if not video_bytes:
             return {
@@ -1197,15 +1852,16 @@ async def analyze_live_nets_chunk(
                 "mood": "",
                 "clip_index": clip_index,
             }
-        reply, mood = await _analyze_live_frame(
-            video_bytes,
-            coach_name=name,
-            language=language,
-            discipline=discipline,
-            is_video=True,
-        )
+        async with _gemini_scheduler.slot("upload", user_id):
+            reply, mood = await _analyze_live_frame(
+                video_bytes,
+                coach_name=name,
+                language=language,
+                discipline=discipline,
+                is_video=True,
+            )
         if mood == "policy_violation":
-            policy = _flag_policy_violation(
+            policy = await _flag_policy_violation(
                 user_id,
                 "non_cricket_or_blank_edge_clip",
                 clip_index,
@@ -1227,9 +1883,7 @@ async def analyze_live_nets_chunk(
             "clip_index": clip_index,
         }
     except Exception as exc:
-        import traceback
-        print(f"❌ live chunk endpoint failed: {exc}")
-        traceback.print_exc()
+        log.exception("LIVE_CHUNK_FAILED", user=user_id, error=str(exc))
         return {
             "status": "failed",
             "error": str(exc),
@@ -1247,59 +1901,295 @@ async def _get_live_balance_ms(user_id: str) -> int:
     return await asyncio.to_thread(read)
 
 
-async def _charge_live_elapsed_ms(user_id: str, elapsed_ms: int) -> int:
+def _checkpoint_ms(value: Any) -> int:
+    # Entries are {"ms", "at"}; a bare integer is the pre-timestamp format.
+    try:
+        return max(0, int(value.get("ms", 0) if isinstance(value, dict) else value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _stale_checkpoints(data: dict[str, Any], now_ms: int, keep: set[str]) -> list[str]:
+    checkpoints = data.get("live_checkpoints")
+    if not isinstance(checkpoints, dict):
+        return []
+    stale = []
+    for session_id, value in checkpoints.items():
+        at = value.get("at") if isinstance(value, dict) else None
+        if session_id not in keep and (not isinstance(at, (int, float)) or now_ms - at > LIVE_CHECKPOINT_STALE_MS):
+            stale.append(session_id)
+    return stale
+
+
+def _settled_update(settled: dict[str, Any], now_ms: int, session_ids: list[str]) -> dict[str, Any]:
+    update = {
+        sid: firestore.DELETE_FIELD
+        for sid, settled_at in settled.items()
+        if not isinstance(settled_at, (int, float)) or now_ms - settled_at > LIVE_SETTLED_RETENTION_MS
+    }
+    for session_id in session_ids:
+        update[session_id] = now_ms
+    return update
+
+
+async def _commit_live_checkpoints(checkpoints: list[Checkpoint]) -> None:
+    # Read-modify-write in one transaction per chunk so both balance fields
+    # stay in step and clamp at 0 (the app falls back to the seconds field
+    # when milliseconds reads 0). Checkpoints of sessions already charged are
+    # skipped, and entries left by sessions that never closed are settled
+    # at what they had checkpointed.
+    by_user: dict[str, list[Checkpoint]] = {}
+    for checkpoint in checkpoints:
+        by_user.setdefault(checkpoint.user_id, []).append(checkpoint)
+
     @firestore.transactional
-    def txn_body(transaction: firestore.Transaction) -> int:
+    def txn_body(transaction: firestore.Transaction) -> None:
+        refs = {user_id: _live_doc(user_id) for user_id in by_user}
+        snaps = {snap.reference.path: snap for snap in transaction.get_all(list(refs.values()))}
+        now_ms = int(time.time() * 1000)
+        for user_id, user_checkpoints in by_user.items():
+            snap = snaps.get(refs[user_id].path)
+            data = snap.to_dict() if snap is not None and snap.exists else {}
+            settled = data.get("live_settled")
+            settled = settled if isinstance(settled, dict) else {}
+            balance_ms = _live_balance_ms_from_data(data)
+            entries: dict[str, Any] = {}
+            for checkpoint in user_checkpoints:
+                if checkpoint.session_id in settled:
+                    continue
+                balance_ms = max(0, balance_ms - checkpoint.delta_ms)
+                entries[checkpoint.session_id] = {"ms": checkpoint.total_ms, "at": now_ms}
+            stale = _stale_checkpoints(data, now_ms, keep=set(entries))
+            for session_id in stale:
+                entries[session_id] = firestore.DELETE_FIELD
+            update: dict[str, Any] = {
+                "live_milliseconds_remaining": balance_ms,
+                "live_seconds_remaining": _legacy_seconds(balance_ms),
+                "live_checkpoints": entries,
+            }
+            if stale:
+                update["live_settled"] = _settled_update(settled, now_ms, stale)
+            transaction.set(refs[user_id], update, merge=True)
+
+    def run() -> None:
+        txn_body(_live_db().transaction())
+
+    await asyncio.to_thread(run)
+
+
+async def _charge_live_elapsed_ms(user_id: str, elapsed_ms: int, session_id: str | None = None) -> int:
+    # Whatever the billing ledger already debited for this session is
+    # subtracted, and its checkpoint entry is cleared in the same transaction.
+    # The session is marked settled in that transaction too: the close path,
+    # orphan settlement on another worker and retries after a failed registry
+    # write may all charge the same session, and only the first one debits.
+    @firestore.transactional
+    def txn_body(transaction: firestore.Transaction) -> tuple[int, bool]:
         ref = _live_doc(user_id)
         snap = ref.get(transaction=transaction)
-        current_ms = _live_balance_ms_from_data(snap.to_dict() if snap.exists else {})
+        data = snap.to_dict() if snap.exists else {}
+        current_ms = _live_balance_ms_from_data(data)
+        settled = data.get("live_settled")
+        settled = settled if isinstance(settled, dict) else {}
+        if session_id is not None and session_id in settled:
+            transaction.set(ref, {"live_checkpoints": {session_id: firestore.DELETE_FIELD}}, merge=True)
+            return current_ms, False
+        checkpoints = data.get("live_checkpoints")
+        checkpoints = checkpoints if isinstance(checkpoints, dict) else {}
+        checkpointed_ms = _checkpoint_ms(checkpoints.get(session_id, 0)) if session_id is not None else 0
         billed_ms = max(0, elapsed_ms)
-        next_ms = max(0, current_ms - billed_ms)
-        transaction.set(
-            ref,
-            {
-                "live_milliseconds_remaining": next_ms,
-                "live_seconds_remaining": _legacy_seconds(next_ms),
-                "last_live_session_billed_ms": billed_ms,
-                "last_live_session_ended_at": firestore.SERVER_TIMESTAMP,
-            },
-            merge=True,
-        )
-        return next_ms
-
-    def run() -> int:
+        next_ms = max(0, current_ms - max(0, billed_ms - checkpointed_ms))
+        update = {
+            "live_milliseconds_remaining": next_ms,
+            "live_seconds_remaining": _legacy_seconds(next_ms),
+            "last_live_session_billed_ms": max(billed_ms, checkpointed_ms),
+            "last_live_session_ended_at": firestore.SERVER_TIMESTAMP,
+        }
+        if session_id is not None:
+            now_ms = int(time.time() * 1000)
+            stale = _stale_checkpoints(data, now_ms, keep={session_id})
+            update["live_checkpoints"] = {sid: firestore.DELETE_FIELD for sid in [session_id, *stale]}
+            update["live_settled"] = _settled_update(settled, now_ms, [session_id, *stale])
+        transaction.set(ref, update, merge=True)
+        return next_ms, True
+
+    def run() -> tuple[int, bool]:
         return txn_body(_live_db().transaction())
 
-    return await asyncio.to_thread(run)
+    next_ms, charged = await asyncio.to_thread(run)
+    if not charged:
+        log.info("LIVE_BALANCE_ALREADY_SETTLED", user=user_id, session=session_id, elapsed_ms=elapsed_ms)
+    return next_ms
+
+
+async def _probe_loop_lag() -> None:
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(LOOP_LAG_PROBE_S)
+        _loop_lag_ms.append((time.perf_counter() - started - LOOP_LAG_PROBE_S) * 1000.0)
+
+
+def _ensure_loop_lag_probe() -> None:
+    global _loop_lag_task
+    if LOOP_LAG_PROBE_S > 0 and (_loop_lag_task is None or _loop_lag_task.done()):
+        _loop_lag_task = asyncio.get_running_loop().create_task(_probe_loop_lag())
+
+
+def _loop_lag_stats_snapshot() -> dict[str, Any]:
+    samples = sorted(_loop_lag_ms)
+    if not samples:
+        return {"samples": 0}
+    return {
+        "samples": len(samples),
+        "lag_ms_p50": round(samples[len(samples) // 2], 2),
+        "lag_ms_p99": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 2),
+        "lag_ms_max": round(samples[-1], 2),
+    }
+
+
+def _billing_stats_snapshot() -> dict[str, Any]:
+    wakeups = _billing_counters["wakeups"]
+    return {
+        "cadence_s": LIVE_BILLING_CADENCE_S,
+        **_billing_counters,
+        "frames_per_wakeup": round(_billing_counters["frames_sent"] / wakeups, 3) if wakeups else 0.0,
+    }
 
 
 async def _live_billing_guard(
-    client_ws: WebSocket,
+    client_ws: WebSocket | OutboundQueue,
     stop: asyncio.Event,
     start_ns: int,
     starting_balance_ms: int,
+    resync: asyncio.Event | None = None,
 ) -> None:
+    # The client counts down locally; the server only speaks when the
+    # displayed second has moved by LIVE_BILLING_CADENCE_S, on a client
+    # billing_sync, and at exhaustion. Wakeups come from the worker's shared
+    # timer wheel, so idle sessions hold no loop timers of their own.
+    wake = resync if resync is not None else asyncio.Event()
+    timer = None
+    timer_due = False
+
+    def _timer_fired() -> None:
+        nonlocal timer_due
+        timer_due = True
+        wake.set()
+
+    last_sent_seconds: int | None = None
+    try:
+        while not stop.is_set():
+            elapsed_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+            remaining_ms = max(0, starting_balance_ms - elapsed_ms)
+            seconds = _legacy_seconds(remaining_ms)
+            forced = wake.is_set() and not timer_due
+            if forced:
+                _billing_counters["resyncs"] += 1
+            wake.clear()
+            timer_due = False
+            if (
+                forced
+                or remaining_ms <= 0
+                or last_sent_seconds is None
+                or last_sent_seconds - seconds >= LIVE_BILLING_CADENCE_S
+            ):
+                await client_ws.send_json(
+                    {
+                        "type": "billing",
+                        "live_milliseconds_remaining": remaining_ms,
+                        "live_seconds_remaining": seconds,
+                        "elapsed_milliseconds": elapsed_ms,
+                    }
+                )
+                _billing_counters["frames_sent"] += 1
+                last_sent_seconds = seconds
+            if remaining_ms <= 0:
+                await client_ws.send_json(
+                    {"type": "termination", "reason": "LIVE_BALANCE_EXHAUSTED"}
+                )
+                stop.set()
+                await client_ws.close(code=4001)
+                return
+
+            next_seconds = last_sent_seconds - LIVE_BILLING_CADENCE_S
+            delay_ms = remaining_ms - max(0, next_seconds) * 1000
+            _billing_counters["wakeups"] += 1
+            timer = _session_timers.call_later(delay_ms / 1000.0, _timer_fired)
+            await wake.wait()
+            _session_timers.cancel(timer)
+            timer = None
+    finally:
+        _session_timers.cancel(timer)
+
+
+async def _live_lease_keeper(
+    client_ws: WebSocket | OutboundQueue,
+    stop: asyncio.Event,
+    user_id: str,
+    session_id: str,
+    start_ns: int,
+) -> None:
+    # Keeps the user's balance lease alive and checkpoints elapsed time, so a
+    # worker crash leaves a chargeable record instead of a lost session.
+    # If the registry cannot be reached, the session ends before the lease
+    # could expire, so another worker never bills it as an orphan while it
+    # is still running here.
+    interval_s = max(1.0, LIVE_LEASE_TTL_S / 3.0)
+    confirmed_at = time.monotonic()
     while not stop.is_set():
-        await asyncio.sleep(0.1)
+        await asyncio.sleep(interval_s)
         elapsed_ms = (time.monotonic_ns() - start_ns) // 1_000_000
-        remaining_ms = max(0, starting_balance_ms - elapsed_ms)
-        await client_ws.send_json(
-            {
-                "type": "billing",
-                "live_milliseconds_remaining": remaining_ms,
-                "live_seconds_remaining": _legacy_seconds(remaining_ms),
-                "elapsed_milliseconds": elapsed_ms,
-            }
-        )
-        if remaining_ms <= 0:
-            await client_ws.send_json(
-                {"type": "termination", "reason": "LIVE_BALANCE_EXHAUSTED"}
-            )
+        try:
+            held = await _session_registry.refresh_lease(user_id, session_id, elapsed_ms)
+        except Exception as exc:
+            log.warning("LIVE_LEASE_REFRESH_FAILED", user=user_id, session=session_id, error=str(exc))
+            held = time.monotonic() - confirmed_at + interval_s < LIVE_LEASE_TTL_S
+            if held:
+                continue
+        else:
+            confirmed_at = time.monotonic()
+        if not held:
+            log.warning("LIVE_LEASE_LOST", user=user_id, session=session_id)
+            await client_ws.send_json({"type": "termination", "reason": "SESSION_LEASE_LOST"})
             stop.set()
-            await client_ws.close(code=4001)
             return
 
 
+async def _registry_ban_status(user_id: str) -> dict[str, Any] | None:
+    # The registry only mirrors bans for other workers; when it is down the
+    # Firestore-backed check still applies.
+    try:
+        status = await _session_registry.ban_status(user_id)
+    except Exception as exc:
+        log.warning("LIVE_REGISTRY_UNAVAILABLE", op="ban_status", user=user_id, error=str(exc))
+        status = None
+    return status or await _edge_policy_ban_status(user_id)
+
+
+async def _registry_settle(user_id: str, session_id: str, elapsed_ms: int) -> None:
+    # The charge itself is idempotent per session, so a settle lost here only
+    # means the session is reported (and skipped) as an orphan later.
+    try:
+        await _session_registry.settle(user_id, session_id, elapsed_ms)
+    except Exception as exc:
+        log.warning("LIVE_REGISTRY_UNAVAILABLE", op="settle", user=user_id, session=session_id, error=str(exc))
+
+
+async def _settle_orphaned_sessions(user_id: str, orphans: list[dict[str, Any]], skip_billing: bool) -> None:
+    for orphan in orphans:
+        elapsed_ms = int(orphan.get("elapsed_ms") or 0)
+        if not skip_billing and elapsed_ms > 0:
+            await _charge_live_elapsed_ms(user_id, elapsed_ms, orphan["session_id"])
+        await _registry_settle(user_id, orphan["session_id"], elapsed_ms)
+        log.info(
+            "LIVE_ORPHAN_SESSION_SETTLED",
+            user=user_id,
+            session=orphan["session_id"],
+            worker=orphan.get("worker"),
+            elapsed_ms=elapsed_ms,
+        )
+
+
 async def _live_from_flutter(
     client_ws: WebSocket,
     live_session: Any,
@@ -1389,10 +2279,13 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
     starting_balance_ms = 0
     billed = False
     start_ns = time.monotonic_ns()
+    session_id = uuid.uuid4().hex
+    lease_held = False
 
     try:
         await websocket.accept()
-        ban_status = _edge_policy_ban_status(user_id)
+        _ensure_loop_lag_probe()
+        ban_status = await _registry_ban_status(user_id)
         if ban_status is not None:
             await websocket.send_json(
                 {
@@ -1405,19 +2298,32 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
             )
             await websocket.close(code=4003)
             return
-        
+
+        try:
+            lease = await _session_registry.acquire_lease(user_id, session_id)
+        except Exception as exc:
+            # Fail open: the session runs without a lease (no lease keeper,
+            # no orphan records) and is still billed at close as usual.
+            log.warning("LIVE_REGISTRY_UNAVAILABLE", op="acquire_lease", user=user_id, error=str(exc))
+            lease = {"replaced": None, "orphans": []}
+        else:
+            lease_held = True
+        if lease["replaced"]:
+            # Usually a reconnect after a half-open drop; the old session's
+            # lease keeper ends it on its next refresh.
+            log.info("LIVE_LEASE_TAKEN_OVER", user=user_id, session=session_id, replaced=lease["replaced"])
+        if lease["orphans"]:
+            await _settle_orphaned_sessions(user_id, lease["orphans"], SKIP_BILLING)
+
         if SKIP_BILLING:
             starting_balance_ms = DEV_BALANCE_MS
-            print(f"💰 User={user_id} using dev balance={starting_balance_ms}ms because SKIP_BILLING=true (Bypassing Firestore)")
+            log.info("LIVE_BALANCE_DEV", user=user_id, balance_ms=starting_balance_ms)
         else:
-            print(f"💰 User={user_id} fetching balance from Firestore...")
             try:
                 starting_balance_ms = await _get_live_balance_ms(user_id)
-                print(f"💰 User={user_id} balance={starting_balance_ms}ms from Firestore")
+                log.info("LIVE_BALANCE_LOADED", user=user_id, balance_ms=starting_balance_ms)
             except Exception as e:
-                print(f"❌ Failed to query Firestore balance for user {user_id}: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("LIVE_BALANCE_QUERY_FAILED", user=user_id, error=str(e))
                 await websocket.send_json({
                     "type": "error",
                     "reason": f"Firestore connection error: {e}"
@@ -1426,16 +2332,20 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
                 return
 
         if starting_balance_ms <= 0:
-            print("🚫 NO_LIVE_BALANCE — closing connection")
+            log.info("NO_LIVE_BALANCE", user=user_id)
             await websocket.send_json({"type": "termination", "reason": "NO_LIVE_BALANCE"})
             await websocket.close(code=4003)
             return
+        if not SKIP_BILLING:
+            _billing_ledger.open(user_id, session_id, start_ns, starting_balance_ms)
 
         await websocket.send_json(
             {
                 "type": "ready",
                 "live_milliseconds_remaining": starting_balance_ms,
                 "live_seconds_remaining": _legacy_seconds(starting_balance_ms),
+                "session_id": session_id,
+                "route": _session_registry.route(),
             }
         )
 
@@ -1443,50 +2353,104 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
             {
                 "type": "connected",
                 "model": _resolve_vision_model_name(),
+                "media_protocols": list(LIVE_MEDIA_PROTOCOLS),
             }
         )
 
-        latest_frame: bytes | list[bytes] | None = None
+        latest_frame: bytes | memoryview | list[bytes | memoryview] | None = None
         latest_is_video = False
         latest_clip_index: int | None = None
         analysis_event = asyncio.Event()
+        billing_resync = asyncio.Event()
+        latest_received_at = 0.0
         analysis_running = False
-        last_reply_at = 0.0
+        motion_pending = False
+        pacer = LivePacer(
+            min_gap_s=LIVE_PACER_MIN_GAP_S,
+            max_gap_s=LIVE_PACER_MAX_GAP_S,
+            stale_after_s=LIVE_PACER_STALE_AFTER_S,
+        )
+        motion = MotionTrigger(keepalive_s=LIVE_MOTION_KEEPALIVE_S)
+        outbound = OutboundQueue(
+            websocket,
+            max_items=LIVE_OUTBOUND_MAX_ITEMS,
+            transcript_max_age_s=LIVE_OUTBOUND_TRANSCRIPT_MAX_AGE_S,
+        )
+        outbound_task = asyncio.create_task(outbound.run())
+        outbound_task.add_done_callback(partial(_mark_task_failure, stop))
+        session_key = next(_live_session_serial)
+        _live_sessions[session_key] = {"pacing": pacer, "motion": motion, "outbound": outbound}
         coach_name = "Player"
         coach_language = "English"
         coach_discipline = "Batting"
+        # 0 = legacy: media arrives base64 in JSON and raw binary is a clip.
+        media_protocol = 0
+
+        async def _post_to_mailbox(
+            media: bytes | memoryview | list[bytes | memoryview],
+            is_video: bool,
+            clip_index: int | None,
+        ) -> None:
+            # Motion is scored on every received frame, so consecutive
+            # frames are differenced even while the mailbox drops most of
+            # them; a burst stays pending until the analysis loop takes it.
+            # Newest media wins; an unconsumed frame being replaced is a drop.
+            nonlocal latest_frame, latest_is_video, latest_clip_index, latest_received_at, motion_pending
+            if LIVE_MOTION_TRIGGER_ENABLED:
+                decision = await asyncio.to_thread(motion.check, media, is_video, time.monotonic())
+                motion_pending = motion_pending or decision != "idle"
+            pacer.on_received(replaced=latest_frame is not None)
+            latest_frame = media
+            latest_is_video = is_video
+            latest_clip_index = clip_index
+            latest_received_at = time.monotonic()
+            analysis_event.set()
 
         async def _analysis_loop() -> None:
-            nonlocal latest_frame, latest_is_video, latest_clip_index, analysis_running, last_reply_at
+            nonlocal latest_frame, latest_is_video, latest_clip_index, analysis_running, motion_pending
             analysis_running = True
-            print("🚀 _analysis_loop started")
+            log.debug("LIVE_ANALYSIS_LOOP_STARTED", user=user_id)
             try:
                 while not stop.is_set():
                     await analysis_event.wait()
                     analysis_event.clear()
-                    print("📸 Frame received, sending to Gemini...")
                     while not stop.is_set() and latest_frame is not None:
+                        delay = pacer.wait_s(time.monotonic())
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                            continue
                         frame = latest_frame
                         is_video = latest_is_video
                         clip_index = latest_clip_index
                         latest_frame = None
                         latest_is_video = False
                         latest_clip_index = None
+                        if pacer.is_stale(latest_received_at, time.monotonic()):
+                            continue
+                        if LIVE_MOTION_TRIGGER_ENABLED:
+                            if not motion_pending:
+                                continue
+                            motion_pending = False
+                        pacer.on_started()
+                        started_at = time.monotonic()
                         try:
-                            reply, mood = await _analyze_live_frame(
-                                frame,
-                                coach_name=coach_name,
-                                language=coach_language,
-                                discipline=coach_discipline,
-                                is_video=is_video,
-                            )
+                            async with _gemini_scheduler.slot("live", user_id):
+                                reply, mood = await _analyze_live_frame(
+                                    frame,
+                                    coach_name=coach_name,
+                                    language=coach_language,
+                                    discipline=coach_discipline,
+                                    is_video=is_video,
+                                )
                         except Exception as exc:
-                            print(f"❌ Analysis loop error: {exc}")
+                            log.error("LIVE_ANALYSIS_LOOP_ERROR", user=user_id, error=str(exc))
                             reply = ""
                             mood = "correction"
+                        finished_at = time.monotonic()
+                        pacer.on_finished(finished_at - started_at, finished_at)
                         if reply:
-                            print(f"📢 Sending transcript ({mood}): {reply}")
-                            await websocket.send_json(
+                            log.info("LIVE_TRANSCRIPT_SENT", user=user_id, mood=mood, clip=clip_index, text=reply)
+                            await outbound.send_json(
                                 {
                                     "type": "transcript",
                                     "text": reply,
@@ -1494,14 +2458,13 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
                                     "clip_index": clip_index,
                                 }
                             )
-                            last_reply_at = time.monotonic()
                         elif mood == "policy_violation":
-                            policy = _flag_policy_violation(
+                            policy = await _flag_policy_violation(
                                 user_id,
                                 "non_cricket_or_blank_edge_socket",
                                 clip_index,
                             )
-                            await websocket.send_json(
+                            await outbound.send_json(
                                 {
                                     "type": "policy_banned"
                                     if policy["banned"]
@@ -1515,16 +2478,13 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
                             )
                             stop.set()
                             return
-                        if latest_frame is None:
-                            break
-                        await asyncio.sleep(0.5)
             finally:
                 analysis_running = False
-                print("🛑 _analysis_loop ended")
+                log.debug("LIVE_ANALYSIS_LOOP_ENDED", user=user_id)
 
         async def _receive_frames() -> None:
-            nonlocal latest_frame, latest_is_video, latest_clip_index, coach_name, coach_language, coach_discipline
-            print("🎥 _receive_frames started")
+            nonlocal coach_name, coach_language, coach_discipline, media_protocol
+            log.debug("LIVE_RECEIVE_LOOP_STARTED", user=user_id)
             try:
                 while not stop.is_set():
                     message = await websocket.receive()
@@ -1538,17 +2498,28 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
                             coach_name = str(payload.get("name", coach_name)).strip() or coach_name
                             coach_language = str(payload.get("language", coach_language)).strip() or coach_language
                             coach_discipline = str(payload.get("discipline", coach_discipline)).strip() or coach_discipline
-                            print(f"⚙️ Config: name={coach_name} lang={coach_language} discipline={coach_discipline}")
+                            log.info(
+                                "LIVE_CLIENT_CONFIG",
+                                user=user_id,
+                                name=coach_name,
+                                language=coach_language,
+                                discipline=coach_discipline,
+                            )
+                            if "protocol" in payload:
+                                media_protocol = negotiate_version(payload.get("protocol"))
+                                await outbound.send_json(
+                                    {
+                                        "type": "protocol",
+                                        "version": media_protocol,
+                                        "supported": list(LIVE_MEDIA_PROTOCOLS),
+                                    }
+                                )
                             continue
                         if kind == "video":
                             frame = base64.b64decode(payload["data"])
-                            print(f"🎞️ Live frame received: {len(frame)} bytes")
-                            # Accept frame if at least 0.5s since last reply
-                            if (time.monotonic() - last_reply_at) >= 0.5:
-                                latest_frame = frame
-                                latest_is_video = False
-                                latest_clip_index = None
-                                analysis_event.set()
+                            log.debug("LIVE_FRAME_RECEIVED", sample=LIVE_FRAME_LOG_SAMPLE_RATE, user=user_id, bytes=len(frame))
+                            if frame:
+                                await _post_to_mailbox(frame, False, None)
                         elif kind == "video_clip":
                             clip = base64.b64decode(payload["data"])
                             clip_index = payload.get("clip_index")
@@ -1556,12 +2527,9 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
                                 clip_index = int(clip_index) if clip_index is not None else None
                             except (TypeError, ValueError):
                                 clip_index = None
-                            print(f"🎬 Live video #{clip_index} received: {len(clip)} bytes")
-                            if clip and (time.monotonic() - last_reply_at) >= 0.5:
-                                latest_frame = clip
-                                latest_is_video = True
-                                latest_clip_index = clip_index
-                                analysis_event.set()
+                            log.debug("LIVE_CLIP_RECEIVED", sample=LIVE_FRAME_LOG_SAMPLE_RATE, user=user_id, clip=clip_index, bytes=len(clip))
+                            if clip:
+                                await _post_to_mailbox(clip, True, clip_index)
                         elif kind == "video_batch":
                             raw_frames = payload.get("frames") or []
                             frames = [
@@ -1569,34 +2537,62 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
                                 for item in raw_frames
                                 if isinstance(item, str) and item
                             ]
-                            print(f"🎞️ Live frame batch received: {len(frames)} frames")
-                            if frames and (time.monotonic() - last_reply_at) >= 0.5:
-                                latest_frame = frames[-5:]
-                                latest_is_video = False
-                                latest_clip_index = None
-                                analysis_event.set()
+                            log.debug("LIVE_FRAME_BATCH_RECEIVED", sample=LIVE_FRAME_LOG_SAMPLE_RATE, user=user_id, frames=len(frames))
+                            if frames:
+                                await _post_to_mailbox(frames[-5:], False, None)
+                        elif kind == "billing_sync":
+                            billing_resync.set()
                         elif kind == "stop":
                             stop.set()
                             return
                         continue
 
-                    if raw:
-                        print(f"🎬 Live binary video received: {len(raw)} bytes")
-                        if (time.monotonic() - last_reply_at) >= 0.5:
-                            latest_frame = raw
-                            latest_is_video = True
-                            latest_clip_index = None
-                            analysis_event.set()
+                    if raw and media_protocol:
+                        # Payloads stay views into `raw`; bytes are only
+                        # materialised off the event loop by the analysis.
+                        try:
+                            records = parse_media_message(raw)
+                        except ProtocolError as exc:
+                            log.warning("LIVE_MEDIA_FRAME_REJECTED", user=user_id, error=str(exc))
+                            await outbound.send_json(
+                                {"type": "error", "reason": "BAD_MEDIA_FRAME", "detail": str(exc)}
+                            )
+                            continue
+                        clips = [record for record in records if record.kind == KIND_CLIP]
+                        images = [record.payload for record in records if record.kind == KIND_IMAGE]
+                        log.debug(
+                            "LIVE_MEDIA_RECORDS_RECEIVED",
+                            sample=LIVE_FRAME_LOG_SAMPLE_RATE,
+                            user=user_id,
+                            clips=len(clips),
+                            frames=len(images),
+                            bytes=len(raw),
+                        )
+                        if clips:
+                            await _post_to_mailbox(clips[-1].payload, True, clips[-1].clip_index)
+                        else:
+                            await _post_to_mailbox(images[0] if len(images) == 1 else images[-5:], False, None)
+                    elif raw:
+                        log.debug("LIVE_BINARY_CLIP_RECEIVED", sample=LIVE_FRAME_LOG_SAMPLE_RATE, user=user_id, bytes=len(raw))
+                        await _post_to_mailbox(raw, True, None)
             except WebSocketDisconnect:
                 stop.set()
 
         tasks = [
             asyncio.create_task(
-                _live_billing_guard(websocket, stop, start_ns, starting_balance_ms)
+                _live_billing_guard(
+                    outbound,
+                    stop,
+                    start_ns,
+                    starting_balance_ms,
+                    billing_resync,
+                )
             ),
             asyncio.create_task(_analysis_loop()),
             asyncio.create_task(_receive_frames()),
         ]
+        if lease_held:
+            tasks.append(asyncio.create_task(_live_lease_keeper(outbound, stop, user_id, session_id, start_ns)))
 
         await stop.wait()
         for task in tasks:
@@ -1604,6 +2600,14 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
         for task in tasks:
             with suppress(asyncio.CancelledError, WebSocketDisconnect):
                 await task
+        # Flush what is queued (a termination or policy message is usually
+        # the last thing enqueued) before the socket is torn down.
+        outbound.finish()
+        with suppress(Exception):
+            await asyncio.wait_for(outbound_task, LIVE_OUTBOUND_DRAIN_S)
+        log.info("LIVE_SESSION_PACING", user=user_id, **pacer.stats())
+        log.info("LIVE_SESSION_MOTION", user=user_id, **motion.stats())
+        log.info("LIVE_SESSION_OUTBOUND", user=user_id, **outbound.stats())
 
         elapsed_ms = min(
             starting_balance_ms,
@@ -1611,22 +2615,24 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
         )
         if not SKIP_BILLING:
             try:
-                await _charge_live_elapsed_ms(user_id, elapsed_ms)
-                print(f"💰 Successfully charged user {user_id} for {elapsed_ms}ms")
+                await _billing_ledger.close(session_id)
+                await _charge_live_elapsed_ms(user_id, elapsed_ms, session_id)
+                log.info("LIVE_BALANCE_CHARGED", user=user_id, elapsed_ms=elapsed_ms)
             except Exception as e:
-                print(f"❌ Failed to charge Firestore balance: {e}")
+                log.error("LIVE_BALANCE_CHARGE_FAILED", user=user_id, elapsed_ms=elapsed_ms, error=str(e))
+            else:
+                await _registry_settle(user_id, session_id, elapsed_ms)
         else:
-            print(f"ℹ️ SKIP_BILLING is true, bypassing Firestore charge of {elapsed_ms}ms")
+            await _registry_settle(user_id, session_id, elapsed_ms)
+            log.info("LIVE_BALANCE_CHARGE_SKIPPED", user=user_id, elapsed_ms=elapsed_ms)
         billed = True
 
     except WebSocketDisconnect:
-        print(f"🔌 WebSocket disconnected for user {user_id}")
+        log.info("LIVE_SOCKET_DISCONNECTED", user=user_id)
         with suppress(Exception):
             stop.set()
     except Exception as exc:
-        print(f"❌ Exception in live_nets_socket: {exc}")
-        import traceback
-        traceback.print_exc()
+        log.exception("LIVE_SOCKET_FAILED", user=user_id, error=str(exc))
         with suppress(Exception):
             await websocket.send_json(
                 {
@@ -1638,13 +2644,22 @@ async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
     finally:
         with suppress(Exception):
             stop.set()
+        if "session_key" in locals():
+            _live_sessions.pop(session_key, None)
+        if "outbound" in locals():
+            outbound.finish()
         if not SKIP_BILLING and "starting_balance_ms" in locals() and "start_ns" in locals() and not billed:
             elapsed_ms = min(
                 starting_balance_ms,
                 (time.monotonic_ns() - start_ns) // 1_000_000,
             )
             with suppress(Exception):
-                await _charge_live_elapsed_ms(user_id, elapsed_ms)
+                await _billing_ledger.close(session_id)
+                await _charge_live_elapsed_ms(user_id, elapsed_ms, session_id)
+                await _registry_settle(user_id, session_id, elapsed_ms)
+        if "session_id" in locals() and lease_held:
+            with suppress(Exception):
+                await _session_registry.release_lease(user_id, session_id)
 
 
 # -----------------------------
@@ -2101,7 +3116,7 @@ async def ai_coach_analyze(request: Request, file: UploadFile = File(...)):
     ))
     if not user_id:
         raise HTTPException(status_code=401, detail="USER_NOT_AUTHENTICATED")
-    banned = _reject_if_any_ai_banned(user_id)
+    banned = await _reject_if_any_ai_banned(user_id)
     if banned is not None:
         raise HTTPException(status_code=403, detail=banned["text"])
 
@@ -2115,7 +3130,7 @@ async def ai_coach_analyze(request: Request, file: UploadFile = File(...)):
         try:
             increment_mistake(user_id)
         except Exception as e:
-            print("⚠️ Mistake usage bypassed for active subscriber:", e)
+            log.warning("MISTAKE_USAGE_BYPASSED", user=user_id, error=str(e))
 
         ball_positions = track_ball_positions(video_path)
 
@@ -2137,12 +3152,14 @@ Focus on batting mechanics like stance, balance, bat path, timing, footwork, bod
 Do not mention speed, swing, or spin.
 """
 
-        feedback = generate_text(
-            system_instruction="You are CrickNova Coach.",
-            user_prompt=prompt,
-            max_output_tokens=90,
-            temperature=0.55,
-        )
+        async with _gemini_scheduler.slot("upload", user_id):
+            feedback = await asyncio.to_thread(
+                generate_text,
+                system_instruction="You are CrickNova Coach.",
+                user_prompt=prompt,
+                max_output_tokens=90,
+                temperature=0.55,
+            )
 
         return {
             "status": "success",
@@ -2160,12 +3177,58 @@ Do not mention speed, swing, or spin.
             os.remove(video_path)
 
 
+# -----------------------------
+# AI COACH STREAMING (SSE)
+# -----------------------------
+def _wants_event_stream(request: Request, stream: bool | None) -> bool:
+    if stream:
+        return True
+    return "text/event-stream" in (request.headers.get("accept") or "").lower()
+
+
+def _sse_event(event: str, payload: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _stream_coach_reply(
+    envelope_key: str,
+    priority: str,
+    user_id: str,
+    **generate_kwargs: Any,
+) -> StreamingResponse:
+    # Emits "delta" events as Gemini generates, then one "done" event whose data
+    # is the same JSON envelope the non-streaming endpoint returns. The
+    # scheduler slot is held for the whole stream, not just until headers go out.
+    async def events():
+        chunks: list[str] = []
+        try:
+            async with _gemini_scheduler.slot(priority, user_id):
+                stream = stream_text(**generate_kwargs)
+                while True:
+                    chunk = await asyncio.to_thread(next, stream, None)
+                    if chunk is None:
+                        break
+                    chunks.append(chunk)
+                    yield _sse_event("delta", {"text": chunk})
+            envelope = {"status": "success", envelope_key: "".join(chunks).strip()}
+        except Exception as e:
+            envelope = {"status": "failed", envelope_key: f"Coach error: {str(e)}"}
+        yield _sse_event("done", envelope)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # -----------------------------
 # AI COACH CHAT (TEXT ONLY, JSON)
 # -----------------------------
 class CoachChatRequest(BaseModel):
     message: str | None = None
     history: list[dict] | None = None
+    stream: bool | None = None
 
 @app.post("/coach/chat")
 async def ai_coach_chat(request: Request, req: CoachChatRequest = Body(...)):
@@ -2186,7 +3249,7 @@ async def ai_coach_chat(request: Request, req: CoachChatRequest = Body(...)):
     ))
     if not user_id:
         raise HTTPException(status_code=401, detail="USER_NOT_AUTHENTICATED")
-    banned = _reject_if_any_ai_banned(user_id)
+    banned = await _reject_if_any_ai_banned(user_id)
     if banned is not None:
         raise HTTPException(status_code=403, detail=banned["text"])
 
@@ -2195,7 +3258,8 @@ async def ai_coach_chat(request: Request, req: CoachChatRequest = Body(...)):
     try:
         increment_chat(user_id)
     except Exception as e:
-        print("⚠️ Chat usage bypassed for active subscriber:", e)
+        log.warning("CHAT_USAGE_BYPASSED", user=user_id, error=str(e))
+    wants_stream = _wants_event_stream(request, req.stream)
     try:
         msg_lower = message.lower()
         looks_like_raw_prompt = (
@@ -2217,17 +3281,21 @@ async def ai_coach_chat(request: Request, req: CoachChatRequest = Body(...)):
             or "[drill]" in msg_lower
         )
         if looks_like_raw_prompt:
-            reply_text = generate_text(
-                system_instruction=(
+            generate_kwargs = {
+                "system_instruction": (
                     "You are CrickNova batting coach. "
                     "Analyze only the provided clip context. "
                     "Be direct, honest, and unscripted. "
                     "Avoid repeated generic lines."
                 ),
-                user_prompt=message,
-                max_output_tokens=320,
-                temperature=0.72,
-            )
+                "user_prompt": message,
+                "max_output_tokens": 320,
+                "temperature": 0.72,
+            }
+            if wants_stream:
+                return _stream_coach_reply("reply", "chat", user_id, **generate_kwargs)
+            async with _gemini_scheduler.slot("chat", user_id):
+                reply_text = await asyncio.to_thread(generate_text, **generate_kwargs)
             return {"status": "success", "reply": reply_text}
 
         history_lines = []
@@ -2267,12 +3335,16 @@ User question:
 {message}
 '''
 
-        reply_text = generate_text(
-            system_instruction="You are CrickNova Coach.",
-            user_prompt=prompt,
-            max_output_tokens=220,
-            temperature=0.72,
-        )
+        generate_kwargs = {
+            "system_instruction": "You are CrickNova Coach.",
+            "user_prompt": prompt,
+            "max_output_tokens": 220,
+            "temperature": 0.72,
+        }
+        if wants_stream:
+            return _stream_coach_reply("reply", "chat", user_id, **generate_kwargs)
+        async with _gemini_scheduler.slot("chat", user_id):
+            reply_text = await asyncio.to_thread(generate_text, **generate_kwargs)
 
         return {
             "status": "success",
@@ -2294,6 +3366,7 @@ async def ai_coach_diff(
     left: UploadFile = File(...),
     right: UploadFile = File(...),
     prompt: str | None = Form(None),
+    stream: bool = Form(False),
 ):
     if not _gemini_api_keys():
         raise HTTPException(status_code=503, detail="AI_TEMPORARILY_UNAVAILABLE")
@@ -2304,7 +3377,7 @@ async def ai_coach_diff(
     ))
     if not user_id:
         raise HTTPException(status_code=401, detail="USER_NOT_AUTHENTICATED")
-    banned = _reject_if_any_ai_banned(user_id)
+    banned = await _reject_if_any_ai_banned(user_id)
     if banned is not None:
         raise HTTPException(status_code=403, detail=banned["text"])
 
@@ -2351,7 +3424,7 @@ async def ai_coach_diff(
         try:
             increment_compare(user_id)
         except Exception as e:
-            print("⚠️ Compare usage bypassed for active subscriber:", e)
+            log.warning("COMPARE_USAGE_BYPASSED", user=user_id, error=str(e))
 
         try:
             left_positions = track_ball_positions(left_path) or []
@@ -2387,17 +3460,21 @@ Keep the full reply under 260 words and avoid generic wording.
               f"v2_sig={trajectory_signature(right_positions)}\n"
         )
 
-        diff_text = generate_text(
-            system_instruction=(
+        generate_kwargs = {
+            "system_instruction": (
                 "You are CrickNova batting coach. "
                 "Give batting-only comparison and batting drills only. "
                 "Never provide bowling analysis. "
                 "Make the response clip-specific and avoid repeating generic lines."
             ),
-            user_prompt=final_prompt,
-            max_output_tokens=260,
-            temperature=0.6,
-        )
+            "user_prompt": final_prompt,
+            "max_output_tokens": 260,
+            "temperature": 0.6,
+        }
+        if _wants_event_stream(request, stream):
+            return _stream_coach_reply("difference", "diff", user_id, **generate_kwargs)
+        async with _gemini_scheduler.slot("diff", user_id):
+            diff_text = await asyncio.to_thread(generate_text, **generate_kwargs)
 
         return {
             "status": "success",
@@ -1,9 +1,13 @@
 import json
 import os
+import sqlite3
+import threading
 from datetime import datetime, timedelta, timezone
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-FILE_PATH = os.path.join(BASE_DIR, "subscriptions.json")
+# Legacy store: read once to seed the database, then left in place untouched.
+FILE_PATH = os.getenv("SUBSCRIPTIONS_JSON_PATH") or os.path.join(BASE_DIR, "subscriptions.json")
+DB_PATH = os.getenv("SUBSCRIPTIONS_DB_PATH") or os.path.join(BASE_DIR, "subscriptions.db")
 
 
 def _parse_expiry(raw_expiry):
@@ -85,9 +89,74 @@ FREE_PLAN = {
 }
 
 # -----------------------------
-# FILE HELPERS
+# DATABASE
 # -----------------------------
-def load_subscriptions():
+# One row per subscribed user, keyed (and indexed) by user_id. WAL mode lets
+# every worker read while one writes, and counters are bumped with a single
+# UPDATE, so no call reads or rewrites more than its own row.
+_COLUMNS = (
+    "user_id", "plan", "active", "limits", "chat_used", "mistake_used",
+    "compare_used", "payment_id", "order_id", "started_at", "expiry",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id      TEXT PRIMARY KEY,
+    plan         TEXT NOT NULL,
+    active       INTEGER NOT NULL DEFAULT 0,
+    limits       TEXT NOT NULL DEFAULT '{}',
+    chat_used    INTEGER NOT NULL DEFAULT 0,
+    mistake_used INTEGER NOT NULL DEFAULT 0,
+    compare_used INTEGER NOT NULL DEFAULT 0,
+    payment_id   TEXT,
+    order_id     TEXT,
+    started_at   TEXT,
+    expiry       TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS store_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_INSERT = f"INSERT INTO users ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' for _ in _COLUMNS)})"
+_UPSERT = _INSERT + " ON CONFLICT(user_id) DO UPDATE SET " + ", ".join(
+    f"{column} = excluded.{column}" for column in _COLUMNS[1:]
+)
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = False
+
+
+def _connection() -> sqlite3.Connection:
+    # sqlite3 connections are not shared across threads; FastAPI runs sync
+    # routes on a thread pool, so each thread keeps its own.
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        _local.conn = conn
+    _ensure_schema(conn)
+    return conn
+
+
+def _ensure_schema(conn: sqlite3.Connection) -> None:
+    global _initialized
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+        conn.executescript(_SCHEMA)
+        _migrate_json(conn)
+        _initialized = True
+
+
+def _load_json_subscriptions():
     if not os.path.exists(FILE_PATH):
         return {}
     try:
@@ -96,21 +165,81 @@ def load_subscriptions():
     except Exception:
         return {}
 
+
+def _migrate_json(conn: sqlite3.Connection) -> None:
+    # BEGIN IMMEDIATE takes the write lock first, so when several workers
+    # start together exactly one of them imports the file.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        done = conn.execute("SELECT 1 FROM store_meta WHERE key = 'json_migrated'").fetchone()
+        if not done:
+            subs = _load_json_subscriptions()
+            conn.executemany(
+                _INSERT + " ON CONFLICT(user_id) DO NOTHING",
+                [_sub_to_row(user_id, sub) for user_id, sub in subs.items() if isinstance(sub, dict)],
+            )
+            conn.execute(
+                "INSERT INTO store_meta (key, value) VALUES ('json_migrated', ?)",
+                (f"{len(subs)} users at {datetime.utcnow().isoformat()}",),
+            )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _sub_to_row(user_id: str, sub: dict) -> tuple:
+    expiry = sub.get("expiry")
+    return (
+        user_id,
+        sub.get("plan") or "free",
+        1 if sub.get("active") is True else 0,
+        json.dumps(sub.get("limits") or {}),
+        int(sub.get("chat_used") or 0),
+        int(sub.get("mistake_used") or 0),
+        int(sub.get("compare_used") or 0),
+        sub.get("payment_id"),
+        sub.get("order_id"),
+        sub.get("started_at"),
+        expiry if isinstance(expiry, str) else None,
+    )
+
+
+def _row_to_sub(row: sqlite3.Row) -> dict:
+    sub = {column: row[column] for column in _COLUMNS}
+    sub["active"] = bool(sub["active"])
+    sub["limits"] = json.loads(sub["limits"] or "{}")
+    return sub
+
+
+def load_subscriptions():
+    rows = _connection().execute(f"SELECT {', '.join(_COLUMNS)} FROM users").fetchall()
+    return {row["user_id"]: _row_to_sub(row) for row in rows}
+
+
 def save_subscriptions(data):
-    tmp_path = FILE_PATH + ".tmp"
-    with open(tmp_path, "w") as f:
-        json.dump(data, f, indent=2)
-    os.replace(tmp_path, FILE_PATH)
+    """Upsert every subscription in `data` in one transaction."""
+    conn = _connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_UPSERT, [_sub_to_row(user_id, sub) for user_id, sub in data.items()])
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
 
 # -----------------------------
 # CORE LOGIC
 # -----------------------------
 def get_subscription(user_id: str):
-    subs = load_subscriptions()
-    sub = subs.get(user_id)
+    row = _connection().execute(
+        f"SELECT {', '.join(_COLUMNS)} FROM users WHERE user_id = ?",
+        (user_id,),
+    ).fetchone()
 
-    if not sub:
+    if not row:
         return FREE_PLAN.copy()
+    sub = _row_to_sub(row)
 
     expiry = _parse_expiry(sub.get("expiry"))
     if not expiry:
@@ -136,8 +265,7 @@ def create_or_update_subscription(user_id: str, plan: str, payment_id: str, orde
     plan_cfg = PLANS[plan]
     expiry = now + timedelta(days=plan_cfg["duration_days"])
 
-    subs = load_subscriptions()
-    subs[user_id] = {
+    sub = {
         "user_id": user_id,
         "plan": plan,
         "active": True,
@@ -151,35 +279,24 @@ def create_or_update_subscription(user_id: str, plan: str, payment_id: str, orde
         "expiry": expiry.isoformat()
     }
 
-    save_subscriptions(subs)
-    return subs[user_id]
+    _connection().execute(_UPSERT, _sub_to_row(user_id, sub))
+    return sub
 
 # -----------------------------
 # USAGE COUNTERS
 # -----------------------------
+def _increment(user_id: str, column: str) -> None:
+    # `column` is always one of the literals below, never caller input.
+    _connection().execute(f"UPDATE users SET {column} = {column} + 1 WHERE user_id = ?", (user_id,))
+
 def increment_chat(user_id: str):
-    subs = load_subscriptions()
-    sub = subs.get(user_id)
-    if not sub:
-        return
-    sub["chat_used"] += 1
-    save_subscriptions(subs)
+    _increment(user_id, "chat_used")
 
 def increment_mistake(user_id: str):
-    subs = load_subscriptions()
-    sub = subs.get(user_id)
-    if not sub:
-        return
-    sub["mistake_used"] += 1
-    save_subscriptions(subs)
+    _increment(user_id, "mistake_used")
 
 def increment_compare(user_id: str):
-    subs = load_subscriptions()
-    sub = subs.get(user_id)
-    if not sub:
-        return
-    sub["compare_used"] += 1
-    save_subscriptions(subs)
+    _increment(user_id, "compare_used")
 
 # -----------------------------
 # AUTH HELPER (TEMPORARY)
@@ -0,0 +1,127 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_registry import InMemoryRedis, SessionRegistry
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return _Clock()
+
+
+@pytest.fixture
+def registry(clock):
+    redis = InMemoryRedis()
+    redis._now = lambda: clock.now
+    return SessionRegistry(redis, lease_ttl_ms=15_000, worker_id="w1", node_id="n1")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_first_lease_has_no_previous_owner(registry):
+    assert run(registry.acquire_lease("u1", "s1")) == {"replaced": None, "orphans": []}
+
+
+def test_second_connect_takes_the_lease_over(registry):
+    run(registry.acquire_lease("u1", "s1"))
+    lease = run(registry.acquire_lease("u1", "s2"))
+
+    assert lease == {"replaced": "s1", "orphans": []}
+    assert run(registry.refresh_lease("u1", "s1", 5_000)) is False
+    assert run(registry.refresh_lease("u1", "s2", 5_000)) is True
+    assert registry.stats()["leases_taken_over"] == 1
+    assert registry.stats()["leases_lost"] == 1
+
+
+def test_leases_are_per_user(registry):
+    run(registry.acquire_lease("u1", "s1"))
+    assert run(registry.acquire_lease("u2", "s2"))["replaced"] is None
+    assert run(registry.refresh_lease("u1", "s1", 1_000)) is True
+
+
+def test_refresh_extends_only_the_owners_lease(registry, clock):
+    run(registry.acquire_lease("u1", "s1"))
+    clock.advance(10)
+    assert run(registry.refresh_lease("u1", "s1", 10_000)) is True
+    clock.advance(10)
+    # 20s after the grant, alive only because of the refresh at 10s.
+    assert run(registry.refresh_lease("u1", "s1", 20_000)) is True
+    assert run(registry.refresh_lease("u1", "other", 20_000)) is False
+
+
+def test_refresh_fails_after_the_lease_expired(registry, clock):
+    run(registry.acquire_lease("u1", "s1"))
+    clock.advance(16)
+    assert run(registry.refresh_lease("u1", "s1", 16_000)) is False
+
+
+def test_expired_unsettled_session_is_reported_as_orphan(registry, clock):
+    run(registry.acquire_lease("u1", "s1"))
+    run(registry.refresh_lease("u1", "s1", 12_000))
+    clock.advance(30)
+
+    lease = run(registry.acquire_lease("u1", "s2"))
+
+    assert lease["replaced"] is None
+    assert [orphan["session_id"] for orphan in lease["orphans"]] == ["s1"]
+    assert lease["orphans"][0]["elapsed_ms"] == 12_000
+    assert lease["orphans"][0]["worker"] == "w1"
+
+
+def test_settled_session_is_not_an_orphan(registry, clock):
+    run(registry.acquire_lease("u1", "s1"))
+    run(registry.settle("u1", "s1", 12_000))
+    run(registry.release_lease("u1", "s1"))
+    clock.advance(30)
+
+    assert run(registry.acquire_lease("u1", "s2"))["orphans"] == []
+
+
+def test_orphan_is_reported_once_a_newer_session_exists(registry, clock):
+    run(registry.acquire_lease("u1", "s1"))
+    clock.advance(30)
+    assert len(run(registry.acquire_lease("u1", "s2"))["orphans"]) == 1
+    run(registry.settle("u1", "s2", 1_000))
+    run(registry.release_lease("u1", "s2"))
+
+    # s1 is no longer the user's latest session.
+    assert run(registry.acquire_lease("u1", "s3"))["orphans"] == []
+
+
+def test_release_only_by_the_owner(registry):
+    run(registry.acquire_lease("u1", "s1"))
+    run(registry.release_lease("u1", "stale"))
+    assert run(registry.refresh_lease("u1", "s1", 1_000)) is True
+
+    run(registry.release_lease("u1", "s1"))
+    assert run(registry.acquire_lease("u1", "s2"))["replaced"] is None
+
+
+def test_published_ban_is_visible_until_it_expires(registry, clock):
+    status = {"status": "policy_banned", "text": "banned"}
+    run(registry.publish_ban("u1", status, ttl_ms=60_000))
+
+    assert run(registry.ban_status("u1")) == status
+    assert run(registry.ban_status("u2")) is None
+    clock.advance(61)
+    assert run(registry.ban_status("u1")) is None
+
+
+def test_in_memory_redis_rejects_unknown_scripts():
+    with pytest.raises(ValueError):
+        run(InMemoryRedis().eval("return 1", 0))
@@ -0,0 +1,101 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_activity import DEFAULT_SAMPLE_RATE, VoiceActivityGate
+
+SR = DEFAULT_SAMPLE_RATE
+CHUNK_MS = 100
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+def _seconds(duration_s):
+    return np.arange(int(SR * duration_s)) / SR
+
+
+def _noise(rng, duration_s, rms):
+    return rng.normal(0.0, rms, int(SR * duration_s))
+
+
+def _voice(duration_s, rms):
+    # Voiced syllables: 200 ms of a 150 Hz harmonic tone, then a 150 ms pause.
+    t = _seconds(duration_s)
+    tone = np.sin(2 * np.pi * 150 * t) + 0.5 * np.sin(2 * np.pi * 300 * t)
+    tone *= rms / np.sqrt(np.mean(tone * tone))
+    return tone * ((t % 0.35) < 0.2)
+
+
+def _tone(duration_s, rms, hz=200):
+    return rms * np.sqrt(2) * np.sin(2 * np.pi * hz * _seconds(duration_s))
+
+
+def _run(signal):
+    gate = VoiceActivityGate(sample_rate=SR)
+    step = SR * CHUNK_MS // 1000
+    pcm = np.clip(signal, -32768, 32767).astype("<i2")
+    forwarded = [
+        bool(gate.process(pcm[offset:offset + step].tobytes()))
+        for offset in range(0, len(pcm) - step + 1, step)
+    ]
+    return forwarded, gate
+
+
+def test_silence_is_dropped(rng):
+    forwarded, gate = _run(_noise(rng, 4.0, 30))
+
+    assert not any(forwarded)
+    assert gate.stats()["chunks_forwarded"] == 0
+
+
+def test_steady_hiss_is_dropped_from_the_start(rng):
+    forwarded, gate = _run(_noise(rng, 6.0, 2000))
+
+    assert not any(forwarded)
+    # The floor ends up at the hiss level (~-24 dBFS).
+    assert gate.stats()["noise_floor_db"] > -30
+
+
+def test_voice_in_a_quiet_room_is_forwarded(rng):
+    forwarded, _ = _run(_voice(4.0, 4000) + _noise(rng, 4.0, 30))
+
+    assert all(forwarded)
+
+
+def test_voice_over_steady_hiss_is_forwarded(rng):
+    hiss = _noise(rng, 8.0, 2000)
+    voice = np.concatenate([np.zeros(SR * 4), _voice(4.0, 2000 * 10 ** (6 / 20))])
+    forwarded, _ = _run(hiss + voice)
+
+    assert not any(forwarded[:40])
+    assert sum(forwarded[40:]) >= 36
+
+
+def test_tone_a_few_db_over_raised_floor_is_forwarded(rng):
+    hiss = _noise(rng, 6.0, 2000)
+    tone = np.concatenate([np.zeros(SR * 4), _tone(1.0, 2000 * 10 ** (5 / 20)), np.zeros(SR)])
+    forwarded, _ = _run(hiss + tone)
+
+    assert not any(forwarded[:40])
+    assert all(forwarded[40:50])
+
+
+def test_pending_preroll_counts_as_dropped(rng):
+    gate = VoiceActivityGate(sample_rate=SR)
+    quiet = _noise(rng, 0.1, 30).astype("<i2").tobytes()
+
+    assert gate.process(quiet) == []
+    stats = gate.stats()
+    assert stats["chunks_dropped"] == 1
+    assert stats["dropped_ratio"] == 1.0
+
+    speech = _voice(0.1, 4000).astype("<i2").tobytes()
+    assert gate.process(speech) == [quiet, speech]
+    assert gate.stats()["chunks_dropped"] == 0
@@ -0,0 +1,164 @@
+import asyncio
+import math
+from typing import Any, Callable
+
+
+class TimerHandle:
+    __slots__ = ("expiry_tick", "callback", "level", "slot", "cancelled")
+
+    def __init__(self, expiry_tick: int, callback: Callable[[], Any]):
+        self.expiry_tick = expiry_tick
+        self.callback = callback
+        self.level = -1
+        self.slot = -1
+        self.cancelled = False
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel shared by every session on a worker's event loop.
+
+    - Level 0 has `slots` buckets of one tick each; every higher level's bucket
+      spans a full turn of the level below, so 4 levels x 64 slots at 100 ms
+      cover ~19 days with O(1) schedule/cancel.
+    - Exactly one loop timer is armed for the whole wheel, at the next tick
+      that holds timers or needs a cascade; an empty wheel arms nothing.
+    - Callbacks run on the event loop and must not block.
+    """
+
+    def __init__(self, tick_s: float = 0.1, slots: int = 64, levels: int = 4):
+        self.tick_s = float(tick_s)
+        self.slots = int(slots)
+        self.levels = int(levels)
+        self._wheels: list[list[dict[TimerHandle, None]]] = [
+            [{} for _ in range(self.slots)] for _ in range(self.levels)
+        ]
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._current_tick = 0
+        self._armed: asyncio.TimerHandle | None = None
+        self._armed_tick: int | None = None
+        self._active = 0
+        self._counters = {"scheduled": 0, "fired": 0, "cancelled": 0, "cascaded": 0, "wakeups": 0}
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new loop (tests, reload): timers of the old loop cannot fire.
+            self._wheels = [[{} for _ in range(self.slots)] for _ in range(self.levels)]
+            self._active = 0
+            self._armed = None
+            self._armed_tick = None
+            self._loop = loop
+            self._current_tick = self._tick_at(loop.time())
+        return loop
+
+    def _tick_at(self, loop_time: float) -> int:
+        return int(loop_time / self.tick_s)
+
+    def schedule(self, deadline: float, callback: Callable[[], Any]) -> TimerHandle:
+        """Run `callback` at the first tick at or after loop time `deadline`."""
+        loop = self._bind_loop()
+        if self._active <= 0:
+            # Nothing pending: the cursor may be stale after an idle period.
+            self._current_tick = self._tick_at(loop.time())
+        handle = TimerHandle(max(self._current_tick + 1, math.ceil(deadline / self.tick_s)), callback)
+        self._insert(handle)
+        self._active += 1
+        self._counters["scheduled"] += 1
+        self._arm()
+        return handle
+
+    def call_later(self, delay_s: float, callback: Callable[[], Any]) -> TimerHandle:
+        loop = self._bind_loop()
+        return self.schedule(loop.time() + max(0.0, delay_s), callback)
+
+    def cancel(self, handle: TimerHandle | None) -> None:
+        if handle is None or handle.cancelled or handle.level < 0:
+            return
+        handle.cancelled = True
+        self._wheels[handle.level][handle.slot].pop(handle, None)
+        handle.level = -1
+        self._active -= 1
+        self._counters["cancelled"] += 1
+
+    def _insert(self, handle: TimerHandle) -> None:
+        delta = handle.expiry_tick - self._current_tick
+        level = 0
+        span = self.slots
+        while level < self.levels - 1 and delta >= span:
+            level += 1
+            span *= self.slots
+        slot = (handle.expiry_tick // self.slots ** level) % self.slots
+        handle.level = level
+        handle.slot = slot
+        self._wheels[level][slot][handle] = None
+
+    def _next_tick(self) -> int | None:
+        if self._active <= 0:
+            return None
+        boundary = (self._current_tick // self.slots + 1) * self.slots
+        level0 = self._wheels[0]
+        for tick in range(self._current_tick + 1, boundary):
+            if level0[tick % self.slots]:
+                return tick
+        return boundary
+
+    def _arm(self) -> None:
+        next_tick = self._next_tick()
+        if next_tick is None:
+            if self._armed is not None:
+                self._armed.cancel()
+                self._armed = None
+                self._armed_tick = None
+            return
+        if self._armed is not None and self._armed_tick is not None and self._armed_tick <= next_tick:
+            return
+        if self._armed is not None:
+            self._armed.cancel()
+        self._armed_tick = next_tick
+        self._armed = self._loop.call_at(next_tick * self.tick_s, self._advance)
+
+    def _cascade(self, level: int) -> None:
+        bucket = self._wheels[level][(self._current_tick // self.slots ** level) % self.slots]
+        if not bucket:
+            return
+        handles = list(bucket)
+        bucket.clear()
+        for handle in handles:
+            self._counters["cascaded"] += 1
+            self._insert(handle)
+
+    def _advance(self) -> None:
+        # call_at may fire a hair before the tick boundary in float terms.
+        target = max(self._tick_at(self._loop.time()), self._armed_tick or 0)
+        self._armed = None
+        self._armed_tick = None
+        self._counters["wakeups"] += 1
+        while self._current_tick < target:
+            self._current_tick += 1
+            for level in range(self.levels - 1, 0, -1):
+                if self._current_tick % self.slots ** level == 0:
+                    self._cascade(level)
+            bucket = self._wheels[0][self._current_tick % self.slots]
+            if not bucket:
+                continue
+            due = [handle for handle in bucket if handle.expiry_tick <= self._current_tick]
+            for handle in due:
+                del bucket[handle]
+                handle.level = -1
+                self._active -= 1
+                self._counters["fired"] += 1
+                try:
+                    handle.callback()
+                except Exception as exc:
+                    self._loop.call_exception_handler(
+                        {"message": "TimerWheel callback failed", "exception": exc}
+                    )
+        self._arm()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "tick_ms": round(self.tick_s * 1000.0, 1),
+            "active": self._active,
+            **self._counters,
+        }
@@ -0,0 +1,153 @@
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+# Live API input audio: 16-bit little-endian mono PCM.
+DEFAULT_SAMPLE_RATE = 16_000
+FRAME_MS = 20
+MIN_SPEECH_DB = -50.0    # absolute floor: quieter than this is never speech
+SPEECH_MARGIN_DB = 9.0   # speech must stand this far above the noise floor
+STEADY_MARGIN_DB = 3.0   # ...or this far when the floor is steady noise
+STEADY_SPREAD_DB = 3.0   # floor within this of the window minimum = steady noise
+MAX_VOICED_ZCR = 0.35    # hiss/wind crosses zero far more often than voice
+LOUD_MARGIN_DB = 20.0    # ...unless it is far above threshold and the recent quietest frame
+                         # (shouts, bat impact calls)
+FLOOR_WINDOW_MS = 2000   # the floor is never below the quietest frame of this window
+
+
+def frame_features(samples: np.ndarray, frame_len: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame energy (dBFS) and zero-crossing rate for int16 `samples`."""
+    count = len(samples) // frame_len
+    if count == 0:
+        return np.empty(0), np.empty(0)
+    frames = samples[: count * frame_len].astype(np.float32).reshape(count, frame_len) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    energy_db = 20.0 * np.log10(np.maximum(rms, 1e-6))
+    signs = np.signbit(frames)
+    zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / float(frame_len - 1)
+    return energy_db, zcr
+
+
+class VoiceActivityGate:
+    """
+    Per-session gate in front of the Live API audio input.
+
+    Each PCM chunk is split into 20 ms frames. A frame is speech when its
+    energy clears both an absolute floor and the session's adaptive noise
+    floor, and its zero-crossing rate looks voiced (or it is clearly loud).
+    The floor follows quiet frames and is also raised to the quietest frame
+    of the last `floor_window_ms`, so steady noise loud enough to pass for
+    speech (wind, fan hiss) becomes the floor within that window; speech
+    has pauses, so it cannot hold the window minimum up. Over such steady
+    noise the frame-to-frame spread is small, so speech only has to clear
+    the floor by `STEADY_MARGIN_DB`. Loud high-ZCR frames only count when
+    they are also well above the quietest recent frame, so steady hiss is
+    not let through before the window fills.
+    A chunk is forwarded when it holds speech or falls within `hangover_ms`
+    of the last speech, so trailing silence still reaches the model's own
+    end-of-turn detection. The last dropped chunk is kept as pre-roll and
+    sent ahead of a chunk where speech starts, so word onsets are not cut.
+
+    `process` returns the chunks to forward (possibly none).
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = DEFAULT_SAMPLE_RATE,
+        hangover_ms: int = 400,
+        noise_alpha: float = 0.05,
+        floor_window_ms: int = FLOOR_WINDOW_MS,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = max(1, sample_rate * FRAME_MS // 1000)
+        self.hangover_ms = hangover_ms
+        self.noise_alpha = noise_alpha
+        self.noise_floor_db = -60.0
+        self.floor_window_ms = floor_window_ms
+        # (duration_ms, quietest frame dB) of the most recent chunks
+        self._recent_minima: deque[tuple[int, float]] = deque()
+        self._recent_ms = 0
+        self._window_min_db: float | None = None
+        self._hangover_left_ms = 0
+        self._preroll: bytes | None = None
+        self._counters = {
+            "chunks_in": 0,
+            "chunks_forwarded": 0,
+            "chunks_dropped": 0,
+            "bytes_in": 0,
+            "bytes_forwarded": 0,
+            "speech_frames": 0,
+            "frames": 0,
+        }
+
+    def _speech_frames(self, chunk: bytes) -> tuple[int, int]:
+        samples = np.frombuffer(chunk[: len(chunk) - len(chunk) % 2], dtype="<i2")
+        energy_db, zcr = frame_features(samples, self.frame_len)
+        if energy_db.size == 0:
+            return 0, 0
+        recent_min_db = self._track_window_minimum(int(energy_db.size) * FRAME_MS, float(np.min(energy_db)))
+        steady = self._window_min_db is not None and self.noise_floor_db - self._window_min_db < STEADY_SPREAD_DB
+        margin = STEADY_MARGIN_DB if steady else SPEECH_MARGIN_DB
+        threshold = max(MIN_SPEECH_DB, self.noise_floor_db + margin)
+        speech = (energy_db > threshold) & (
+            (zcr < MAX_VOICED_ZCR) | (energy_db > max(threshold, recent_min_db) + LOUD_MARGIN_DB)
+        )
+        quiet = energy_db[~speech]
+        if quiet.size:
+            # Track the floor from non-speech frames only.
+            self.noise_floor_db += self.noise_alpha * (float(np.mean(quiet)) - self.noise_floor_db)
+        return int(np.count_nonzero(speech)), int(energy_db.size)
+
+    def _track_window_minimum(self, duration_ms: int, quietest_db: float) -> float:
+        # Returns the quietest frame seen so far in the window, full or not.
+        self._recent_minima.append((duration_ms, quietest_db))
+        self._recent_ms += duration_ms
+        while self._recent_ms - self._recent_minima[0][0] >= self.floor_window_ms:
+            self._recent_ms -= self._recent_minima.popleft()[0]
+        recent_min_db = min(db for _, db in self._recent_minima)
+        if self._recent_ms >= self.floor_window_ms:
+            self._window_min_db = recent_min_db
+            self.noise_floor_db = max(self.noise_floor_db, recent_min_db)
+        return recent_min_db
+
+    def process(self, chunk: bytes) -> list[bytes]:
+        self._counters["chunks_in"] += 1
+        self._counters["bytes_in"] += len(chunk)
+        speech_frames, frames = self._speech_frames(chunk)
+        self._counters["speech_frames"] += speech_frames
+        self._counters["frames"] += frames
+        duration_ms = len(chunk) // 2 * 1000 // self.sample_rate
+
+        if speech_frames:
+            forward = [self._preroll, chunk] if self._preroll is not None else [chunk]
+            self._preroll = None
+            self._hangover_left_ms = self.hangover_ms
+        elif self._hangover_left_ms > 0:
+            forward = [chunk]
+            self._hangover_left_ms -= duration_ms
+        else:
+            if self._preroll is not None:
+                self._counters["chunks_dropped"] += 1
+            self._preroll = chunk
+            return []
+
+        for item in forward:
+            self._counters["chunks_forwarded"] += 1
+            self._counters["bytes_forwarded"] += len(item)
+        return forward
+
+    def stats(self) -> dict[str, Any]:
+        chunks_in = self._counters["chunks_in"]
+        bytes_in = self._counters["bytes_in"]
+        # A held pre-roll chunk is dropped unless speech follows it.
+        chunks_dropped = self._counters["chunks_dropped"] + (self._preroll is not None)
+        return {
+            **self._counters,
+            "chunks_dropped": chunks_dropped,
+            "noise_floor_db": round(self.noise_floor_db, 1),
+            "forwarded_ratio": round(self._counters["chunks_forwarded"] / chunks_in, 4) if chunks_in else 0.0,
+            "dropped_ratio": round(chunks_dropped / chunks_in, 4) if chunks_in else 0.0,
+            "bytes_forwarded_ratio": round(self._counters["bytes_forwarded"] / bytes_in, 4) if bytes_in else 0.0,
+        }
@@ -2,9 +2,11 @@ import asyncio
 import base64
 import json
 import os
+import sys
 import time
-from contextlib import suppress
-from typing import Any
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
 
 from dotenv import load_dotenv
 # Try loading from the current directory, and also from cricknova_ai_backend
@@ -16,6 +18,16 @@ from google.cloud import firestore
 from google.genai import Client
 from google.genai import types
 
+# The audio gate is shared with cricknova_ai_backend/main.py. This file sits
+# next to that package, so put its directory on sys.path however the app is
+# launched (uvicorn live_coach_backend:app from the repo root, --app-dir, or
+# python /path/to/live_coach_backend.py).
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from cricknova_ai_backend.voice_activity import VoiceActivityGate
+
 
 app = FastAPI(title="CrickNova Live Nets Backend")
 
@@ -43,6 +55,10 @@ def _resolve_live_model_name() -> str:
 
 MODEL_NAME = _resolve_live_model_name()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+# Client PCM is passed through a local voice-activity gate so silence is not
+# streamed to the Live API; set LIVE_AUDIO_VAD=false to forward everything.
+AUDIO_VAD_ENABLED = os.getenv("LIVE_AUDIO_VAD", "true").lower() in ("true", "1", "yes")
+AUDIO_SAMPLE_RATE = int(os.getenv("LIVE_AUDIO_SAMPLE_RATE", "16000"))
 
 SYSTEM_INSTRUCTION = """Context & Role:
 You are "CrickNova AI", an elite, high-energy, and sharp human cricket coach standing at the non-striker's end. You are talking directly into the batsman's earbuds in real-time via a live audio stream. You see their batting frames and hear the ball impact instantly. Your voice responses must be natural, fast, and sound exactly like a real human coach giving quick advice between deliveries.
@@ -57,6 +73,12 @@ Strict Audio Delivery Rules:
 4. If the shot is brilliant, do not use the protocol. Just give an instant confidence boost like a proud coach.
 """
 
+EDGE_POLICY_BAN_NOTICE = (
+    "ACCOUNT LOCKED FOR 27 DAYS.\n\n"
+    "Repeated non-cricket uploads triggered an account restriction. "
+    "All CrickNova AI and paid features are disabled until the lock expires."
+)
+
 _firestore_client: firestore.Client | None = None
 _gemini_client: Client | None = None
 
@@ -102,14 +124,111 @@ def _legacy_seconds(milliseconds: int) -> int:
     return (milliseconds + 999) // 1000
 
 
-async def _get_balance_ms(user_id: str) -> int:
-    def read() -> int:
+def _banned_until(data: dict[str, Any]) -> str | None:
+    banned_until = data.get("edge_policy_banned_until")
+    if not isinstance(banned_until, datetime):
+        return None
+    if banned_until.tzinfo is None:
+        banned_until = banned_until.replace(tzinfo=timezone.utc)
+    if banned_until <= datetime.now(timezone.utc):
+        return None
+    return banned_until.isoformat()
+
+
+async def _get_start_state(user_id: str) -> tuple[int, str | None]:
+    # Balance and ban come from the same user document, so one read serves both.
+    def read() -> tuple[int, str | None]:
         snap = _live_doc(user_id).get()
-        return _balance_ms_from_data(snap.to_dict() if snap.exists else {})
+        data = snap.to_dict() if snap.exists else {}
+        return _balance_ms_from_data(data), _banned_until(data)
 
     return await asyncio.to_thread(read)
 
 
+def _coach_instruction(player_name: str, language: str, discipline: str) -> str:
+    return f"""Context & Role:
+You are "CrickNova AI", a tough, high-energy, elite cricket coach standing at the non-striker's end talking directly into the earbuds of the player named {player_name}.
+You see their live training frames ({discipline}) and give real-time coaching advice.
+Format: Respond with exactly ONE complete punchy coaching line/sentence of 10 to 22 words. Do NOT output single words, bullet points, or formatting.
+
+Strict Tone Rules:
+1. If the shot/movement is GOOD: Be extremely happy, proud, and use encouraging, positive coaching language.
+2. If the shot/movement is a MISTAKE/BAD: Be extremely strict, rude, harsh, and cruel. Point out the technical fault sharply and command an instant fix.
+
+Language Rule:
+You MUST respond only in {language}. For example, if the language is Marathi, speak in Marathi. If Hindi, speak in Hindi. If English, speak in English. Do not use any other language.
+"""
+
+
+def _settings_turn(payload: dict[str, Any]) -> str:
+    # The Live session is opened with the generic instruction before the
+    # client's config is known; the player's settings follow as a turn.
+    player_name = str(payload.get("name", "Player")).strip() or "Player"
+    language = str(payload.get("language", "English")).strip() or "English"
+    discipline = str(payload.get("discipline", "Batting")).strip() or "Batting"
+    return (
+        f"Session settings: the player's name is {player_name} and they are training {discipline}. "
+        f"From now on you MUST respond only in {language}."
+    )
+
+
+async def _receive_client_config(client_ws: WebSocket, timeout_s: float) -> dict[str, Any] | None:
+    try:
+        config_msg = await asyncio.wait_for(client_ws.receive(), timeout=timeout_s)
+        if config_msg.get("text"):
+            payload = json.loads(config_msg["text"])
+            if payload.get("type") == "client_config":
+                return payload
+    except Exception as e:
+        print(f"Failed to receive client_config: {e}")
+    return None
+
+
+async def _timed(step: str, timings: dict[str, int], awaitable: Any) -> Any:
+    started_ns = time.monotonic_ns()
+    try:
+        return await awaitable
+    finally:
+        timings[step] = (time.monotonic_ns() - started_ns) // 1_000_000
+
+
+@asynccontextmanager
+async def _live_connect_in_task(connect: Any, timings: dict[str, int]) -> AsyncIterator[asyncio.Future]:
+    # The Live API connect context is entered and exited by one task of its
+    # own, so the account checks can run while it connects. Leaving this
+    # block releases the session, or cancels the connect if it is still
+    # pending (a banned or zero-balance user never gets a model session).
+    session: asyncio.Future = asyncio.get_running_loop().create_future()
+    release = asyncio.Event()
+
+    async def hold() -> None:
+        started_ns = time.monotonic_ns()
+        try:
+            async with connect as live_session:
+                timings["model_connect_ms"] = (time.monotonic_ns() - started_ns) // 1_000_000
+                session.set_result(live_session)
+                await release.wait()
+        except asyncio.CancelledError:
+            session.cancel()
+            raise
+        except Exception as exc:
+            if not session.done():
+                session.set_exception(exc)
+            raise
+
+    task = asyncio.create_task(hold())
+    try:
+        yield session
+    finally:
+        release.set()
+        if not session.done():
+            task.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await task
+        if session.done() and not session.cancelled():
+            session.exception()
+
+
 async def _charge_elapsed_ms(user_id: str, elapsed_ms: int) -> int:
     @firestore.transactional
     def txn_body(transaction: firestore.Transaction) -> int:
@@ -163,7 +282,12 @@ async def _billing_guard(
             return
 
 
-async def _from_flutter(client_ws: WebSocket, live_session: Any, stop: asyncio.Event) -> None:
+async def _from_flutter(
+    client_ws: WebSocket,
+    live_session: Any,
+    stop: asyncio.Event,
+    vad: VoiceActivityGate | None = None,
+) -> None:
     async def send_video_frame(frame_bytes: bytes) -> None:
         blob = types.Blob(data=frame_bytes, mime_type="image/jpeg")
         sender = getattr(live_session, "send_realtime_input", None)
@@ -185,11 +309,14 @@ async def _from_flutter(client_ws: WebSocket, live_session: Any, stop: asyncio.E
                 await send_video_frame(frame)
             elif kind == "audio":
                 audio = base64.b64decode(payload["data"])
-                await live_session.send(input={"data": audio, "mime_type": "audio/pcm"})
+                for chunk in vad.process(audio) if vad is not None else [audio]:
+                    await live_session.send(input={"data": chunk, "mime_type": "audio/pcm"})
             elif kind == "user_text":
                 spoken = str(payload.get("text", "")).strip()
                 if spoken:
                     await live_session.send(input=spoken, end_of_turn=True)
+            elif kind == "client_config":
+                await live_session.send(input=_settings_turn(payload), end_of_turn=False)
             elif kind == "stop":
                 stop.set()
                 return
@@ -220,67 +347,73 @@ async def _from_gemini(client_ws: WebSocket, live_session: Any, stop: asyncio.Ev
 @app.websocket("/ws/live-nets/{user_id}")
 async def live_nets_socket(websocket: WebSocket, user_id: str) -> None:
     await websocket.accept()
-    starting_balance_ms = await _get_balance_ms(user_id)
-    if starting_balance_ms <= 0:
-        await websocket.send_json({"type": "termination", "reason": "NO_LIVE_BALANCE"})
-        await websocket.close(code=4003)
-        return
-
-    await websocket.send_json(
-        {
-            "type": "ready",
-            "live_milliseconds_remaining": starting_balance_ms,
-            "live_seconds_remaining": _legacy_seconds(starting_balance_ms),
-        }
-    )
-
+    accepted_ns = time.monotonic_ns()
     stop = asyncio.Event()
-    start_ns = time.monotonic_ns()
     billed = False
+    start_ns: int | None = None
+    starting_balance_ms = 0
 
-    # Read client config first to customize system instruction with correct language
-    player_name = "Player"
-    language = "English"
-    discipline = "Batting"
-    try:
-        config_msg = await asyncio.wait_for(websocket.receive(), timeout=5.0)
-        if config_msg.get("text"):
-            payload = json.loads(config_msg["text"])
-            if payload.get("type") == "client_config":
-                player_name = str(payload.get("name", player_name)).strip() or player_name
-                language = str(payload.get("language", language)).strip() or language
-                discipline = str(payload.get("discipline", discipline)).strip() or discipline
-    except Exception as e:
-        print(f"Failed to receive client_config: {e}")
-
-    # Build dynamic system instruction using the user's preferred language and training mode
-    dynamic_instruction = f"""Context & Role:
-You are "CrickNova AI", a tough, high-energy, elite cricket coach standing at the non-striker's end talking directly into the earbuds of the player named {player_name}.
-You see their live training frames ({discipline}) and give real-time coaching advice.
-Format: Respond with exactly ONE complete punchy coaching line/sentence of 10 to 22 words. Do NOT output single words, bullet points, or formatting.
-
-Strict Tone Rules:
-1. If the shot/movement is GOOD: Be extremely happy, proud, and use encouraging, positive coaching language.
-2. If the shot/movement is a MISTAKE/BAD: Be extremely strict, rude, harsh, and cruel. Point out the technical fault sharply and command an instant fix.
-
-Language Rule:
-You MUST respond only in {language}. For example, if the language is Marathi, speak in Marathi. If Hindi, speak in Hindi. If English, speak in English. Do not use any other language.
-"""
-
-    config = types.LiveConnectConfig(
-        response_modalities=["TEXT"],
-        system_instruction=dynamic_instruction,
-    )
+    async with AsyncExitStack() as stack:
+        try:
+            # The Live API connect starts first and runs while the ban/balance
+            # read and the client_config wait do; the session starts with the
+            # generic instruction.
+            config = types.LiveConnectConfig(
+                response_modalities=["TEXT"],
+                system_instruction=_coach_instruction("Player", "English", "Batting"),
+            )
+            timings: dict[str, int] = {}
+            connecting = await stack.enter_async_context(
+                _live_connect_in_task(gemini().aio.live.connect(model=MODEL_NAME, config=config), timings)
+            )
+            state, client_config = await asyncio.gather(
+                _timed("account_ms", timings, _get_start_state(user_id)),
+                _timed("client_config_ms", timings, _receive_client_config(websocket, 5.0)),
+                return_exceptions=True,
+            )
+            if isinstance(state, BaseException):
+                raise state
+            starting_balance_ms, banned_until = state
+            if banned_until is not None:
+                await websocket.send_json(
+                    {
+                        "type": "policy_banned",
+                        "text": EDGE_POLICY_BAN_NOTICE,
+                        "refund_minutes": False,
+                        "terminate_session": True,
+                        "banned_until": banned_until,
+                    }
+                )
+                await websocket.close(code=4003)
+                return
+            if starting_balance_ms <= 0:
+                await websocket.send_json({"type": "termination", "reason": "NO_LIVE_BALANCE"})
+                await websocket.close(code=4003)
+                return
+            session = await connecting
 
-    try:
-        async with gemini().aio.live.connect(model=MODEL_NAME, config=config) as session:
+            start_ns = time.monotonic_ns()
+            time_to_ready_ms = (start_ns - accepted_ns) // 1_000_000
+            print(f"LIVE_SESSION_READY user={user_id} time_to_ready_ms={time_to_ready_ms} {timings}")
+            await websocket.send_json(
+                {
+                    "type": "ready",
+                    "live_milliseconds_remaining": starting_balance_ms,
+                    "live_seconds_remaining": _legacy_seconds(starting_balance_ms),
+                    "time_to_ready_ms": time_to_ready_ms,
+                }
+            )
             await websocket.send_json(
                 {
                     "type": "connected",
                     "model": MODEL_NAME,
+                    "time_to_ready_ms": time_to_ready_ms,
+                    "startup": timings,
                 }
             )
             with suppress(Exception):
+                if isinstance(client_config, dict):
+                    await session.send(input=_settings_turn(client_config), end_of_turn=False)
                 await session.send(
                     input=(
                         "Start live cricket detection now. Watch every incoming frame "
@@ -290,17 +423,20 @@ You MUST respond only in {language}. For example, if the language is Marathi, sp
                     ),
                     end_of_turn=True,
                 )
+            vad = VoiceActivityGate(sample_rate=AUDIO_SAMPLE_RATE) if AUDIO_VAD_ENABLED else None
             tasks = [
                 asyncio.create_task(
                     _billing_guard(websocket, stop, start_ns, starting_balance_ms)
                 ),
-                asyncio.create_task(_from_flutter(websocket, session, stop)),
+                asyncio.create_task(_from_flutter(websocket, session, stop, vad)),
                 asyncio.create_task(_from_gemini(websocket, session, stop)),
             ]
             done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
             stop.set()
             for task in pending:
                 task.cancel()
+            if vad is not None:
+                print(f"LIVE_SESSION_AUDIO_VAD user={user_id} {vad.stats()}")
             for task in done:
                 with suppress(WebSocketDisconnect):
                     task.result()
@@ -310,14 +446,14 @@ You MUST respond only in {language}. For example, if the language is Marathi, sp
             )
             await _charge_elapsed_ms(user_id, elapsed_ms)
             billed = True
-    except WebSocketDisconnect:
-        stop.set()
-    finally:
-        stop.set()
-        if not billed:
-            elapsed_ms = min(
-                starting_balance_ms,
-                (time.monotonic_ns() - start_ns) // 1_000_000,
-            )
-            with suppress(Exception):
-                await _charge_elapsed_ms(user_id, elapsed_ms)
+        except WebSocketDisconnect:
+            stop.set()
+        finally:
+            stop.set()
+            if start_ns is not None and not billed:
+                elapsed_ms = min(
+                    starting_balance_ms,
+                    (time.monotonic_ns() - start_ns) // 1_000_000,
+                )
+                with suppress(Exception):
+                    await _charge_elapsed_ms(user_id, elapsed_ms)